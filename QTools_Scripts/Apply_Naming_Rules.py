@@ -0,0 +1,41 @@
+import bpy
+import os
+from qtools_lib.naming_rules import load_rules, plan_renames, format_diff, apply_plan
+
+# User-defined settings
+RULES_FILE = ""  # JSON or TOML rules; empty = naming_rules.json next to this script
+DRY_RUN = True  # If True, only print the diff
+SELECTED_ONLY = True  # Limit to selected objects, their data and their collections
+
+rules_file = RULES_FILE or os.path.join(os.path.dirname(__file__), "naming_rules.json")
+rules = load_rules(bpy.path.abspath(rules_file))
+print(f"📏 Loaded {len(rules)} naming rules from {rules_file}")
+
+selection = None
+if SELECTED_ONLY:
+    selection = set()
+    for obj in bpy.context.selected_objects:
+        selection.add(obj)
+        if obj.data is not None:
+            selection.add(obj.data)
+        selection.update(obj.users_collection)
+
+# Compute every new name first, then show or apply them all at once
+plan = plan_renames(rules, selection)
+diff = format_diff(plan)
+for line in diff:
+    print(line)
+
+if DRY_RUN:
+    print(f"📝 Dry run: {len(plan)} IDs would be renamed")
+    qtools_report = [f"Dry run: {len(plan)} renames"] + diff
+else:
+    unassigned, changed = apply_plan(plan)
+    for id_data, new_name, reason in unassigned:
+        print(f"⚠️ Could not rename '{id_data.name}' → '{new_name}': {reason}")
+    for id_data, wanted, got in changed:
+        print(f"⚠️ '{wanted}' was taken, got '{got}'")
+    renamed = len(plan) - len(unassigned)
+    print(f"✅ Renamed {renamed} IDs ({len(unassigned)} not assignable, {len(changed)} collisions)")
+    qtools_report = [f"Renamed {renamed} IDs, {len(unassigned)} not assignable"]
+    qtools_report += [f"Kept '{id_data.name}' (wanted '{new_name}'): {reason}" for id_data, new_name, reason in unassigned]
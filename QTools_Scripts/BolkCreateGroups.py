@@ -1,39 +1,22 @@
 import bpy
-
-# List of asset names
-asset_names = [
-    "Basket_A", "Basket_B", "Basket_C", "Sword_A", "Sword_B",
-    "Parasol_A", "Parasol_B", "Palanquin_A", "Palanquin_B",
-    "Palanquin_C", "Palamquin_D", "Flag_A", "Flag_B", "Flag_D",
-    "Flag_E", "Flag_F", "Spear_A", "Trumpet_A", "Trumpet_B",
-    "Drum_A", "Symales_A", "Bow_A", "Stick_A"
-]
-
-# Function to create collection and an empty inside it
-def create_collection_with_empty(asset_name):
-    # Collection name
-    collection_name = asset_name
-    empty_name = f"{asset_name}_SRT"
-
-    # Create new collection
-    if collection_name not in bpy.data.collections:
-        new_collection = bpy.data.collections.new(collection_name)
-        bpy.context.scene.collection.children.link(new_collection)
-    else:
-        new_collection = bpy.data.collections[collection_name]
-
-    # Create Empty
-    empty = bpy.data.objects.new(empty_name, None)
-    empty.empty_display_type = 'PLAIN_AXES'
-
-    # Link Empty to collection
-    new_collection.objects.link(empty)
-
-    # Set empty as active object (optional)
-    bpy.context.view_layer.objects.active = empty
-
-# Loop through asset names and create collections with empties
-for asset in asset_names:
-    create_collection_with_empty(asset)
-
-print("Collections and empties created successfully.")
+import os
+from qtools_lib.scaffold import apply_scaffold, format_changes, load_spec, plan_scaffold
+
+# User-defined settings
+SPEC_FILE = os.path.join(os.path.dirname(__file__), "scaffold_asset_groups.json")  # Collections, empties, exclusion, asset marks
+DRY_RUN = False  # If True, only list what is missing
+
+# Compare the spec with the file and only create/link what is missing (running it again changes nothing)
+changes = plan_scaffold(load_spec(SPEC_FILE))
+for line in format_changes(changes):
+    print(line)
+
+if not changes:
+    qtools_report = ["Scaffold already up to date."]
+elif DRY_RUN:
+    qtools_report = [f"{len(changes)} changes needed (dry run)"]
+else:
+    counts = apply_scaffold(changes)
+    qtools_report = [f"{action}: {count}" for action, count in counts.items()]
+
+print(f"Collections and empties created successfully. {', '.join(qtools_report)}")
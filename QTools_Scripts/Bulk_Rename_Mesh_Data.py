@@ -1,32 +1,63 @@
 import bpy
+from qtools_lib.naming_rules import load_conventions
+from qtools_lib.rename_planner import rename_all
 
-# Count how many times each mesh is used
-mesh_usage = {}
+# User-defined settings
+RULES_FILE = ""  # Empty = naming_rules.json next to this script
+VERBOSE = False  # If True, print every rename instead of only the summary
 
-for obj in bpy.data.objects:
-    if obj.type == 'MESH' and obj.data:
-        mesh = obj.data
-        mesh_usage[mesh] = mesh_usage.get(mesh, 0) + 1
+# bpy.data collection -> suffix added to its data-block names, from "data_suffixes" in the rules file
+# (e.g. "meshes": "_MSH", "curves": "_CRV", "armatures": "_ARM", "materials": "_MAT")
+DATA_SUFFIXES = load_conventions(RULES_FILE).data_suffixes
 
-# Go through again and rename if mesh is local and editable
+# One pass over the objects: first user object of every data-block (objects are sorted by name)
+owners = {}
 for obj in bpy.data.objects:
-    if obj.type == 'MESH':
-        mesh = obj.data
+    if obj.data is not None and obj.data not in owners:
+        owners[obj.data] = obj.name
+    if "materials" in DATA_SUFFIXES:
+        for slot in obj.material_slots:
+            if slot.material is not None and slot.material not in owners:
+                owners[slot.material] = obj.name
+
+for data_type, suffix in DATA_SUFFIXES.items():
+    id_collection = getattr(bpy.data, data_type)
+    new_names = {}
+    linked = 0
+    unused = 0
+
+    # One pass over the data-blocks: each target name is computed exactly once
+    for data in id_collection:
+        if data.library is not None:
+            linked += 1
+            continue  # Can't rename linked data
 
-        if mesh.library is not None:
-            print(f"Skipping '{mesh.name}' — it's linked.")
-            continue  # Can't rename linked mesh data
+        owner = owners.get(data)
+        if owner is None:
+            unused += 1
+            continue  # Not used by any object, leave it alone
 
-        if mesh_usage[mesh] > 1:
-            # Shared mesh — keep its name and just append _MSH if not already
-            base_name = mesh.name.split("_MSH")[0]
-            new_name = f"{base_name}_MSH"
+        users = data.users - (1 if data.use_fake_user else 0)
+        if users > 1:
+            # Shared data — keep its name and just append the suffix if not already
+            new_name = f"{data.name.split(suffix)[0]}{suffix}"
         else:
-            # Unique mesh — rename based on the object
-            new_name = f"{obj.name}_MSH"
+            # Unique data — rename based on the object
+            new_name = f"{owner}{suffix}"
+
+        if data.name != new_name:
+            new_names[data] = new_name
+            if VERBOSE:
+                print(f"Renaming {data_type} '{data.name}' → '{new_name}'")
+
+    # Rename everything in an order where no intermediate name collides (no .001 churn)
+    plan, changed = rename_all(id_collection, new_names)
+    for data, new_name, reason in plan.unassigned:
+        print(f"⚠️ Could not rename '{data.name}' → '{new_name}': {reason}")
 
-        if mesh.name != new_name:
-            print(f"Renaming mesh '{mesh.name}' → '{new_name}'")
-            mesh.name = new_name
+    renamed = len(new_names) - len(plan.unassigned)
+    already_named = len(id_collection) - linked - unused - len(new_names)
+    print(f"{data_type}: {renamed} renamed, {already_named} already named, {linked} linked, "
+          f"{unused} unused, {len(plan.unassigned)} not assignable")
 
-print("Mesh renaming complete.")
\ No newline at end of file
+print("Data renaming complete.")
@@ -1,25 +1,18 @@
 import bpy
-import os
+from qtools_lib.image_dedup import deduplicate_images
 
-# Dictionary to store unique images by filename
-unique_images = {}
+# User-defined settings
+DRY_RUN = False  # If True, only report what would be merged
+REMOVE_DUPLICATES = True  # If True, delete the duplicate images once their users are remapped
 
-# Iterate through all images in Blender
-for image in bpy.data.images:
-    if image.filepath:
-        filename = os.path.basename(bpy.path.abspath(image.filepath))
+# Find images with identical file (or packed) content and remap all their users at once
+report = deduplicate_images(dry_run=DRY_RUN, remove=REMOVE_DUPLICATES)
 
-        # If this texture has already been encountered, replace duplicates
-        if filename in unique_images:
-            print(f"🔄 Replacing duplicate: {filename}")
+for duplicate_name, keep_name in report["merged"]:
+    print(f"🔄 {'Would replace' if DRY_RUN else 'Replaced'} duplicate: {duplicate_name} → {keep_name}")
 
-            # Replace texture in all materials
-            for mat in bpy.data.materials:
-                if mat.use_nodes:
-                    for node in mat.node_tree.nodes:
-                        if node.type == 'TEX_IMAGE' and node.image == image:
-                            node.image = unique_images[filename]  # Replace with shared image
-        else:
-            unique_images[filename] = image  # Store as unique
-
-print("✅ All duplicate textures have been linked!")
\ No newline at end of file
+saved_mb = report["bytes_saved"] / (1024 * 1024)
+if DRY_RUN:
+    print(f"📝 Dry run: {report['duplicates']} duplicates in {report['groups']} groups, {saved_mb:.1f} MB would be saved")
+else:
+    print(f"✅ All duplicate textures have been linked! {report['duplicates']} duplicates in {report['groups']} groups, {report['users_remapped']} users remapped, {saved_mb:.1f} MB saved")
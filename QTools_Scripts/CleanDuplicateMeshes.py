@@ -0,0 +1,22 @@
+import bpy
+from qtools_lib.mesh_dedup import deduplicate_meshes
+
+# User-defined settings
+DRY_RUN = False  # If True, only report what would be merged
+USE_INSTANCES = False  # If True, replace objects with collection instances ("<mesh>_INST") when they have no modifiers/children
+TOLERANCE = 1e-4  # Largest vertex distance (mesh units) between meshes considered identical
+
+# Find meshes with identical geometry (also when rotated/moved) and relink their objects to one mesh
+report = deduplicate_meshes(dry_run=DRY_RUN, use_instances=USE_INSTANCES, tolerance=TOLERANCE)
+
+for duplicate_name, keep_name in report["merged"]:
+    print(f"🔄 {'Would replace' if DRY_RUN else 'Replaced'} duplicate mesh: {duplicate_name} → {keep_name}")
+
+saved_mb = report["bytes_saved"] / (1024 * 1024)
+if DRY_RUN:
+    print(f"📝 Dry run: {report['duplicates']} duplicate meshes in {report['groups']} groups "
+          f"({report['transformed']} rotated/moved), {saved_mb:.1f} MB would be saved")
+else:
+    print(f"✅ Duplicate meshes shared! {report['meshes_removed']} data blocks removed in {report['groups']} groups, "
+          f"{report['objects_relinked']} objects relinked ({report['transformed']} with a compensating transform), "
+          f"{saved_mb:.1f} MB saved")
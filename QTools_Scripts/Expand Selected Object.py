@@ -1,53 +1,52 @@
 import bpy
 import math
-import mathutils
+
+import numpy as np
+from qtools_lib.bounds import get_bounds_cache, offset_objects
+from qtools_lib.layout import arrange_objects
+
+# User-defined settings
+PACKING_METHOD = "skyline"  # "shelf", "skyline" or "maxrects" (densest, slow above ~1000 objects)
+PACKING_SORT = "height"  # "height", "width", "area", "max_side" or "none"
+
+# Bounds are computed for all objects at once and kept up to date by offset_objects()
+# while objects are moved, so the layout needs a single view_layer.update() (after rotating).
+# Objects are assumed to be unparented: location offsets are world-space offsets.
+bounds_cache = get_bounds_cache()
 
 
 def reset_object_transforms():
     """Resets location, rotation, and scale of all selected objects."""
-    for obj in bpy.context.selected_objects:
-        if obj.type == 'MESH':  # Only reset transformations for mesh objects
-            obj.location = (0, 0, 0)
-            obj.rotation_euler = (0, 0, 0)
-            # obj.scale = (1, 1, 1)
+    objects = [obj for obj in bpy.context.selected_objects if obj.type == 'MESH']  # Only reset mesh objects
+    for obj in objects:
+        obj.location = (0, 0, 0)
+        obj.rotation_euler = (0, 0, 0)
+        # obj.scale = (1, 1, 1)
 
     bpy.context.view_layer.update()  # Apply changes before further operations
+    bounds_cache.invalidate(objects)
 
 # Run reset function at the start
 reset_object_transforms()
 
-def move_objects_to_ground():
-    """Moves all selected objects so their lowest bounding box point aligns with Z=0."""
-    for obj in bpy.context.selected_objects:
-        if obj.type == 'MESH':  # Ensure it's a mesh object
-            world_matrix = obj.matrix_world
-            bbox_corners = [world_matrix @ mathutils.Vector(corner) for corner in obj.bound_box]
-
-            # Find the lowest Z coordinate among the bounding box corners
-            min_z = min(corner.z for corner in bbox_corners)
-
-            # Move object up so the lowest point is at Z=0
-            obj.location.z += -min_z
-
-def rotate_object_for_largest_side():
-    """Rotates all selected objects so their longest side aligns with the X-axis."""
-    for obj in bpy.context.selected_objects:
-        if obj.type == 'MESH':  # Ensure it's a mesh object
-            world_matrix = obj.matrix_world
-            bbox_corners = [world_matrix @ mathutils.Vector(corner) for corner in obj.bound_box]
-
-            # Calculate object dimensions in world space
-            x_min = min(corner.x for corner in bbox_corners)
-            x_max = max(corner.x for corner in bbox_corners)
-            y_min = min(corner.y for corner in bbox_corners)
-            y_max = max(corner.y for corner in bbox_corners)
-
-            width_x = x_max - x_min  # Width along X
-            depth_y = y_max - y_min  # Depth along Y
-
-            # If the Y dimension is larger, rotate 90 degrees around Z
-            if depth_y > width_x:
-                obj.rotation_euler.z += math.radians(90)
+def move_objects_to_ground(objects):
+    """Moves the objects so their lowest bounding box point aligns with Z=0."""
+    mins, _ = bounds_cache.world_bounds(objects)
+    deltas = np.zeros_like(mins)
+    deltas[:, 2] = -mins[:, 2]  # Move object up so the lowest point is at Z=0
+    offset_objects(objects, deltas)
+
+def rotate_object_for_largest_side(objects):
+    """Rotates the objects so their longest side aligns with the X-axis."""
+    mins, maxs = bounds_cache.world_bounds(objects)
+    size = maxs - mins
+
+    # If the Y dimension is larger, rotate 90 degrees around Z
+    rotated = [obj for obj, turn in zip(objects, size[:, 1] > size[:, 0]) if turn]
+    for obj in rotated:
+        obj.rotation_euler.z += math.radians(90)
+    bounds_cache.invalidate(rotated)
+    return rotated
 
 def move_objects_side_by_side(padding=1, sort_by_size=True):
     """Moves objects into a straight line along the X-axis, ensuring no overlaps and applying padding.
@@ -62,106 +61,41 @@ def move_objects_side_by_side(padding=1, sort_by_size=True):
         return
 
     # Move objects to ground and rotate them for correct alignment first
-    move_objects_to_ground()
-    rotate_object_for_largest_side()
+    move_objects_to_ground(objects)
+    if rotate_object_for_largest_side(objects):
+        # Rotations change the bounds: evaluate them once for all objects
+        bpy.context.view_layer.update()
 
-    # Ensure transformations are applied before sorting
-    bpy.context.view_layer.update()
+    mins, maxs = bounds_cache.world_bounds(objects)
+    widths = maxs[:, 0] - mins[:, 0]
 
     # Sort objects by size if enabled, otherwise keep default position sorting
     if sort_by_size:
-        def get_object_width(obj):
-            world_matrix = obj.matrix_world
-            bbox_corners = [world_matrix @ mathutils.Vector(corner) for corner in obj.bound_box]
-            x_min = min(corner.x for corner in bbox_corners)
-            x_max = max(corner.x for corner in bbox_corners)
-            return x_max - x_min  # Width of the object
-
-        objects.sort(key=get_object_width, reverse=True)  # Sort from largest to smallest
+        order = np.argsort(-widths, kind="stable")  # Largest to smallest
     else:
-        objects.sort(key=lambda obj: obj.location.x)
-
-    current_x = 0  # Start position on X-axis
-
-    for obj in objects:
-        # Refresh object bounding box after transformations
-        bpy.context.view_layer.update()
-        world_matrix = obj.matrix_world
-        bbox_corners = [world_matrix @ mathutils.Vector(corner) for corner in obj.bound_box]
+        order = np.argsort([obj.location.x for obj in objects], kind="stable")
+    objects = [objects[i] for i in order]
+    mins, maxs, widths = mins[order], maxs[order], widths[order]
 
-        # Get object width from transformed bounding box
-        x_min = min(corner.x for corner in bbox_corners)
-        x_max = max(corner.x for corner in bbox_corners)
-        width = x_max - x_min
+    # Left edge of every object along the line, padding included
+    starts = np.concatenate(([0.0], np.cumsum(widths + padding)[:-1]))
 
-        # Get object center on Y-axis
-        y_min = min(corner.y for corner in bbox_corners)
-        y_max = max(corner.y for corner in bbox_corners)
-        bbox_center_y = (y_max + y_min) / 2
-
-        # Align object X position
-        bbox_center_x = (x_max + x_min) / 2
-        obj.location.x = current_x + (width / 2) - bbox_center_x
-
-        # Align object Y position to the center (Y=0)
-        obj.location.y += -bbox_center_y
-
-        # Update position for next object
-        current_x += width + padding
+    deltas = np.zeros_like(mins)
+    deltas[:, 0] = starts - mins[:, 0]  # Align object X position
+    deltas[:, 1] = -(mins[:, 1] + maxs[:, 1]) / 2  # Align object Y position to the center (Y=0)
+    offset_objects(objects, deltas)
 
 move_objects_side_by_side()
 
-import math
-
-def estimate_grid_size(total_length, row_height):
-    """Estimates an optimal grid width using both line length and row height."""
-    estimated_size = math.sqrt(total_length * row_height)  # Balance width and height
-    print(f"Estimated Grid Width: {estimated_size}")
-    return estimated_size
-
 def move_objects_in_grid(padding=1):
-    """Arranges objects into a square-like grid layout after they are aligned in a row."""
+    """Packs the objects into a square-like layout on the XZ plane after they are aligned in a row."""
     objects = [obj for obj in bpy.context.selected_objects if obj.type == 'MESH']
 
     if not objects:
         return
 
-    # Step 1: Get total length of the line layout
-    x_min = min(min((obj.matrix_world @ mathutils.Vector(corner)).x for corner in obj.bound_box) for obj in objects)
-    x_max = max(max((obj.matrix_world @ mathutils.Vector(corner)).x for corner in obj.bound_box) for obj in objects)
-    total_length = x_max - x_min  # Correct total length
-    print(f"Corrected Total Line Length: {total_length} meters")
-
-    # Step 2: Get bounding box height of the first row
-    min_z = min(min((obj.matrix_world @ mathutils.Vector(corner)).z for corner in obj.bound_box) for obj in objects)
-    max_z = max(max((obj.matrix_world @ mathutils.Vector(corner)).z for corner in obj.bound_box) for obj in objects)
-    row_height = max_z - min_z
-    print(f"Calculated Row Height: {row_height}")
-
-    # Step 3: Estimate grid width using new function
-    grid_width = estimate_grid_size(total_length, row_height)
-
-    current_z_offset = 0  # Track the Z level for stacking
-
-    while True:
-        # Step 4: Select objects beyond the grid width on X-axis
-        objects_to_move = [obj for obj in objects if obj.location.x > grid_width]
-
-        if not objects_to_move:
-            break  # Exit when no more objects exceed the grid width
-
-        print(f"Moving {len(objects_to_move)} objects to new row at Z offset: {current_z_offset + row_height + padding}")
-
-        # Step 5: Move selected objects upward in Z
-        for obj in objects_to_move:
-            obj.location.z += row_height + padding
-
-        # Step 6: Align objects' left edge with X origin
-        min_x = min(obj.location.x for obj in objects_to_move)
-        for obj in objects_to_move:
-            obj.location.x -= min_x  # Align to X=0
-
-        # Update Z offset for the next row
-        current_z_offset += row_height + padding
+    packing = arrange_objects(objects, plane="XZ", method=PACKING_METHOD, padding=padding, aspect=1.0,
+                              sort=PACKING_SORT)
+    print(f"Packed {len(objects)} objects into {packing.width:.2f} x {packing.height:.2f} m ({PACKING_METHOD})")
 
 move_objects_in_grid()
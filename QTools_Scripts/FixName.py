@@ -1,33 +1,27 @@
 import bpy
-import re
 from collections import Counter
+from qtools_lib import names
+from qtools_lib.names import extract_base_index, name_with_variant, debug
+from qtools_lib.naming_rules import load_conventions
+from qtools_lib.rename_planner import iter_apply_steps, plan_renames
 
-import re
+# User-defined settings
+QUIET = True  # If False, print every parse and rename like before
+APPLY_BATCH = 200  # Renames applied per progress step
+RULES_FILE = ""  # Suffix conventions; empty = naming_rules.json next to this script
 
-import re
+names.set_verbose(not QUIET)
 
-import re
+conventions = load_conventions(RULES_FILE)
+names.set_empty_suffixes([conventions.srt_suffix, conventions.cst_suffix])
+mesh_suffix = conventions.data_suffixes.get("meshes", "")
 
-def extract_base_index(name, default_index=None):  # Default index if none found
-    print(f"🔍 Extracting base and index from {name}...")
+# New names are collected first and applied together at the end, in a collision-free order
+planned_names = {}
 
-    # Remove known suffixes (_SRT, _CST, numbers, etc.)
-    cleaned_name = re.sub(r"(_SRT|_CST|_[\d._]*)$", "", name)
-
-    # Find all isolated single letters (not next to another letter)
-    isolated_letters = re.findall(r"(?<![A-Za-z])([A-Za-z])(?![A-Za-z])", cleaned_name)
-
-    if isolated_letters:
-        # Prioritize capitalized letters if present
-        index = next((letter for letter in isolated_letters if letter.isupper()), isolated_letters[-1])
-
-        # Extract base (everything before the index)
-        base = cleaned_name.rsplit(f"_{index}", 1)[0]
-        print(f"✅ Found Base: {base}, Index: {index}")
-        return base, index
-
-    print(f"❌ No valid index found. Using default: {default_index}")
-    return name, default_index  # Return full name as base if no valid index is found
+# Name an ID will have once the plan is applied
+def current_name(id_data):
+    return planned_names.get(id_data, id_data.name)
 
 # Function to find all potential asset names in hierarchy and collections
 def find_potential_asset_names(obj):
@@ -35,14 +29,14 @@ def find_potential_asset_names(obj):
 
     # 1️⃣ Check the object's **own** collections
     for col in obj.users_collection:
-        base, index = extract_base_index(col.name)
+        base, index = extract_base_index(current_name(col))
         if base and index:
             asset_names.append((base, index))
 
     # 2️⃣ Check the object's parent hierarchy
     current = obj
     while current:
-        base, index = extract_base_index(current.name)
+        base, index = extract_base_index(current_name(current))
         if base and index:
             asset_names.append((base, index))
         current = current.parent
@@ -54,7 +48,7 @@ def determine_asset_name(obj):
     asset_names = find_potential_asset_names(obj)
 
     if not asset_names:
-        print(f"❌ Couldn't determine asset name for {obj.name}")
+        debug(f"❌ Couldn't determine asset name for {obj.name}")
         return None
 
     # Count occurrences of bases and indices separately
@@ -68,77 +62,104 @@ def determine_asset_name(obj):
     return f"{most_common_base}_{most_common_index}"  # Returns [Base]_[Index]
 
 # Function to rename the parent collection (and ensure all objects in it match)
-def rename_parent_collection(obj, asset_name):
+def rename_parent_collection(obj, asset_name, done_collections=None):
     for col in obj.users_collection:
-        if col.name != asset_name:
-            print(f"✅ Renaming collection: {col.name} → {asset_name}")
-            col.name = asset_name
+        # Selected objects often share a collection: only rename its content once per asset name
+        if done_collections is not None:
+            if (col, asset_name) in done_collections:
+                continue
+            done_collections.add((col, asset_name))
+        if current_name(col) != asset_name:
+            debug(f"✅ Renaming collection: {current_name(col)} → {asset_name}")
+            set_name(col, asset_name)
         # Recursively rename all objects inside the collection
         for child in col.objects:
             rename_object(child, asset_name)
 
 
-def get_asset_variant(asset_name, obj_name):
-    base, index = extract_base_index(asset_name)  # Get correct base & index from asset_name
-    print(f"🔍 Extracting variant from {obj_name}, based on expected {base}_{index}")
-
-    # Remove base & index from the object name to isolate the variant
-    stripped_name = obj_name.replace(base, "").replace(f"_{index}", "").strip("_")
-
-    variant = stripped_name if stripped_name else ""  # Assign variant if something remains
-
-    print(f"✅ Found Variant: {variant if variant else 'None'}")
-    return variant
-
 def get_asset_name_with_variant(obj, asset_name):
-    base, index = extract_base_index(asset_name)  # Get the correct base & index from asset_name
-    print(f"🔍 Looking for a variant in {obj.name} based on expected {base}_{index}")
-
-    # Extract the variant by comparing obj.name against asset_name
-    variant = get_asset_variant(asset_name, obj.name)
-
-    # Ensure the variant is **only before the index** and does not interfere with suffixes
-    if variant and f"_{index}" in obj.name:
-        variant = obj.name.split(f"_{index}")[0].replace(base, "").strip("_")
-
-    print(f"🔍 Found Variant: {variant if variant else 'None'}")
-
-    # Construct the corrected name while preserving suffixes
-    corrected_name = f"{base}_{variant}_{index}" if variant else f"{base}_{index}"
-
-    print(f"✅ Corrected Name: {corrected_name}")
+    # Memoized: the same (name, asset) pairs come back for every collection and parent
+    corrected_name = name_with_variant(current_name(obj), asset_name)
+    debug(f"✅ Corrected Name: {current_name(obj)} → {corrected_name}")
     return corrected_name
 
-    # Return unchanged if it's already correct
-    return asset_name
-
 # Function to rename a single object based on type
 def rename_object(obj, asset_name):
     asset_name_with_variant = get_asset_name_with_variant(obj, asset_name)
     if obj.type == 'MESH':
-        obj.name = asset_name_with_variant
+        set_name(obj, asset_name_with_variant)
         if hasattr(obj, "data") and obj.data:
-            obj.data.name = f"{asset_name_with_variant}_MSH"
+            set_name(obj.data, f"{asset_name_with_variant}{mesh_suffix}")
 
     elif obj.type == 'EMPTY':
-        if "_CST" in obj.name:
-            obj.name = f"{asset_name_with_variant}_CST"
+        if conventions.cst_suffix in current_name(obj):
+            set_name(obj, f"{asset_name_with_variant}{conventions.cst_suffix}")
         else:
-            obj.name = f"{asset_name_with_variant}_SRT"
-
-# Main function to rename all objects inside their asset hierarchy
-def rename_selection():
-    for obj in bpy.context.selected_objects:
-        print(f"🔍 Debug: Processing '{obj.name}' of type '{obj.type}'")
+            set_name(obj, f"{asset_name_with_variant}{conventions.srt_suffix}")
+
+# Records a new name; nothing is renamed until the plan is applied
+def set_name(id_data, new_name):
+    if new_name == id_data.name:
+        planned_names.pop(id_data, None)
+    else:
+        planned_names[id_data] = new_name
+
+# Plans the renames of each ID type, so no intermediate name gets a .001 suffix
+def plan_planned_names():
+    namespaces = [
+        (bpy.types.Collection, bpy.data.collections),
+        (bpy.types.Object, bpy.data.objects),
+        (bpy.types.Mesh, bpy.data.meshes),
+    ]
+    plans = []
+    for id_type, id_collection in namespaces:
+        mapping = {id_data: name for id_data, name in planned_names.items() if isinstance(id_data, id_type)}
+        plans.append((id_type.__name__, plan_renames(id_collection, mapping)))
+    planned_names.clear()
+    return plans
+
+# Renames the asset hierarchy of each object, yielding (done, total) after every object,
+# then applies the planned names, yielding after every batch of renames
+def rename_selection_steps(objects):
+    planned_names.clear()
+    count = len(objects)
+    total = count * 2  # Until the plan is known, renaming is estimated to take as long as planning
+    done_collections = set()
+    for done, obj in enumerate(objects, 1):
+        debug(f"🔍 Debug: Processing '{obj.name}' of type '{obj.type}'")
 
         asset_name = determine_asset_name(obj)
 
-        if not asset_name:
-            continue  # Skip if no valid name was found
+        if asset_name:  # Skip if no valid name was found
+            # Rename the entire hierarchy, including the collection
+            rename_parent_collection(obj, asset_name, done_collections)
+
+        yield done, total
 
-        # Rename the entire hierarchy, including the collection
-        rename_parent_collection(obj, asset_name)
+    plans = plan_planned_names()
+    total = count + sum(len(plan.steps) for _, plan in plans)
+    done = count
+    for type_name, plan in plans:
+        # Esc between batches leaves every ID on its old or its new name
+        for applied in iter_apply_steps(plan.steps, APPLY_BATCH):
+            yield done + applied, total
+        done += len(plan.steps)
+        for id_data, new_name, reason in plan.unassigned:
+            print(f"⚠️ Could not rename '{id_data.name}' → '{new_name}': {reason}")
+        debug(f"✅ Renamed {len(dict(plan.steps))} {type_name} IDs")
 
-print("🚀 Running hierarchy-based renaming...")
-rename_selection()
-print("✅ Renaming complete!")
+# Main function to rename all objects inside their asset hierarchy
+def rename_selection():
+    for _ in rename_selection_steps(list(bpy.context.selected_objects)):
+        pass
+
+# QTools entry point: renames in chunks with a progress bar, Esc cancels
+def qtools_chunked(context):
+    print("🚀 Running hierarchy-based renaming...")
+    yield from rename_selection_steps(list(context.selected_objects))
+    print("✅ Renaming complete!")
+
+if not globals().get("QTOOLS_CHUNKED"):  # Run everything at once outside QTools
+    print("🚀 Running hierarchy-based renaming...")
+    rename_selection()
+    print("✅ Renaming complete!")
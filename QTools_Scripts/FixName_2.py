@@ -1,34 +1,29 @@
 import bpy
-import re
+from qtools_lib import names
+from qtools_lib.names import extract_base_index, debug  # Shared, memoized parser
+from qtools_lib.naming_rules import load_conventions
 from collections import Counter
 
-def extract_base_index(name, default_index=None):
-    """ Extracts the base name and index from a given name. """
-    print(f"🔍 Analyzing name: {name}")
+# User-defined settings
+QUIET = True  # If False, print every parse, collection and parent like before
+RULES_FILE = ""  # Suffix conventions; empty = naming_rules.json next to this script
 
-    cleaned_name = re.sub(r"(_SRT|_CST|_[\d._]*)$", "", name)
-    isolated_letters = re.findall(r"(?<![A-Za-z])([A-Za-z])(?![A-Za-z])", cleaned_name)
+names.set_verbose(not QUIET)
 
-    if isolated_letters:
-        index = next((letter for letter in isolated_letters if letter.isupper()), isolated_letters[-1])
-        base = cleaned_name.rsplit(f"_{index}", 1)[0]
-        print(f"✅ Extracted Base: '{base}', Index: '{index}'")
-        return base, index
-
-    print(f"❌ No valid index found. Defaulting to full name: '{name}'")
-    return name, default_index  # Return full name if no valid index is found
+conventions = load_conventions(RULES_FILE)
+names.set_empty_suffixes([conventions.srt_suffix, conventions.cst_suffix])
 
 def find_potential_asset_names(obj):
     """ Finds possible asset names from collections and hierarchy. """
     asset_names = []
-    print(f"\n🔎 Searching asset names for '{obj.name}'...")
+    debug(f"\n🔎 Searching asset names for '{obj.name}'...")
 
     # Check the object's collections (IGNORE "Scene Collection")
     for col in obj.users_collection:
         if col.name == "Scene Collection":
-            print(f"🚫 Ignoring Scene Collection")
+            debug(f"🚫 Ignoring Scene Collection")
             continue
-        print(f"📂 Checking Collection: {col.name}")
+        debug(f"📂 Checking Collection: {col.name}")
         base, index = extract_base_index(col.name)
         if base and index:
             asset_names.append((base, index))
@@ -36,13 +31,13 @@ def find_potential_asset_names(obj):
     # Check the object's parent hierarchy
     current = obj
     while current:
-        print(f"🔗 Checking Parent: {current.name}")
+        debug(f"🔗 Checking Parent: {current.name}")
         base, index = extract_base_index(current.name)
         if base and index:
             asset_names.append((base, index))
         current = current.parent
 
-    print(f"🔍 Found potential names: {asset_names if asset_names else 'None'}")
+    debug(f"🔍 Found potential names: {asset_names if asset_names else 'None'}")
     return asset_names
 
 def determine_asset_name(obj):
@@ -50,7 +45,7 @@ def determine_asset_name(obj):
     asset_names = find_potential_asset_names(obj)
 
     if not asset_names:
-        print(f"❌ No common asset name found for '{obj.name}'!")
+        debug(f"❌ No common asset name found for '{obj.name}'!")
         return None  # No asset name found
 
     base_counts = Counter(base for base, index in asset_names)
@@ -60,7 +55,7 @@ def determine_asset_name(obj):
     most_common_index, _ = index_counts.most_common(1)[0]
 
     asset_name = f"{most_common_base}_{most_common_index}"
-    print(f"✅ Most common asset name determined: '{asset_name}'")
+    debug(f"✅ Most common asset name determined: '{asset_name}'")
     return asset_name  # Format: Base_Index
 
 class AssetNamePopup(bpy.types.Operator):
@@ -1,48 +1,109 @@
 import bpy
-import re
-
-# Get all empties in the scene
-empties = [obj for obj in bpy.data.objects if obj.type == 'EMPTY']
-
-for empty in empties:
-    if not empty.children:
-        continue  # Skip empties with no children
-
-    children = list(empty.children)  # Convert to list to avoid reference issues
-    mesh_children = [child for child in children if child.type == 'MESH']
-
-    # Clean up the collection name
-    collection_name = empty.name
-    collection_name = re.sub(r'KB3D_SHG_', '', collection_name)  # Remove "KB3D_SHG_"
-    collection_name = re.sub(r'_grp$', '', collection_name)  # Remove "_grp" at the end
-
-    # Move empty to world origin (0,0,0) without affecting children
-    for child in children:
-        child.matrix_world = empty.matrix_world @ child.matrix_local
-
-    empty.location = (0, 0, 0)
-
-    if len(mesh_children) == 1:  # If there's only one mesh child, leave it in the scene collection
-        obj = mesh_children[0]
-        if obj.name not in bpy.context.scene.collection.objects:
-            bpy.context.scene.collection.objects.link(obj)  # Move object to scene collection
-        print(f"Kept single mesh {obj.name} in scene collection.")
-    else:  # If multiple children, create a collection
-        if collection_name not in bpy.data.collections:
-            new_collection = bpy.data.collections.new(collection_name)
-            bpy.context.scene.collection.children.link(new_collection)
+
+import numpy as np
+from mathutils import Matrix
+from qtools_lib.naming_rules import load_conventions
+
+# Group empties (KB3D_SHG_..._grp, nested or not) become collections with the same
+# hierarchy, their children are unparented in place and the empties are deleted.
+# Everything is looked up in dicts built in one pass, so large imports stay fast.
+
+# User-defined settings
+RULES_FILE = ""  # group_prefixes / group_suffixes conventions; empty = naming_rules.json next to this script
+
+conventions = load_conventions(RULES_FILE)
+
+
+def clean_collection_name(name):
+    for prefix in conventions.group_prefixes:  # Removed from collection names
+        name = name.replace(prefix, "")
+    for suffix in conventions.group_suffixes:  # Removed from the end of collection names
+        if suffix and name.endswith(suffix):
+            return name[:-len(suffix)]
+    return name
+
+
+def world_matrices(objects):
+    """ matrix_world of every object in one foreach_get: {object: Matrix} """
+    matrices = np.empty(len(objects) * 16, dtype=np.float32)
+    objects.foreach_get("matrix_world", matrices)
+    matrices = matrices.reshape(-1, 4, 4).transpose(0, 2, 1)  # foreach_get gives them column-major
+    return {obj: Matrix(matrix) for obj, matrix in zip(objects, matrices.tolist())}
+
+
+def collection_membership(scene):
+    """ Object -> collections linking it, for the scene collection and every collection """
+    membership = {}
+    for collection in [scene.collection, *bpy.data.collections]:
+        for obj in collection.objects:
+            membership.setdefault(obj, []).append(collection)
+    return membership
+
+
+def flatten_kitbash_hierarchy():
+    scene = bpy.context.scene
+    bpy.context.view_layer.update()  # World matrices must be current before they are baked
+
+    # One pass over the objects: children of every object (obj.children scans all objects each time)
+    children_of = {}
+    for obj in bpy.data.objects:
+        if obj.parent is not None:
+            children_of.setdefault(obj.parent, []).append(obj)
+
+    groups = {obj for obj in children_of if obj.type == 'EMPTY' and obj.library is None}
+    if not groups:
+        print("No empties with children found.")
+        return
+
+    collections_by_name = {collection.name: collection for collection in bpy.data.collections}
+    created = 0
+
+    def get_collection(name, parent_collection):
+        nonlocal created
+        collection = collections_by_name.get(name)
+        if collection is None:
+            collection = bpy.data.collections.new(name)
+            collections_by_name[collection.name] = collection
+            created += 1
+        if collection.name not in parent_collection.children:
+            parent_collection.children.link(collection)
+        return collection
+
+    # Walk each group tree once, from the top: decide the collection of every non-group child
+    placements = []  # (object, target collection)
+    stack = [(group, scene.collection) for group in groups if group.parent not in groups]
+    while stack:
+        group, parent_collection = stack.pop()
+        children = children_of[group]
+        nested = [child for child in children if child in groups]
+        leaves = [child for child in children if child not in groups]
+
+        if not nested and len(leaves) == 1 and leaves[0].type == 'MESH':
+            target = parent_collection  # A single mesh doesn't need its own collection
         else:
-            new_collection = bpy.data.collections[collection_name]
+            target = get_collection(clean_collection_name(group.name), parent_collection)
+
+        placements.extend((leaf, target) for leaf in leaves)
+        stack.extend((child, target) for child in nested)
+
+    # Bake and relink everything, then delete all group empties in one call
+    matrices = world_matrices(bpy.data.objects)
+    membership = collection_membership(scene)
+    for obj, target in placements:
+        if obj.library is not None:
+            continue  # Linked objects can't be changed
+        obj.parent = None
+        obj.matrix_world = matrices[obj]  # Keep the object where it was
 
-        # Move children into the new collection
-        for child in children:
-            if child.name not in new_collection.objects:
-                new_collection.objects.link(child)
-            bpy.context.scene.collection.objects.unlink(child)
+        current = membership.get(obj, [])
+        for collection in current:
+            if collection != target:
+                collection.objects.unlink(obj)
+        if target not in current:
+            target.objects.link(obj)
 
-        print(f"Moved objects to collection: {collection_name}")
+    bpy.data.batch_remove(groups)
 
-    # Delete the empty
-    bpy.data.objects.remove(empty)
+    print(f"Flattened {len(groups)} empties: {len(placements)} objects moved, {created} collections created.")
 
-print("All empties processed successfully with cleaned collection names!")
\ No newline at end of file
+flatten_kitbash_hierarchy()
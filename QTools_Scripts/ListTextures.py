@@ -1,24 +1,22 @@
 import bpy
 import os
+import tempfile
+from qtools_lib.texture_audit import audit_textures, write_json, write_csv
 
-# Collect all texture file paths
-texture_paths = set()
+# User-defined settings
+REPORT_DIR = "//"  # Folder for texture_audit.json / .csv ("//" = next to the .blend file)
+WRITE_REPORTS = True
 
-for image in bpy.data.images:
-    if image.filepath:
-        texture_paths.add(image.filepath)
+# Resolve every image path with one directory listing per folder
+entries = audit_textures()
 
 # Print results
-for path in texture_paths:
-    texture_status = "✅ Exists" if os.path.exists(bpy.path.abspath(path)) else "❌ Missing"
-    print(f"{texture_status} {path}")
+for entry in entries:
+    texture_status = "📦 Packed" if entry.packed else ("✅ Exists" if entry.exists else "❌ Missing")
+    print(f"{texture_status} {entry.filepath} ({entry.format}, {entry.size / 1024:.0f} KB, used by {len(entry.users)})")
 
 # Collect missing texture names
-missing_names = []
-for path in texture_paths:
-    absolute_path = bpy.path.abspath(path) if path else None
-    if not absolute_path or not os.path.exists(absolute_path):
-        missing_names.append(os.path.basename(path))
+missing_names = [os.path.basename(entry.abs_path) for entry in entries if not entry.exists and not entry.packed]
 
 if missing_names:
     print("\nMissing Textures:")
@@ -26,3 +24,15 @@ if missing_names:
         print(f"🖼️  {name}")
 else:
     print("\nNo missing textures found.")
+
+# Write machine-readable reports for the pipeline
+if WRITE_REPORTS:
+    report_dir = bpy.path.abspath(REPORT_DIR) or tempfile.gettempdir()  # Unsaved files have no "//"
+    write_json(entries, os.path.join(report_dir, "texture_audit.json"))
+    write_csv(entries, os.path.join(report_dir, "texture_audit.csv"))
+    print(f"📄 Texture audit written to {report_dir}")
+
+# Summary shown in the QTools panel
+total_mb = sum(entry.size for entry in entries) / (1024 * 1024)
+qtools_report = [f"{len(entries)} textures, {total_mb:.1f} MB, {len(missing_names)} missing"]
+qtools_report += [f"Missing: {name}" for name in missing_names]
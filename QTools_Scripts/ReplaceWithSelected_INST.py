@@ -1,26 +1,81 @@
 import bpy
+import os
+import re
+import tempfile
+import time
+
+# User-defined settings
+MODE = "SELECTION"  # "SELECTION": selected '_INST' objects replace the other selected objects
+                    # "PATTERN": every '_INST' object in the file replaces all objects named after it
+INST_SUFFIX = "_INST"
+TARGET_PATTERN = r"^(?P<base>.+?)(?:[._]\d+)*$"  # Base name of a target: "Chair.001" / "Chair_003" -> "Chair"
+BACKUP_MODE = "COLLECTION"  # "COLLECTION": move originals to the excluded BACKUP collection
+                            # "LIBRARY": write originals to BACKUP_FILE, then remove them from this file
+                            # "NONE": remove originals
+BACKUP_FILE = "//replaced_originals_{stamp}.blend"  # "//" = next to the .blend file
+
+target_base_re = re.compile(TARGET_PATTERN)
+
+
+def source_base_name(inst_obj):
+    base_name = inst_obj.name
+    if base_name.endswith(INST_SUFFIX):
+        base_name = base_name[:-len(INST_SUFFIX)]  # strip "_INST"
+    return base_name
+
+
+def is_instance_of(obj, inst_obj):
+    """ True if obj already shows the same thing as inst_obj """
+    if inst_obj.instance_type == 'COLLECTION':
+        return obj.instance_type == 'COLLECTION' and obj.instance_collection == inst_obj.instance_collection
+    return obj.data is not None and obj.data == inst_obj.data
+
+
+def map_targets(sources, candidates):
+    """ One pass over the candidates: returns ({source: [targets]}, unmatched objects) """
+    if len(sources) == 1 and MODE == "SELECTION":
+        # A single source replaces everything else that is selected, whatever the names
+        source = sources[0]
+        return {source: [obj for obj in candidates if not is_instance_of(obj, source)]}, []
+
+    by_base = {source_base_name(source): source for source in sources}
+    mapping = {source: [] for source in sources}
+    unmatched = []
+    for obj in candidates:
+        match = target_base_re.match(obj.name)
+        source = by_base.get(match.group("base")) if match else None
+        if source is None:
+            unmatched.append(obj)
+        elif not is_instance_of(obj, source):
+            mapping[source].append(obj)
+    return mapping, unmatched
 
-def replace_with_selected_instance():
-    selected_objs = bpy.context.selected_objects
 
-    if len(selected_objs) < 2:
-        print("Select at least two objects, including one with '_INST' in the name.")
-        return
+def create_instance(inst_obj, name, obj):
+    """ New object showing inst_obj's collection or data, at obj's place """
+    if inst_obj.instance_type == 'COLLECTION':
+        new_inst = bpy.data.objects.new(name=name, object_data=None)
+        new_inst.instance_type = 'COLLECTION'
+        new_inst.instance_collection = inst_obj.instance_collection
+    else:
+        # The data must be given here: an empty's data can't be set afterwards (only images)
+        new_inst = bpy.data.objects.new(name=name, object_data=inst_obj.data)
+        if inst_obj.data is None:
+            new_inst.empty_display_type = inst_obj.empty_display_type
+            new_inst.empty_display_size = inst_obj.empty_display_size
 
-    inst_obj = None
-    others = []
+    if obj.users_collection:
+        obj.users_collection[0].objects.link(new_inst)
+    else:
+        bpy.context.scene.collection.objects.link(new_inst)
 
-    for obj in selected_objs:
-        if "_INST" in obj.name:
-            inst_obj = obj
-        else:
-            others.append(obj)
+    # Match transform
+    new_inst.matrix_world = obj.matrix_world
+    return new_inst
 
-    if not inst_obj:
-        print("No object with '_INST' in name found in selection.")
-        return
 
-    # Create or get BACKUP collection
+def get_backup_collection():
+    """ Create or get BACKUP collection, excluded from the view layer """
     backup_col = bpy.data.collections.get("BACKUP")
     if not backup_col:
         backup_col = bpy.data.collections.new("BACKUP")
@@ -29,37 +84,85 @@ def replace_with_selected_instance():
             if layer.collection == backup_col:
                 layer.exclude = True
                 break
+    return backup_col
 
-    for i, obj in enumerate(others):
-        print(f"Replacing '{obj.name}' — type: {obj.type}, instance_type: {obj.instance_type}, is_collection_instance: {obj.instance_type == 'COLLECTION'}")
 
-        # Always create new instance from inst_obj
-        base_name = inst_obj.name
-        if base_name.endswith("_INST"):
-            base_name = base_name[:-5]  # strip "_INST"
-        new_name = f"{base_name}_{i:03d}"
-        new_inst = bpy.data.objects.new(name=new_name, object_data=None)
+def backup_originals(originals):
+    """ Keeps, saves or drops the replaced objects according to BACKUP_MODE. Returns a summary line """
+    if not originals:
+        return "Nothing replaced."
 
-        if inst_obj.instance_type == 'COLLECTION':
-            new_inst.instance_type = 'COLLECTION'
-            new_inst.instance_collection = inst_obj.instance_collection
-        else:
-            new_inst.data = inst_obj.data
+    if BACKUP_MODE == "COLLECTION":
+        backup_col = get_backup_collection()
+        for obj in originals:
+            for col in obj.users_collection:
+                col.objects.unlink(obj)
+            backup_col.objects.link(obj)
+        return f"{len(originals)} originals moved to BACKUP."
+
+    written_to = None
+    if BACKUP_MODE == "LIBRARY":
+        filepath = BACKUP_FILE.format(stamp=time.strftime("%Y%m%d_%H%M%S"))
+        if filepath.startswith("//") and not bpy.data.filepath:
+            filepath = os.path.join(tempfile.gettempdir(), filepath[2:])  # Unsaved files have no "//"
+        filepath = bpy.path.abspath(filepath)
+        # Objects pull their meshes, materials and images into the side file; fake users keep them there
+        bpy.data.libraries.write(filepath, set(originals), path_remap='RELATIVE_ALL', fake_user=True)
+        written_to = filepath
+
+    # Remove the originals, then the data nothing else uses anymore, each in a single call
+    object_data = {obj.data for obj in originals if obj.data is not None}
+    bpy.data.batch_remove(originals)
+    orphans = [data for data in object_data if data.users == 0]
+    bpy.data.batch_remove(orphans)
+
+    summary = f"{len(originals)} originals and {len(orphans)} unused data blocks removed"
+    return f"{summary}, saved to {written_to}." if written_to else f"{summary}."
+
+
+def replace_with_selected_instance():
+    if MODE == "SELECTION":
+        pool = list(bpy.context.selected_objects)
+    else:
+        pool = [obj for obj in bpy.data.objects if obj.library is None]
+
+    sources = [obj for obj in pool if INST_SUFFIX in obj.name]
+    if not sources:
+        print(f"No object with '{INST_SUFFIX}' in name found.")
+        return []
+
+    # Objects already in BACKUP were replaced before
+    backup_col = bpy.data.collections.get("BACKUP")
+    skipped = set(sources) | (set(backup_col.all_objects) if backup_col else set())
+    candidates = [obj for obj in pool if obj not in skipped]
+    if MODE == "PATTERN":
+        # Objects used inside the instanced collections are part of the sources, not targets
+        for source in sources:
+            if source.instance_collection:
+                inside = set(source.instance_collection.all_objects)
+                candidates = [obj for obj in candidates if obj not in inside]
 
-        if obj.users_collection:
-            obj.users_collection[0].objects.link(new_inst)
-        else:
-            bpy.context.scene.collection.objects.link(new_inst)
+    mapping, unmatched = map_targets(sources, candidates)
 
-        # Match transform
-        new_inst.matrix_world = obj.matrix_world
+    originals = []
+    report = []
+    for inst_obj, targets in mapping.items():
+        base_name = source_base_name(inst_obj)
+        for i, obj in enumerate(targets):
+            # Always create new instance from inst_obj
+            create_instance(inst_obj, f"{base_name}_{i:03d}", obj)
+            originals.append(obj)
+        if targets:
+            report.append(f"{inst_obj.name}: {len(targets)} replaced")
+            print(f"🔁 {inst_obj.name}: replaced {len(targets)} objects")
 
-        # Move old object to backup
-        for col in obj.users_collection:
-            col.objects.unlink(obj)
-        backup_col.objects.link(obj)
+    if unmatched and MODE == "SELECTION":
+        print(f"⚠️ {len(unmatched)} selected objects match no '{INST_SUFFIX}' source: "
+              f"{', '.join(obj.name for obj in unmatched[:10])}")
 
-    print("Replacement complete.")
+    summary = backup_originals(originals)
+    print(f"Replacement complete. {summary}")
+    return [summary] + report
 
 # Call the function
-replace_with_selected_instance()
+qtools_report = replace_with_selected_instance()
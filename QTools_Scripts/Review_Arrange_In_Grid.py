@@ -1,55 +1,43 @@
 import bpy
+import numpy as np
+from qtools_lib.bounds import local_bounds
+from qtools_lib.packing import pack
 
 # User-defined settings
 MAX_ROW_WIDTH = 40 / 100  # Maximum row width (converted to meters)
+SPACING = 0.05  # Space between objects and between rows
+PACKING_METHOD = "shelf"  # "shelf" keeps reading order in rows, "skyline" / "maxrects" pack denser
+PACKING_SORT = "none"  # "none" keeps the alphabetical order, or "height", "width", "area", "max_side"
 CLEARANCE_Z = 0.002  # Additional space for readability
 ALIGN_TO_BOTTOM = True  # If True, creates a duplicate in "Review" collection and adjusts it
+REVIEW_MODE = "LINKED"  # "LINKED": duplicates share the original mesh, the bottom offset goes into the transform
+                        # "COPY": duplicates get their own mesh, moved so the origin is at the bottom
 
-def get_object_width(obj):
-    """ Returns the bounding box width of an object """
-    min_x, max_x = min(v[0] for v in obj.bound_box), max(v[0] for v in obj.bound_box)
-    return max_x - min_x
-
-def get_object_height(obj):
-    """ Returns the bounding box height of an object """
-    min_z, max_z = min(v[2] for v in obj.bound_box), max(v[2] for v in obj.bound_box)
-    return max_z - min_z
-
-def get_bottom_offset(obj):
-    """ Returns the offset needed to move the object's origin to the bottom of its bounding box """
-    min_z = min(v[2] for v in obj.bound_box)  # Lowest Z-point in bounding box
-    return -min_z  # Offset needed to align bottom to Z = 0
-
-def duplicate_object_for_review(obj):
-    """ Duplicates the object, renames it with '_REVIEW', and moves it to the 'Review' collection """
-    new_obj = obj.copy()
-    new_obj.data = obj.data.copy()  # Ensure mesh data is copied
-    new_obj.name = obj.name + "_REVIEW"
-
-    # Add to the Review collection
+def get_review_collection():
+    """ Returns the 'Review' collection, creating it if needed """
     review_collection = bpy.data.collections.get("Review")
     if review_collection is None:
         review_collection = bpy.data.collections.new("Review")
         bpy.context.scene.collection.children.link(review_collection)
-    
-    review_collection.objects.link(new_obj)
+    return review_collection
 
+def duplicate_object_for_review(obj, review_collection):
+    """ Duplicates the object, renames it with '_REVIEW', and moves it to the 'Review' collection """
+    new_obj = obj.copy()  # Shares obj.data: a linked duplicate
+    if REVIEW_MODE == "COPY":
+        new_obj.data = obj.data.copy()  # Own mesh data, its geometry can be edited
+    new_obj.name = obj.name + "_REVIEW"
+    review_collection.objects.link(new_obj)
     return new_obj  # Return the duplicated object
 
-def set_origin_to_bottom(obj):
-    """ Moves the object's origin to the bottom of its bounding box """
-    offset_z = get_bottom_offset(obj)
-
-    # Apply the transformation in Edit Mode
-    bpy.ops.object.select_all(action='DESELECT')
-    bpy.context.view_layer.objects.active = obj
-    obj.select_set(True)
-
-    # Move geometry down so that the lowest point aligns with the origin
-    bpy.ops.object.mode_set(mode='EDIT')
-    bpy.ops.mesh.select_all(action='SELECT')
-    bpy.ops.transform.translate(value=(0, 0, offset_z))
-    bpy.ops.object.mode_set(mode='OBJECT')
+def set_origin_to_bottom(obj, min_z):
+    """ Moves the geometry so the bottom of its bounding box is at the origin (array write, no Edit Mode) """
+    mesh = obj.data
+    coords = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", coords)
+    coords[2::3] -= min_z
+    mesh.vertices.foreach_set("co", coords)
+    mesh.update()
 
 def arrange_objects_in_grid():
     """ Arranges selected objects in an X-Z grid while handling duplicates for review """
@@ -60,37 +48,32 @@ def arrange_objects_in_grid():
         print("No mesh objects selected.")
         return
 
-    start_x = 0  # Starting X position
-    start_z = 0  # Starting Z position
-    current_x = start_x
-    current_z = start_z
-    max_row_height = 0
+    # Sizes of all objects in one batch (duplicates share them, moving the origin does not change them)
+    mins, maxs = local_bounds(selected_objects)
+    sizes = (maxs - mins).tolist()
 
-    for obj in selected_objects:
+    # Place everything at once: rows up to MAX_ROW_WIDTH on X, stacked on Z
+    packing = pack([(width, height) for width, _, height in sizes], method=PACKING_METHOD, padding=SPACING,
+                   sort=PACKING_SORT, max_width=MAX_ROW_WIDTH)
+
+    review_collection = get_review_collection() if ALIGN_TO_BOTTOM else None
+    arranged_objects = []
+    for obj, (x, z), (min_x, _, min_z) in zip(selected_objects, packing.positions, mins.tolist()):
         if ALIGN_TO_BOTTOM:
             # Duplicate the object and work on the duplicate
-            obj = duplicate_object_for_review(obj)
-            set_origin_to_bottom(obj)
-
-        obj_width = get_object_width(obj)
-        obj_height = get_object_height(obj)
-
-        # If adding the object exceeds the max row width, move to the next row (stack on Z)
-        if (current_x + obj_width) - start_x > MAX_ROW_WIDTH:
-            current_x = start_x
-            current_z += max_row_height + 0.05  # Increase row spacing for readability
-            max_row_height = obj_height  # Reset row height
-
-        # Move the object to the calculated position
-        obj.location.x = current_x + (obj_width / 2)  # Offset by half width
-        obj.location.z = current_z
+            obj = duplicate_object_for_review(obj, review_collection)
+            if REVIEW_MODE == "COPY":
+                set_origin_to_bottom(obj, min_z)
+                min_z = 0  # The bottom is now at the origin
+            # LINKED: the shared mesh is left untouched, the offset below puts the bottom on the row
 
-        # Update current X position for the next object
-        current_x += obj_width + 0.05  # Add small spacing between objects
-        max_row_height = max(max_row_height, obj_height)  # Update row height
+        # Move the object so its bounding box starts at the packed position
+        obj.location.x = x - min_x
+        obj.location.z = z - min_z
+        arranged_objects.append(obj)
 
     # Enable object name display in the viewport
-    for obj in selected_objects:
+    for obj in arranged_objects:
         obj.show_name = True
 
     print("Objects arranged successfully in 'Review' collection with corrected pivots.")
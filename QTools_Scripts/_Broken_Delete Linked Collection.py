@@ -1,16 +1,35 @@
 import bpy
+from qtools_lib.library_tools import make_local_hierarchy, override_hierarchy
+
+# User-defined settings
+MODE = "LOCAL"  # "LOCAL": make the selection and all linked data it uses local
+                # "OVERRIDE": create library overrides for the selected linked hierarchies
 
 # Get all selected objects in the viewport
 selected_objects = bpy.context.selected_objects
 
 if not selected_objects:
     print("No objects selected.")
+elif MODE == "OVERRIDE":
+    print(f"Overriding the linked hierarchies of {len(selected_objects)} selected objects...")
+    report = override_hierarchy(selected_objects)
+    for name, override in report["overrides"]:
+        print(f"✅ Overridden: {name} → {override.name if override else '?'}")
+    for name, error in report["failed"]:
+        print(f"❌ Could not override {name}: {error}")
+    qtools_report = [f"{len(report['overrides'])} hierarchies overridden, {len(report['failed'])} failed"]
 else:
+    # Selected collection instances bring their linked collection along
+    seeds = [obj.instance_collection if obj.library is None and obj.instance_collection else obj
+             for obj in selected_objects]
     print(f"Making {len(selected_objects)} selected objects local...")
+    report = make_local_hierarchy(seeds)
+    for type_name, count in sorted(report["made_local"].items()):
+        print(f"📦 {type_name}: {count} made local")
+    for name, error in report["failed"]:
+        print(f"❌ Could not make {name} local: {error}")
+    total = sum(report["made_local"].values())
+    qtools_report = [f"{total} linked data-blocks made local ({report['copied']} as copies), "
+                     f"{len(report['failed'])} failed"]
 
-    for obj in selected_objects:
-        if obj.library is not None:
-            bpy.context.view_layer.objects.active = obj
-            bpy.ops.object.make_local(type='ALL')
-
-    print("Done making objects local.")
\ No newline at end of file
+print("Done.")
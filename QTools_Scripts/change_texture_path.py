@@ -1,62 +1,73 @@
 import bpy
 import os
 import sys
+from qtools_lib.texture_index import load_texture_index
+from qtools_lib.image_reload import select_images_to_reload, reload_images
+
+# User-defined settings
+BROKEN_ONLY = False  # If True, only relink images whose file is missing or failed to load
+EXTENSION_SUBSTITUTIONS = {}  # Extensions to try when the exact file is missing, e.g. {".png": [".exr", ".tif"]}
+ROOT_SEPARATOR = ";"  # Several search folders can be given, e.g. "/textures/hero;/textures/shared"
+RELOAD_MODE = 'USED'  # 'ALL', 'USED' (images with users), 'VISIBLE' (used in the current view layer) or 'NONE'
+TIME_SLICED_RELOAD = True  # Reload a small batch per timer tick instead of all at once
 
 def change_texture_paths(new_texture_folder):
-    """Update only missing image texture paths to a new folder."""
+    """Relink image texture paths against an index of one or more texture folders."""
     if not new_texture_folder:
         print("❌ No texture path provided!")
         sys.stdout.flush()
         return
 
-    new_texture_folder = bpy.path.abspath(new_texture_folder)  # Ensure absolute path
-    print(f"🔹 Checking for missing textures and updating paths to: {new_texture_folder}")
+    roots = [bpy.path.abspath(root.strip()) for root in new_texture_folder.split(ROOT_SEPARATOR) if root.strip()]
+    print(f"🔹 Indexing texture folders: {', '.join(roots)}")
+    sys.stdout.flush()
+
+    # One index for all roots, persisted on disk and only rescanned where folders changed
+    index = load_texture_index(roots)
+    print(f"🗂️ {len(index)} textures indexed ({index.rescanned} folders rescanned)")
     sys.stdout.flush()
 
-    updated = False  # Track if any textures were updated
-    broken_only = False
+    changed_images = []  # Only the paths are updated here, decoding is deferred
+    fixed, missing, ambiguous = [], [], []
     for image in bpy.data.images:
-        if image.filepath:
-            abs_path = bpy.path.abspath(image.filepath)  # Get absolute path
-            if  broken_only:
-                print(f"Updating only broken paths")
-                sys.stdout.flush()
-                if not os.path.exists(abs_path) or not image.has_data:  # Also check if Blender failed to load the texture
-                    old_name = os.path.basename(abs_path)  # Get the filename
-                    new_path = os.path.join(new_texture_folder, old_name)
+        if not image.filepath or image.packed_file is not None:
+            continue
 
-                    if os.path.exists(new_path):  # Ensure new file exists
-                        image.filepath = new_path
-                        image.reload()
-                        updated = True
-                        print(f"✅ Fixed Missing Texture: {old_name} -> {new_path}")
-                        sys.stdout.flush()
-                    else:
-                        print(f"⚠️ Still Missing: {old_name} (Tried: {new_path})")
-                        sys.stdout.flush()
-            else:
-                print(f"Updating all paths")
-                sys.stdout.flush()
-                old_name = os.path.basename(abs_path)  # Get the filename
-                new_path = os.path.join(new_texture_folder, old_name)
+        abs_path = bpy.path.abspath(image.filepath)  # Get absolute path
+        if BROKEN_ONLY and os.path.exists(abs_path) and image.has_data:  # Also check if Blender failed to load the texture
+            continue
 
-                if os.path.exists(new_path):  # Ensure new file exists
-                    image.filepath = new_path
-                    image.reload()
-                    updated = True
-                    print(f"✅ Fixed Missing Texture: {old_name} -> {new_path}")
-                    sys.stdout.flush()
-                else:
-                    print(f"⚠️ Still Missing: {old_name} (Tried: {new_path})")
-                    sys.stdout.flush()
+        old_name = os.path.basename(abs_path)  # Get the filename
+        matches = index.resolve(old_name, EXTENSION_SUBSTITUTIONS)
+
+        if len(matches) > 1:
+            ambiguous.append((old_name, matches))  # Never pick one silently
+        elif not matches:
+            missing.append(old_name)
+        elif os.path.normpath(abs_path) != matches[0]:
+            image.filepath = matches[0]
+            changed_images.append(image)
+            fixed.append((old_name, matches[0]))
+
+    for old_name, new_path in fixed:
+        print(f"✅ Fixed Missing Texture: {old_name} -> {new_path}")
+    for old_name in missing:
+        print(f"⚠️ Still Missing: {old_name}")
+    for old_name, matches in ambiguous:
+        print(f"❓ Ambiguous: {old_name} matches {len(matches)} files:")
+        for path in matches:
+            print(f"     {path}")
+    sys.stdout.flush()
 
-    if updated:
-        bpy.ops.wm.redraw_timer(type='DRAW_WIN_SWAP', iterations=1)  # Force UI refresh
-        print("🔄 Blender Viewport Updated!")
+    to_reload = select_images_to_reload(changed_images, RELOAD_MODE)
+    if to_reload:
+        reload_images(to_reload, time_sliced=TIME_SLICED_RELOAD)
+        print(f"🔄 Reloading {len(to_reload)} of {len(changed_images)} relinked textures ({RELOAD_MODE.lower()})")
         sys.stdout.flush()
 
-    print("🎉 Texture paths checked and missing ones were fixed!")
+    print(f"🎉 Texture paths checked: {len(fixed)} relinked, {len(missing)} missing, {len(ambiguous)} ambiguous")
     sys.stdout.flush()
+    return fixed, missing, ambiguous
 
 if __name__ == "__main__":
     print("🔍 Running change_texture_path.py")  # Debug print
@@ -65,7 +76,9 @@ if __name__ == "__main__":
     if "new_texture_folder" in globals():
         print(f"📂 Received texture path: {new_texture_folder}")  # Debug print
         sys.stdout.flush()
-        change_texture_paths(new_texture_folder)
+        fixed, missing, ambiguous = change_texture_paths(new_texture_folder) or ([], [], [])
+        qtools_report = [f"{len(fixed)} relinked, {len(missing)} missing, {len(ambiguous)} ambiguous"]
+        qtools_report += [f"Ambiguous: {name} ({len(matches)} matches)" for name, matches in ambiguous]
     else:
         print("❌ No texture path argument provided!")
         sys.stdout.flush()
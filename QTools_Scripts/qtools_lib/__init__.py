@@ -0,0 +1,8 @@
+""" Shared helpers for the QTools scripts.
+
+QTools puts the script folder on sys.path before running a script, so scripts
+can simply `from qtools_lib import ...`. When running a script from Blender's
+Text Editor, add the script folder to sys.path first.
+
+Modules stay loaded between runs, which is what lets their caches persist.
+"""
@@ -0,0 +1,141 @@
+""" Bulk placement of asset collections without the drop operator.
+
+Each asset collection is linked (or appended) once with bpy.data.libraries.load,
+then every copy is created directly: an empty instancing the collection, or a
+library override of its hierarchy. The new IDs are returned as they are made,
+so there is no before/after diff of bpy.data.objects and no waiting.
+
+Assets are found by collection name in the .blend files of the asset libraries
+set in the Preferences (or given paths). The names in each file are cached by
+modification time, so the libraries are only scanned again when they change.
+"""
+import os
+from collections import namedtuple
+
+import bpy
+
+AssetDrop = namedtuple("AssetDrop", ["asset", "collection", "objects"])  # objects: the new top-level objects
+
+# .blend path -> (mtime_ns, collection names); survives between runs while the module stays loaded
+_library_contents = {}
+
+
+def asset_library_paths():
+    """ Folders of the asset libraries set in the Preferences """
+    return [library.path for library in bpy.context.preferences.filepaths.asset_libraries if library.path]
+
+
+def _blend_files(folders):
+    for folder in folders:
+        for root, dirs, files in os.walk(bpy.path.abspath(folder)):
+            dirs[:] = [name for name in dirs if not name.startswith(".")]
+            for name in files:
+                if name.lower().endswith(".blend"):
+                    yield os.path.join(root, name)
+
+
+def _collection_names(filepath):
+    mtime = os.stat(filepath).st_mtime_ns
+    cached = _library_contents.get(filepath)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    with bpy.data.libraries.load(filepath) as (data_from, _):
+        names = list(data_from.collections)
+    _library_contents[filepath] = (mtime, names)
+    return names
+
+
+def find_asset_files(names, folders=None):
+    """ {collection name: .blend path} for the names found in the asset library folders """
+    wanted = set(names)
+    found = {}
+    for filepath in _blend_files(asset_library_paths() if folders is None else folders):
+        for name in wanted.intersection(_collection_names(filepath)):
+            found.setdefault(name, filepath)
+        if len(found) == len(wanted):
+            break  # Everything found, stop scanning
+    return found
+
+
+def load_collections(filepath, names, link=True):
+    """ Links or appends the named collections of one .blend file in a single load. Returns {name: collection} """
+    filepath = bpy.path.abspath(filepath)
+    loaded = {}
+    if link:
+        # Reuse collections already linked from this file
+        for collection in bpy.data.collections:
+            if (collection.library and collection.name in names
+                    and os.path.normpath(bpy.path.abspath(collection.library.filepath)) == os.path.normpath(filepath)):
+                loaded[collection.name] = collection
+
+    missing = [name for name in names if name not in loaded]
+    if missing:
+        with bpy.data.libraries.load(filepath, link=link) as (data_from, data_to):
+            requested = [name for name in missing if name in data_from.collections]
+            data_to.collections = requested
+        # Same order as requested; appended collections may have been renamed (.001)
+        for name, collection in zip(requested, data_to.collections):
+            if collection is not None:
+                loaded[name] = collection
+    return loaded
+
+
+def _place_instances(collection, count, target_collection, locations):
+    objects = []
+    for i in range(count):
+        instance = bpy.data.objects.new(collection.name, None)
+        instance.instance_type = 'COLLECTION'
+        instance.instance_collection = collection
+        instance.location = locations[i] if locations else (0, 0, 0)
+        target_collection.objects.link(instance)
+        objects.append(instance)
+    return objects
+
+
+def _place_overrides(collection, count, target_collection, locations):
+    scene = bpy.context.scene
+    view_layer = bpy.context.view_layer
+    objects = []
+    for i in range(count):
+        override = collection.override_hierarchy_create(scene, view_layer)
+        # The override is instantiated in the scene collection: move it under the target
+        if override.name in scene.collection.children:
+            scene.collection.children.unlink(override)
+        target_collection.children.link(override)
+        roots = [obj for obj in override.objects if obj.parent is None]
+        if locations:
+            for obj in roots:
+                obj.location = locations[i]
+        objects.extend(roots)
+    return objects
+
+
+def drop_assets(drops, target_collection, mode="INSTANCE", link=True, folders=None, locations=None):
+    """ Places (count, asset collection name) drops in target_collection. Returns a list of AssetDrop.
+
+    mode is "INSTANCE" (collection instance empties) or "OVERRIDE" (library
+    overrides of the asset hierarchy, link must be True). locations
+    optionally gives the location of each copy, per asset: {name: [xyz, ...]}.
+    """
+    if mode == "OVERRIDE" and not link:
+        raise ValueError("Overrides need linked assets (link=True)")
+    names = list(dict.fromkeys(name for _, name in drops))
+    files = find_asset_files(names, folders)
+
+    by_file = {}
+    for name, filepath in files.items():
+        by_file.setdefault(filepath, []).append(name)
+    collections = {}
+    for filepath, file_names in by_file.items():
+        collections.update(load_collections(filepath, file_names, link))  # One load per library file
+
+    place = _place_overrides if mode == "OVERRIDE" else _place_instances
+    results = []
+    for count, name in drops:
+        collection = collections.get(name)
+        if collection is None:
+            results.append(AssetDrop(name, None, []))
+            continue
+        asset_locations = (locations or {}).get(name)
+        results.append(AssetDrop(name, collection, place(collection, count, target_collection, asset_locations)))
+    return results
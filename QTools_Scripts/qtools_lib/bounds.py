@@ -0,0 +1,140 @@
+""" World-space bounding boxes for many objects at once.
+
+bound_box and matrix_world of all objects are read with foreach_get into
+NumPy arrays and the 8 corners of every box are transformed in one batched
+matmul, instead of building matrix_world @ Vector(corner) lists in Python.
+
+Results are cached per object until the depsgraph reports a transform or
+geometry change for it. Layout code that moves objects itself can keep the
+cache valid with shift() instead of forcing a view_layer.update().
+"""
+import numpy as np
+
+import bpy
+
+from . import handlers
+
+_cache = None
+
+
+def _fetch_all():
+    """ Raw bound_box (n, 8, 3) and matrix_world (n, 4, 4) of every object in bpy.data.objects """
+    objects = bpy.data.objects
+    count = len(objects)
+    boxes = np.empty(count * 24, dtype=np.float32)
+    matrices = np.empty(count * 16, dtype=np.float32)
+    objects.foreach_get("bound_box", boxes)
+    objects.foreach_get("matrix_world", matrices)
+    # foreach_get returns matrices column-major, i.e. already transposed for row vectors
+    return boxes.reshape(count, 8, 3), matrices.reshape(count, 4, 4)
+
+
+def _fetch(objects):
+    """ bound_box and transposed matrix_world of the given objects """
+    if len(objects) * 4 >= len(bpy.data.objects):
+        boxes, matrices = _fetch_all()
+        position = {obj: i for i, obj in enumerate(bpy.data.objects)}  # Order changes with renames, rebuild each time
+        rows = np.fromiter((position[obj] for obj in objects), dtype=np.int64, count=len(objects))
+        return boxes[rows], matrices[rows]
+
+    # Few objects in a big file: read them one by one rather than the whole file
+    boxes = np.array([obj.bound_box for obj in objects], dtype=np.float32).reshape(len(objects), 8, 3)
+    matrices = np.array([obj.matrix_world for obj in objects], dtype=np.float32).reshape(len(objects), 4, 4)
+    return boxes, matrices.transpose(0, 2, 1)
+
+
+def local_bounds(objects):
+    """ Local-space (mins, maxs) arrays of shape (n, 3) """
+    objects = list(objects)
+    if not objects:
+        return np.zeros((0, 3)), np.zeros((0, 3))
+    boxes, _ = _fetch(objects)
+    return boxes.min(axis=1), boxes.max(axis=1)
+
+
+def compute_world_bounds(objects):
+    """ World-space (mins, maxs) arrays of shape (n, 3), without the cache """
+    objects = list(objects)
+    if not objects:
+        return np.zeros((0, 3)), np.zeros((0, 3))
+    boxes, matrices_t = _fetch(objects)
+    corners = np.concatenate([boxes, np.ones((len(objects), 8, 1), dtype=np.float32)], axis=2)
+    world = np.matmul(corners, matrices_t)[:, :, :3]  # (n, 8, 4) @ (n, 4, 4): every corner of every box at once
+    return world.min(axis=1).astype(np.float64), world.max(axis=1).astype(np.float64)
+
+
+class BoundsCache:
+    """ World bounds per object, valid until the object's transform or geometry changes """
+
+    def __init__(self):
+        self._bounds = {}  # Object -> (min xyz, max xyz)
+
+    def world_bounds(self, objects):
+        """ (mins, maxs) arrays for the objects, computing only the ones not cached yet """
+        objects = list(objects)
+        missing = [obj for obj in objects if obj not in self._bounds]
+        if missing:
+            mins, maxs = compute_world_bounds(missing)
+            for obj, lo, hi in zip(missing, mins, maxs):
+                self._bounds[obj] = (lo, hi)
+        if not objects:
+            return np.zeros((0, 3)), np.zeros((0, 3))
+        mins = np.array([self._bounds[obj][0] for obj in objects])
+        maxs = np.array([self._bounds[obj][1] for obj in objects])
+        return mins, maxs
+
+    def shift(self, objects, deltas):
+        """ Moves cached bounds by world-space deltas (n, 3) after the caller moved the objects itself """
+        for obj, delta in zip(objects, np.asarray(deltas, dtype=np.float64)):
+            cached = self._bounds.get(obj)
+            if cached is not None:
+                self._bounds[obj] = (cached[0] + delta, cached[1] + delta)
+
+    def invalidate(self, objects=None):
+        if objects is None:
+            self._bounds.clear()
+        else:
+            for obj in objects:
+                self._bounds.pop(obj, None)
+
+
+def _on_depsgraph_update(depsgraph):
+    if _cache is None:
+        return
+    for update in depsgraph.updates:
+        id_data = update.id.original
+        if isinstance(id_data, bpy.types.Object):
+            # Children of a moved parent get their own transform update
+            if update.is_updated_transform or update.is_updated_geometry:
+                _cache.invalidate([id_data])
+        elif update.is_updated_geometry and not isinstance(id_data, (bpy.types.Scene, bpy.types.Collection)):
+            _cache.invalidate()  # Shared data changed (e.g. a mesh): drop everything
+
+
+def _on_file_change():
+    if _cache is not None:
+        _cache.invalidate()
+
+
+def get_bounds_cache():
+    """ Returns the shared cache, registering its invalidation handlers on first use """
+    global _cache
+    if _cache is None:
+        _cache = BoundsCache()
+    handlers.add_listener("bounds", _on_depsgraph_update, _on_file_change)
+    return _cache
+
+
+def world_bounds(objects):
+    """ Cached world-space (mins, maxs) arrays of shape (n, 3) """
+    return get_bounds_cache().world_bounds(objects)
+
+
+def offset_objects(objects, deltas):
+    """ Moves unparented objects by world-space deltas (n, 3) and keeps their cached bounds in sync """
+    for obj, (dx, dy, dz) in zip(objects, np.asarray(deltas).tolist()):
+        location = obj.location
+        location.x += dx
+        location.y += dy
+        location.z += dz
+    get_bounds_cache().shift(objects, deltas)
@@ -0,0 +1,71 @@
+""" One set of app handlers for all the shared caches.
+
+Caches (bounds, image usage) register a listener instead of their own
+handlers. A single depsgraph handler and a single file-change handler
+(load, undo, redo) forward the updates to every listener.
+
+The handlers are found again by module name, so importing qtools_lib a
+second time replaces them instead of adding another set. The add-on calls
+uninstall() when it is disabled.
+"""
+import bpy
+from bpy.app.handlers import persistent
+
+FILE_CHANGE_HANDLERS = ("load_post", "undo_post", "redo_post")
+
+_listeners = {}  # Name -> (on_depsgraph_update(depsgraph), on_file_change())
+
+
+@persistent
+def _on_depsgraph_update(scene, depsgraph):
+    for on_update, _ in list(_listeners.values()):
+        on_update(depsgraph)
+
+
+@persistent
+def _on_file_change(*args):
+    for _, on_file_change in list(_listeners.values()):
+        on_file_change()
+
+
+def _is_ours(function):
+    """ True for the handlers of this module, also those of an earlier import of it """
+    return getattr(function, "__module__", None) == __name__
+
+
+def _handler_lists():
+    handlers = bpy.app.handlers
+    return [handlers.depsgraph_update_post] + [getattr(handlers, name) for name in FILE_CHANGE_HANDLERS]
+
+
+def install():
+    """ Adds the handlers once, replacing any left by an earlier import """
+    handlers = bpy.app.handlers
+    if _on_depsgraph_update in handlers.depsgraph_update_post:
+        return
+    _remove_handlers()
+    handlers.depsgraph_update_post.append(_on_depsgraph_update)
+    for name in FILE_CHANGE_HANDLERS:
+        getattr(handlers, name).append(_on_file_change)
+
+
+def add_listener(name, on_update, on_file_change):
+    """ Forwards depsgraph updates and file changes to a cache, installing the handlers if needed """
+    if name not in _listeners:
+        on_file_change()  # Nothing kept the cache up to date before (first use, add-on re-enabled)
+    _listeners[name] = (on_update, on_file_change)
+    install()
+
+
+def _remove_handlers():
+    for handler_list in _handler_lists():
+        for function in [function for function in handler_list if _is_ours(function)]:
+            handler_list.remove(function)
+
+
+def uninstall():
+    """ Removes the handlers. The caches are emptied, as nothing keeps them up to date anymore """
+    _remove_handlers()
+    for _, on_file_change in list(_listeners.values()):
+        on_file_change()
+    _listeners.clear()
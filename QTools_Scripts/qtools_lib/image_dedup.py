@@ -0,0 +1,136 @@
+""" Content-hash image deduplication.
+
+Images are grouped by the hash of their file (or packed) bytes rather than
+their basename, so different files that share a name are never merged. File
+hashes are computed in a thread pool and cached by path, size and mtime.
+"""
+import hashlib
+import os
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+import bpy
+
+from .image_users import get_image_usage_index
+
+CHUNK_SIZE = 1024 * 1024  # Bytes read per hash update
+HASH_WORKERS = 8
+
+DuplicateGroup = namedtuple("DuplicateGroup", ["keep", "duplicates", "digest", "size"])
+
+# Absolute path -> (size, mtime_ns, digest); survives between runs while the module stays loaded
+_hash_cache = {}
+
+
+def file_digest(path):
+    """ Streams a file through blake2b. Returns (digest, size), or (None, 0) if unreadable """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None, 0
+
+    cached = _hash_cache.get(path)
+    if cached and cached[0] == stat.st_size and cached[1] == stat.st_mtime_ns:
+        return cached[2], stat.st_size
+
+    digest = hashlib.blake2b(digest_size=20)
+    try:
+        with open(path, "rb") as file:
+            for chunk in iter(lambda: file.read(CHUNK_SIZE), b""):
+                digest.update(chunk)
+    except OSError:
+        return None, 0
+
+    _hash_cache[path] = (stat.st_size, stat.st_mtime_ns, digest.hexdigest())
+    return digest.hexdigest(), stat.st_size
+
+
+def hash_files(paths, workers=HASH_WORKERS):
+    """ Hashes many files in parallel. Returns {path: (digest, size)} """
+    paths = list(dict.fromkeys(paths))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return dict(zip(paths, pool.map(file_digest, paths)))
+
+
+def _packed_digest(image):
+    """ Hash of the packed bytes (every tile/view of multi-file images). Returns (digest, size), or (None, 0) """
+    # image.packed_files holds ImagePackedFile items; the bytes are on their PackedFile
+    packed_files = [getattr(item, "packed_file", None) for item in image.packed_files] or [image.packed_file]
+    digest = hashlib.blake2b(digest_size=20)
+    size = 0
+    for packed in packed_files:
+        data = getattr(packed, "data", None)
+        if data is None:
+            return None, 0  # Nothing readable to compare
+        digest.update(data)
+        size += len(data)
+    return digest.hexdigest(), size
+
+
+def _settings_key(image):
+    """ Images only merge if they would also look the same """
+    return (image.source, image.colorspace_settings.name, image.alpha_mode)
+
+
+def find_duplicate_images(images=None, workers=HASH_WORKERS):
+    """ Groups images with identical content. Returns a list of DuplicateGroup """
+    images = list(bpy.data.images if images is None else images)
+
+    candidates = []  # (image, packed?, absolute path)
+    for image in images:
+        if image.source != 'FILE' or image.library is not None:
+            continue  # Generated, UDIM, movie and linked images are left alone
+        if image.packed_file is not None:
+            candidates.append((image, True, None))
+        elif image.filepath:
+            candidates.append((image, False, os.path.normpath(bpy.path.abspath(image.filepath))))
+
+    file_hashes = hash_files([path for _, packed, path in candidates if not packed], workers)
+
+    groups = {}
+    for image, packed, path in candidates:
+        digest, size = _packed_digest(image) if packed else file_hashes[path]
+        if digest is None:
+            continue  # Missing file, nothing to compare
+        groups.setdefault((digest, _settings_key(image)), []).append((image, size))
+
+    index = get_image_usage_index()
+    result = []
+    for (digest, _), members in groups.items():
+        if len(members) < 2:
+            continue
+        # Keep unpacked before packed, then the most used image (fewest remaps), then the cleanest name
+        members.sort(key=lambda member: (member[0].packed_file is not None, -len(index.users_of(member[0])),
+                                         len(member[0].name), member[0].name))
+        keep, size = members[0]
+        result.append(DuplicateGroup(keep, [image for image, _ in members[1:]], digest, size))
+    return result
+
+
+def deduplicate_images(dry_run=False, remove=True, images=None):
+    """ Remaps every user of each duplicate onto the kept image.
+
+    Returns a report dict with the groups found and the bytes saved.
+    """
+    groups = find_duplicate_images(images)
+    index = get_image_usage_index()
+    report = {"groups": len(groups), "duplicates": 0, "bytes_saved": 0, "users_remapped": 0, "merged": []}
+    # Queried once up front: removing an image changes the ID counts, and any later query would rebuild the index
+    user_counts = {image: len(users) for image, users in
+                   index.user_map([duplicate for group in groups for duplicate in group.duplicates]).items()}
+
+    for group in groups:
+        for duplicate in group.duplicates:
+            report["duplicates"] += 1
+            report["bytes_saved"] += group.size
+            report["users_remapped"] += user_counts[duplicate]
+            report["merged"].append((duplicate.name, group.keep.name))
+            if dry_run:
+                continue
+            duplicate.user_remap(group.keep)  # Materials, worlds, node groups, brushes... in one call
+            if remove:
+                bpy.data.images.remove(duplicate)
+
+    if groups and not dry_run:
+        index.invalidate()  # Users moved to the kept images
+    return report
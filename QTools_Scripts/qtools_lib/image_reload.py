@@ -0,0 +1,80 @@
+""" Deferred image reloading.
+
+Changing Image.filepath already frees the old buffers, so Blender decodes the
+new file the first time the image is drawn. These helpers only force a reload
+for the images that matter, optionally a few per timer tick so the UI stays
+responsive while a large relink settles.
+"""
+from collections import deque
+
+import bpy
+
+from .image_users import get_image_usage_index
+
+RELOAD_BATCH = 20  # Images reloaded per timer tick
+RELOAD_INTERVAL = 0.05  # Seconds between ticks
+
+_queue = deque()
+
+
+def images_visible_in_view_layer(view_layer, scene):
+    """ Images reachable from the visible objects (materials, light nodes, geometry nodes) and from the world """
+    owners = set()
+    for obj in view_layer.objects:
+        if obj.visible_get(view_layer=view_layer):
+            owners.add(obj)
+            owners.update(slot.material for slot in obj.material_slots if slot.material)
+            if obj.type == 'LIGHT':
+                owners.add(obj.data)
+    if scene.world:
+        owners.add(scene.world)
+    return get_image_usage_index().images_of_many(owners)
+
+
+def select_images_to_reload(images, mode, context=None):
+    """ Filters changed images by reload mode: 'ALL', 'USED', 'VISIBLE' or 'NONE' """
+    if mode == 'ALL':
+        return list(images)
+    if mode == 'USED':
+        return [image for image in images if image.users > (1 if image.use_fake_user else 0)]
+    if mode == 'VISIBLE':
+        context = context or bpy.context
+        visible = images_visible_in_view_layer(context.view_layer, context.scene)
+        return [image for image in images if image in visible]
+    return []
+
+
+def _redraw():
+    window_manager = bpy.context.window_manager
+    if window_manager is None:
+        return  # Background mode
+    for window in window_manager.windows:
+        for area in window.screen.areas:
+            if area.type in {'VIEW_3D', 'IMAGE_EDITOR', 'NODE_EDITOR'}:
+                area.tag_redraw()
+
+
+def _reload_tick():
+    for _ in range(min(RELOAD_BATCH, len(_queue))):
+        image_name = _queue.popleft()
+        image = bpy.data.images.get(image_name)
+        if image is not None:  # Image may have been deleted since it was queued
+            image.reload()
+    _redraw()
+    if _queue:
+        return RELOAD_INTERVAL
+    print("🔄 Deferred texture reload finished")
+    return None
+
+
+def reload_images(images, time_sliced=True):
+    """ Reloads the images now, or queues them to be reloaded a batch per timer tick """
+    if not time_sliced or bpy.app.background:
+        for image in images:
+            image.reload()
+        _redraw()
+        return
+
+    _queue.extend(image.name for image in images)
+    if not bpy.app.timers.is_registered(_reload_tick):
+        bpy.app.timers.register(_reload_tick, first_interval=RELOAD_INTERVAL)
@@ -0,0 +1,195 @@
+""" Reverse index of image usage: image -> users and user -> images.
+
+Built from a single sweep over every node tree (materials, worlds, lights,
+node groups including geometry nodes), image textures and geometry nodes
+modifier inputs. Nested node groups are resolved, so a material using a
+group that samples an image counts as a user of that image.
+
+The index stays alive between script runs. A depsgraph handler marks
+edited node trees dirty, and only those are swept again on the next query;
+adding or removing IDs, loading a file or undoing rebuilds it fully.
+"""
+import bpy
+
+from . import handlers
+
+_index = None
+
+
+def _tree_refs(node_tree):
+    """ Direct image and node group references of a node tree """
+    images, groups = set(), set()
+    for node in node_tree.nodes:
+        image = getattr(node, "image", None)
+        if image is not None:
+            images.add(image)
+        if node.type == 'GROUP' and node.node_tree is not None:
+            groups.add(node.node_tree)
+        for socket in node.inputs:
+            if socket.type == 'IMAGE' and socket.default_value is not None:
+                images.add(socket.default_value)  # Geometry nodes Image sockets
+    return images, groups
+
+
+def _object_refs(obj):
+    """ Images fed into geometry nodes modifier inputs, and the node groups of those modifiers """
+    images, groups = set(), set()
+    for modifier in obj.modifiers:
+        if modifier.type != 'NODES' or modifier.node_group is None:
+            continue
+        groups.add(modifier.node_group)
+        for item in modifier.node_group.interface.items_tree:
+            if getattr(item, "socket_type", None) == 'NodeSocketImage' and item.in_out == 'INPUT':
+                image = modifier.get(item.identifier)
+                if isinstance(image, bpy.types.Image):
+                    images.add(image)
+    return images, groups
+
+
+def _refs_of(owner):
+    """ Direct (images, node groups) of any ID that can use an image """
+    if isinstance(owner, bpy.types.NodeTree):
+        return _tree_refs(owner)
+    if isinstance(owner, bpy.types.Object):
+        return _object_refs(owner)
+    if isinstance(owner, bpy.types.Texture):
+        image = getattr(owner, "image", None)
+        return ({image} if image is not None else set()), set()
+    if owner.node_tree is not None:  # Material, world, light
+        return _tree_refs(owner.node_tree)
+    return set(), set()
+
+
+def _id_counts():
+    data = bpy.data
+    return (len(data.images), len(data.materials), len(data.worlds), len(data.lights),
+            len(data.node_groups), len(data.textures), len(data.objects))
+
+
+class ImageUsageIndex:
+    """ Image <-> user lookup shared by the texture scripts """
+
+    def __init__(self):
+        self._direct = {}  # Owner ID -> (direct images, direct node groups)
+        self._images_of = {}  # Owner ID -> all images, nested groups included
+        self._users_of = {}  # Image -> owner IDs
+        self._dirty = set()  # Owners edited since the last query
+        self._valid = False
+        self._counts = None
+
+    # -- building -----------------------------------------------------------
+
+    def _owners(self):
+        data = bpy.data
+        yield from data.materials
+        yield from data.worlds
+        yield from data.lights
+        yield from data.node_groups
+        yield from data.textures
+        yield from (obj for obj in data.objects if obj.modifiers)
+
+    def _rebuild(self):
+        self._direct = {}
+        for owner in self._owners():
+            images, groups = _refs_of(owner)
+            if images or groups:
+                self._direct[owner] = (images, groups)
+        self._dirty.clear()
+        self._valid = True
+        self._counts = _id_counts()
+        self._resolve()
+
+    def _resolve(self):
+        """ Expands nested groups and builds both directions of the index """
+        resolved = {}
+
+        def images_of(owner, stack):
+            if owner in resolved:
+                return resolved[owner]
+            images, groups = self._direct.get(owner, (set(), set()))
+            result = set(images)
+            for group in groups:
+                if group not in stack:  # Guard against recursive groups
+                    result |= images_of(group, stack | {group})
+            resolved[owner] = result
+            return result
+
+        users_of = {}
+        for owner in self._direct:
+            for image in images_of(owner, {owner}):
+                users_of.setdefault(image, set()).add(owner)
+        self._images_of = resolved
+        self._users_of = users_of
+
+    def _ensure(self):
+        if not self._valid or self._counts != _id_counts():
+            self._rebuild()
+        elif self._dirty:
+            dirty, self._dirty = self._dirty, set()
+            for owner in dirty:
+                try:
+                    self._direct[owner] = _refs_of(owner)
+                except ReferenceError:
+                    self._rebuild()  # Owner was deleted meanwhile
+                    return
+            self._resolve()
+
+    # -- invalidation -------------------------------------------------------
+
+    def invalidate(self, owner=None):
+        """ Marks one owner (or the whole index) for re-sweeping on the next query """
+        if owner is None:
+            self._valid = False
+        else:
+            self._dirty.add(owner)
+
+    # -- queries ------------------------------------------------------------
+
+    def users_of(self, image):
+        """ IDs using the image directly or through nested node groups """
+        self._ensure()
+        return self._users_of.get(image, set())
+
+    def images_of(self, owner):
+        """ Images used by a material, world, light, node group, texture or object """
+        self._ensure()
+        return self._images_of.get(owner, set())
+
+    def images_of_many(self, owners):
+        self._ensure()
+        images = set()
+        for owner in owners:
+            images |= self._images_of.get(owner, set())
+        return images
+
+    def user_map(self, images=None):
+        """ {image: set of users} for the given images (all images by default) """
+        self._ensure()
+        images = bpy.data.images if images is None else images
+        return {image: self._users_of.get(image, set()) for image in images}
+
+
+def _on_depsgraph_update(depsgraph):
+    if _index is None:
+        return
+    for update in depsgraph.updates:
+        id_data = update.id.original
+        if isinstance(id_data, (bpy.types.Material, bpy.types.World, bpy.types.Light,
+                                bpy.types.NodeTree, bpy.types.Texture)):
+            _index.invalidate(id_data)
+        elif isinstance(id_data, bpy.types.Object) and update.is_updated_geometry:
+            _index.invalidate(id_data)  # Geometry nodes modifier inputs may have changed
+
+
+def _on_file_change():
+    if _index is not None:
+        _index.invalidate()
+
+
+def get_image_usage_index():
+    """ Returns the shared index, registering its invalidation handlers on first use """
+    global _index
+    if _index is None:
+        _index = ImageUsageIndex()
+    handlers.add_listener("image_users", _on_depsgraph_update, _on_file_change)
+    return _index
@@ -0,0 +1,37 @@
+""" Lays objects out on a plane with the packers of qtools_lib.packing.
+
+World bounds come from qtools_lib.bounds, the packing is computed once and
+all objects are moved in a single pass afterwards (no view_layer.update()
+between placements). Objects are assumed to be unparented.
+"""
+import numpy as np
+
+from .bounds import get_bounds_cache, offset_objects
+from .packing import pack
+
+PLANES = {  # Plane -> (horizontal axis, vertical axis)
+    "XY": (0, 1),
+    "XZ": (0, 2),
+}
+
+
+def arrange_objects(objects, plane="XZ", method="skyline", padding=0.05, aspect=1.0, sort="height",
+                    max_width=None, origin=(0.0, 0.0, 0.0)):
+    """ Packs the world bounding boxes of objects on plane, lower-left corner at origin. Returns the Packing """
+    if plane not in PLANES:
+        raise ValueError(f"Unknown plane '{plane}' (expected one of {', '.join(PLANES)})")
+    objects = list(objects)
+    if not objects:
+        return pack([])
+
+    u, v = PLANES[plane]
+    mins, maxs = get_bounds_cache().world_bounds(objects)
+    sizes = list(zip((maxs[:, u] - mins[:, u]).tolist(), (maxs[:, v] - mins[:, v]).tolist()))
+    packing = pack(sizes, method=method, padding=padding, aspect=aspect, sort=sort, max_width=max_width)
+
+    positions = np.array(packing.positions, dtype=np.float64)
+    deltas = np.zeros_like(mins)
+    deltas[:, u] = positions[:, 0] + origin[u] - mins[:, u]
+    deltas[:, v] = positions[:, 1] + origin[v] - mins[:, v]
+    offset_objects(objects, deltas)
+    return packing
@@ -0,0 +1,130 @@
+""" Data-level localization and library overrides for linked assets.
+
+Both work on whole sets of IDs in one call, without operators, active
+objects or selection:
+
+    make_local_hierarchy   makes the given linked IDs and every linked ID
+                           they use local (ID.make_local), each only once
+    override_hierarchy     creates one library override hierarchy per
+                           linked root (override_hierarchy_create), also
+                           for local empties instancing a linked collection
+
+Dependencies come from a single bpy.data.user_map() call, so shared
+meshes, materials and images are found and processed once.
+"""
+from collections import Counter, deque
+
+import bpy
+
+
+def linked_dependencies(ids):
+    """ The linked IDs among ids and everything they use, directly or not.
+
+    Returned users first: an ID comes after every found ID that uses it, so
+    by the time it is made local it has local users (make_local does nothing
+    on an ID only used by linked data).
+    """
+    uses = {}  # ID -> IDs it uses (user_map gives the opposite direction)
+    for used, users in bpy.data.user_map().items():
+        if used.library is not None:
+            for user in users:
+                if user != used:
+                    uses.setdefault(user, set()).add(used)
+
+    found = {}  # Ordered set, in discovery (breadth-first) order
+    seen = set()
+    queue = deque(ids)
+    while queue:
+        id_data = queue.popleft()
+        if id_data in seen:
+            continue
+        seen.add(id_data)
+        if id_data.library is not None:
+            found[id_data] = None
+        queue.extend(uses.get(id_data, ()))
+
+    # Reverse topological order of the found IDs (Kahn), ties in discovery order
+    users_left = Counter(used for id_data in found for used in uses.get(id_data, ()) if used in found)
+    ready = deque(id_data for id_data in found if not users_left[id_data])
+    ordered = []
+    while found:
+        if not ready:
+            ready.append(next(iter(found)))  # Cycle (e.g. objects using each other): break it in discovery order
+        id_data = ready.popleft()
+        if id_data not in found:
+            continue
+        del found[id_data]
+        ordered.append(id_data)
+        for used in uses.get(id_data, ()):
+            if used in found:
+                users_left[used] -= 1
+                if users_left[used] == 0:
+                    ready.append(used)
+    return ordered
+
+
+def _type_name(id_data):
+    return type(id_data).__name__
+
+
+def make_local_hierarchy(ids):
+    """ Makes ids and all the linked data they depend on local. Returns a report dict """
+    report = {"made_local": Counter(), "copied": 0, "failed": []}
+    for id_data in linked_dependencies(ids):
+        if id_data.library is None:
+            continue  # Already made local through a user
+        name = id_data.name
+        try:
+            local = id_data.make_local()
+        except RuntimeError as e:
+            report["failed"].append((name, str(e)))
+            continue
+        if local is None or local.library is not None:
+            report["failed"].append((name, "still linked (no local user)"))
+            continue
+        if local != id_data:
+            # A local copy was made because other linked data still uses the original: point local users at it
+            id_data.user_remap(local)
+            report["copied"] += 1
+        report["made_local"][_type_name(local)] += 1
+    return report
+
+
+def override_roots(ids):
+    """ Top-level linked collections/objects to override, and the empties instancing them.
+
+    Returns a list of (linked ID, reference instance or None), without duplicates
+    and without collections that are inside another root.
+    """
+    roots = {}
+    for id_data in ids:
+        if isinstance(id_data, bpy.types.Object) and id_data.library is None and id_data.instance_collection \
+                and id_data.instance_collection.library is not None:
+            roots.setdefault(id_data.instance_collection, id_data)  # Override replaces the instance
+        elif isinstance(id_data, (bpy.types.Object, bpy.types.Collection)) and id_data.library is not None \
+                and id_data.override_library is None:
+            roots.setdefault(id_data, None)
+
+    # Objects and collections already covered by a root collection are overridden with it
+    covered = set()
+    for id_data in roots:
+        if isinstance(id_data, bpy.types.Collection):
+            covered.update(id_data.all_objects)
+            covered.update(id_data.children_recursive)
+    return [(id_data, reference) for id_data, reference in roots.items() if id_data not in covered]
+
+
+def override_hierarchy(ids, scene=None, view_layer=None, fully_editable=False):
+    """ Creates library overrides for the hierarchies of ids. Returns a report dict """
+    scene = scene or bpy.context.scene
+    view_layer = view_layer or bpy.context.view_layer
+    report = {"overrides": [], "failed": []}
+    for id_data, reference in override_roots(ids):
+        try:
+            override = id_data.override_hierarchy_create(scene, view_layer, reference=reference,
+                                                          do_fully_editable=fully_editable)
+        except RuntimeError as e:
+            report["failed"].append((id_data.name, str(e)))
+            continue
+        report["overrides"].append((id_data.name, override))
+    return report
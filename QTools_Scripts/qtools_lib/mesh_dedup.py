@@ -0,0 +1,274 @@
+""" Geometry deduplication: share one mesh between objects with identical geometry.
+
+Every mesh is read with foreach_get. Meshes are bucketed by a hash of their
+topology (edges, faces), UVs and materials plus their radius of gyration,
+which does not change under rotation. Within a bucket, candidates are
+matched vertex by vertex with the Kabsch algorithm, so copies that were
+rotated or moved before being applied still match. The rigid transform
+found is moved into the object transform when the object is relinked, but
+only where the object can hold it without shear (no non-uniform scale
+around it); elsewhere only identical copies are shared.
+
+The hash also covers smooth shading and the generic attributes (sharp
+edges and faces, colors, creases...). Meshes with shape keys or custom
+normals, and meshes of objects with vertex groups, are left alone. Near a
+tolerance boundary identical meshes may stay separate, but different meshes
+are never merged: every match is checked against the tolerance.
+"""
+import hashlib
+from collections import namedtuple
+
+import numpy as np
+
+import bpy
+from mathutils import Matrix
+
+TOLERANCE = 1e-4  # Largest vertex distance (mesh units) between matching meshes
+UV_TOLERANCE = 1e-5
+ATTRIBUTE_TOLERANCE = 1e-5
+MATRIX_TOLERANCE = 1e-5  # Largest difference between an object matrix and its location/rotation/scale rebuild
+
+# Attribute data type -> (foreach_get property, values per element, dtype); STRING can't be read in bulk
+ATTRIBUTE_FIELDS = {
+    'FLOAT': ("value", 1, np.float32), 'INT': ("value", 1, np.int32), 'INT8': ("value", 1, np.int32),
+    'BOOLEAN': ("value", 1, bool), 'FLOAT2': ("vector", 2, np.float32), 'INT32_2D': ("value", 2, np.int32),
+    'FLOAT_VECTOR': ("vector", 3, np.float32), 'FLOAT_COLOR': ("color", 4, np.float32),
+    'BYTE_COLOR': ("color", 4, np.float32), 'QUATERNION': ("value", 4, np.float32),
+    'FLOAT4X4': ("value", 16, np.float32),
+}
+
+MeshData = namedtuple("MeshData", ["mesh", "coords", "digest", "gyration", "size"])
+DuplicateGroup = namedtuple("DuplicateGroup", ["keep", "duplicates", "size"])  # duplicates: [(mesh, transform)]
+
+
+def _read_mesh(mesh):
+    """ (coords, digest, size): vertex positions, hash of everything but the positions, bytes of the arrays """
+    coords = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", coords)
+    edges = np.empty(len(mesh.edges) * 2, dtype=np.int32)
+    mesh.edges.foreach_get("vertices", edges)
+    loop_vertices = np.empty(len(mesh.loops), dtype=np.int32)
+    mesh.loops.foreach_get("vertex_index", loop_vertices)
+    loop_totals = np.empty(len(mesh.polygons), dtype=np.int32)
+    mesh.polygons.foreach_get("loop_total", loop_totals)
+    material_indices = np.empty(len(mesh.polygons), dtype=np.int32)
+    mesh.polygons.foreach_get("material_index", material_indices)
+
+    digest = hashlib.blake2b(digest_size=20)
+    digest.update(np.array([len(mesh.vertices), len(mesh.edges), len(mesh.loops)], dtype=np.int64).tobytes())
+    for array in (edges, loop_vertices, loop_totals, material_indices):
+        digest.update(array.tobytes())
+    size = coords.nbytes + edges.nbytes + loop_vertices.nbytes + loop_totals.nbytes + material_indices.nbytes
+    for uv_layer in mesh.uv_layers:
+        uvs = np.empty(len(mesh.loops) * 2, dtype=np.float32)
+        uv_layer.data.foreach_get("uv", uvs)
+        digest.update(uv_layer.name.encode())
+        digest.update(np.round(uvs / UV_TOLERANCE).astype(np.int64).tobytes())
+        size += uvs.nbytes
+    smooth = np.empty(len(mesh.polygons), dtype=bool)
+    mesh.polygons.foreach_get("use_smooth", smooth)
+    digest.update(smooth.tobytes())
+    size += _hash_attributes(mesh, digest)
+    digest.update(repr([material.name_full if material else "" for material in mesh.materials]).encode())
+    return coords.reshape(-1, 3).astype(np.float64), digest.hexdigest(), size
+
+
+def _hash_attributes(mesh, digest):
+    """ Adds the generic attributes (sharp_face, sharp_edge, colors, ...) to digest. Returns their size in bytes """
+    skipped = {"position", "material_index"} | {uv_layer.name for uv_layer in mesh.uv_layers}
+    size = 0
+    for attribute in sorted(mesh.attributes, key=lambda a: a.name):
+        if attribute.name in skipped or attribute.name.startswith("."):
+            continue  # Hashed above, or internal (selection, hiding, topology)
+        digest.update(f"{attribute.name}/{attribute.domain}/{attribute.data_type}".encode())
+        field = ATTRIBUTE_FIELDS.get(attribute.data_type)
+        if field is None:
+            continue
+        prop, width, dtype = field
+        values = np.empty(len(attribute.data) * width, dtype=dtype)
+        attribute.data.foreach_get(prop, values)
+        if dtype == np.float32:
+            values = np.round(values / ATTRIBUTE_TOLERANCE).astype(np.int64)
+        digest.update(values.tobytes())
+        size += values.nbytes
+    return size
+
+
+def rigid_transform(source, target, tolerance=TOLERANCE):
+    """ 4x4 matrix T with target ≈ T @ source (rotation and translation, vertices in the same order), or None """
+    if np.abs(source - target).max(initial=0.0) <= tolerance:
+        return np.identity(4)  # Plain copies, the common case
+
+    source_center, target_center = source.mean(axis=0), target.mean(axis=0)
+    covariance = (source - source_center).T @ (target - target_center)
+    u, _, vt = np.linalg.svd(covariance)
+    correction = np.diag([1.0, 1.0, np.sign(np.linalg.det(vt.T @ u.T)) or 1.0])  # No mirroring
+    rotation = vt.T @ correction @ u.T
+    translation = target_center - rotation @ source_center
+
+    if np.abs(source @ rotation.T + translation - target).max() > tolerance:
+        return None
+    transform = np.identity(4)
+    transform[:3, :3] = rotation
+    transform[:3, 3] = translation
+    return transform
+
+
+def _mesh_users():
+    """ Mesh -> objects using it, in one pass over the objects """
+    users = {}
+    for obj in bpy.data.objects:
+        if obj.type == 'MESH' and obj.data is not None:
+            users.setdefault(obj.data, []).append(obj)
+    return users
+
+
+def _is_loc_rot_scale(matrix):
+    """ True if matrix has no shear, so assigning it to an object keeps it exact """
+    rebuilt = Matrix.LocRotScale(*matrix.decompose())
+    return all(abs(a - b) <= MATRIX_TOLERANCE * max(1.0, abs(b))
+               for rebuilt_row, row in zip(rebuilt, matrix) for a, b in zip(rebuilt_row, row))
+
+
+def _relinked_matrix(obj, transform):
+    """ World matrix of obj once it shows the kept mesh: old world vertices = M_obj @ T @ kept vertices """
+    if transform is None:
+        return obj.matrix_world.copy()
+    return obj.matrix_world @ Matrix(transform.tolist())
+
+
+def can_take_transform(obj, transform):
+    """ True if obj can be relinked with transform without shear, in world space and relative to its parent """
+    matrix = _relinked_matrix(obj, transform)
+    if not _is_loc_rot_scale(matrix):
+        return False
+    if obj.parent is None:
+        return True
+    basis = (obj.parent.matrix_world @ obj.matrix_parent_inverse).inverted_safe() @ matrix
+    return _is_loc_rot_scale(basis)
+
+
+def _is_identity(transform):
+    return np.allclose(transform, np.identity(4))
+
+
+def find_duplicate_meshes(meshes=None, tolerance=TOLERANCE):
+    """ Groups meshes with the same geometry up to a rigid transform. Returns a list of DuplicateGroup """
+    users = _mesh_users()
+    # Vertex weights live on the mesh but their groups on the object: sharing would mix rigs up
+    meshes = [mesh for mesh in (bpy.data.meshes if meshes is None else meshes)
+              if mesh.library is None and mesh in users and mesh.shape_keys is None
+              and not mesh.has_custom_normals and len(mesh.vertices)
+              and not any(obj.vertex_groups for obj in users[mesh])]
+
+    # Most used meshes first, so they become the kept ones (fewest relinks)
+    meshes.sort(key=lambda mesh: (-len(users[mesh]), len(mesh.name), mesh.name))
+
+    buckets = {}  # (digest, gyration bin) -> [[kept MeshData, [(mesh, transform), ...]], ...]
+    for mesh in meshes:
+        coords, digest, size = _read_mesh(mesh)
+        gyration = np.sqrt(((coords - coords.mean(axis=0)) ** 2).sum(axis=1).mean())
+        data = MeshData(mesh, coords, digest, gyration, size)
+        gyration_bin = int(gyration // tolerance)
+
+        # A match changes the gyration by at most the tolerance: look in the neighbouring bins too
+        match = None
+        for candidate_bin in (gyration_bin, gyration_bin - 1, gyration_bin + 1):
+            for group in buckets.get((digest, candidate_bin), []):
+                transform = rigid_transform(group[0].coords, coords, tolerance)
+                # A rotation only goes into objects that can hold it without shear
+                if transform is not None and (_is_identity(transform) or all(
+                        can_take_transform(obj, transform) for obj in users[mesh] if obj.library is None)):
+                    match = group
+                    break
+            if match is not None:
+                break
+
+        if match is None:
+            buckets.setdefault((digest, gyration_bin), []).append([data, []])
+        else:
+            match[1].append((mesh, transform))
+
+    return [DuplicateGroup(kept.mesh, duplicates, kept.size)
+            for groups in buckets.values() for kept, duplicates in groups if duplicates]
+
+
+def _instance_collection(mesh):
+    """ Collection holding one object with mesh at the origin, created once per mesh """
+    name = f"{mesh.name}_INST"
+    collection = bpy.data.collections.get(name)
+    if collection is None:
+        collection = bpy.data.collections.new(name)
+        collection.objects.link(bpy.data.objects.new(name, mesh))
+    return collection
+
+
+def _can_instance(obj):
+    """ Objects whose look only depends on their mesh can become collection instances """
+    return (not obj.modifiers and not obj.children and obj.library is None
+            and all(slot.link == 'DATA' for slot in obj.material_slots))
+
+
+def relink_object(obj, mesh, transform=None, use_instances=False):
+    """ Makes obj show mesh, where its own mesh is transform @ mesh. Returns the object (or its instance) """
+    if transform is not None and not can_take_transform(obj, transform):
+        raise ValueError(f"'{obj.name}' can't hold the transform without shear (non-uniform scale)")
+    matrix = _relinked_matrix(obj, transform)
+    children = [(child, child.matrix_world.copy()) for child in obj.children]
+
+    if use_instances and _can_instance(obj):
+        instance = bpy.data.objects.new(obj.name, None)
+        instance.instance_type = 'COLLECTION'
+        instance.instance_collection = _instance_collection(mesh)
+        for collection in obj.users_collection:
+            collection.objects.link(instance)
+        instance.matrix_world = matrix
+        name = obj.name
+        bpy.data.objects.remove(obj)
+        instance.name = name  # Free now that the original is gone
+        return instance
+
+    obj.data = mesh
+    obj.matrix_world = matrix
+    for child, child_matrix in children:
+        child.matrix_world = child_matrix  # Children must not move with the compensated parent
+    return obj
+
+
+def deduplicate_meshes(dry_run=False, use_instances=False, tolerance=TOLERANCE, meshes=None):
+    """ Relinks the users of each duplicate mesh to the kept one and removes the duplicates.
+
+    Returns a report dict with the groups found and the bytes saved.
+    """
+    users = _mesh_users()
+    groups = find_duplicate_meshes(meshes, tolerance)
+    report = {"groups": len(groups), "duplicates": 0, "meshes_removed": 0, "bytes_saved": 0,
+              "objects_relinked": 0, "transformed": 0, "merged": []}
+
+    for group in groups:
+        if use_instances and not dry_run:
+            # Users of the kept mesh become instances too, the instance collection then holds its only user
+            for obj in users[group.keep]:
+                if obj.library is None:
+                    relink_object(obj, group.keep, None, use_instances)
+
+        for duplicate, transform in group.duplicates:
+            report["duplicates"] += 1
+            report["bytes_saved"] += group.size
+            report["merged"].append((duplicate.name, group.keep.name))
+            is_identity = _is_identity(transform)
+            if not is_identity:
+                report["transformed"] += 1
+            if dry_run:
+                report["objects_relinked"] += len(users[duplicate])
+                continue
+
+            for obj in users[duplicate]:
+                if obj.library is not None:
+                    continue  # Linked objects keep their linked mesh
+                relink_object(obj, group.keep, None if is_identity else transform, use_instances)
+                report["objects_relinked"] += 1
+            if duplicate.users == 0:
+                bpy.data.meshes.remove(duplicate)
+                report["meshes_removed"] += 1
+    return report
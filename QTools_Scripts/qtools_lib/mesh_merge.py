@@ -0,0 +1,116 @@
+""" Merges evaluated objects into one new mesh without operators.
+
+Every object is evaluated through the depsgraph (modifiers applied, curves
+and text converted), its arrays are read with foreach_get, transformed and
+concatenated with NumPy and written to a new mesh with foreach_set. Nothing
+is selected, duplicated or joined, so it also works in background mode
+(blender -b) and leaves the source objects untouched.
+
+Loose edges (edges without faces) are not carried over: the merged mesh gets
+its edges from the faces.
+"""
+from collections import namedtuple
+
+import numpy as np
+
+import bpy
+
+GEOMETRY_TYPES = {'MESH', 'CURVE', 'SURFACE', 'FONT', 'META'}
+
+MergeResult = namedtuple("MergeResult", ["mesh", "bounds_min", "bounds_max", "source_count"])
+
+
+def _matrix_array(matrix):
+    return np.array(matrix, dtype=np.float64).reshape(4, 4)
+
+
+def _read_mesh(mesh):
+    """ Vertex, face and per-face arrays of a mesh """
+    coords = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", coords)
+    loop_vertices = np.empty(len(mesh.loops), dtype=np.int32)
+    mesh.loops.foreach_get("vertex_index", loop_vertices)
+    loop_totals = np.empty(len(mesh.polygons), dtype=np.int32)
+    mesh.polygons.foreach_get("loop_total", loop_totals)
+    material_indices = np.empty(len(mesh.polygons), dtype=np.int32)
+    mesh.polygons.foreach_get("material_index", material_indices)
+    smooth = np.empty(len(mesh.polygons), dtype=bool)
+    mesh.polygons.foreach_get("use_smooth", smooth)
+
+    uvs = np.zeros(len(mesh.loops) * 2, dtype=np.float32)
+    if mesh.uv_layers.active is not None:
+        mesh.uv_layers.active.data.foreach_get("uv", uvs)
+    return coords.reshape(-1, 3), loop_vertices, loop_totals, material_indices, smooth, uvs
+
+
+def merge_objects(objects, name, depsgraph=None, matrix=None):
+    """ Builds one mesh from the evaluated geometry of objects. Returns MergeResult.
+
+    Vertices end up in the space of matrix (an object's matrix_world; world
+    space if None). bounds_min/bounds_max are the world-space bounds of the
+    merged geometry. Materials are merged into one list, without duplicates.
+    """
+    if depsgraph is None:
+        depsgraph = bpy.context.evaluated_depsgraph_get()
+    to_local = np.linalg.inv(_matrix_array(matrix)) if matrix is not None else np.identity(4)
+
+    parts = []
+    materials = []
+    material_slots = {}  # Material -> index in the merged mesh
+    for obj in objects:
+        if obj.type not in GEOMETRY_TYPES:
+            continue
+        obj_eval = obj.evaluated_get(depsgraph)
+        mesh = obj_eval.to_mesh()
+        if mesh is None:
+            continue
+        try:
+            coords, loop_vertices, loop_totals, material_indices, smooth, uvs = _read_mesh(mesh)
+            slot_map = []
+            for slot in obj_eval.material_slots:
+                if slot.material not in material_slots:
+                    material_slots[slot.material] = len(materials)
+                    materials.append(slot.material)
+                slot_map.append(material_slots[slot.material])
+        finally:
+            obj_eval.to_mesh_clear()
+
+        world = _matrix_array(obj_eval.matrix_world)
+        world_coords = coords @ world[:3, :3].T + world[:3, 3]
+        slot_map = np.array(slot_map or [0], dtype=np.int32)
+        material_indices = slot_map[np.clip(material_indices, 0, len(slot_map) - 1)]
+        parts.append((world_coords, loop_vertices, loop_totals, material_indices, smooth, uvs))
+
+    merged = bpy.data.meshes.new(name)
+    if not parts:
+        return MergeResult(merged, np.zeros(3), np.zeros(3), 0)
+
+    # Concatenate everything, offsetting vertex indices by the vertices of the previous parts
+    vertex_offsets = np.cumsum([0] + [len(part[0]) for part in parts[:-1]])
+    world_coords = np.concatenate([part[0] for part in parts])
+    loop_vertices = np.concatenate([part[1] + offset for part, offset in zip(parts, vertex_offsets)])
+    loop_totals = np.concatenate([part[2] for part in parts])
+    material_indices = np.concatenate([part[3] for part in parts])
+    smooth = np.concatenate([part[4] for part in parts])
+    uvs = np.concatenate([part[5] for part in parts])
+    loop_starts = np.concatenate(([0], np.cumsum(loop_totals)[:-1])).astype(np.int32)
+
+    local_coords = world_coords @ to_local[:3, :3].T + to_local[:3, 3]
+
+    merged.vertices.add(len(local_coords))
+    merged.vertices.foreach_set("co", local_coords.astype(np.float32).ravel())
+    merged.loops.add(len(loop_vertices))
+    merged.loops.foreach_set("vertex_index", loop_vertices)
+    merged.polygons.add(len(loop_totals))
+    merged.polygons.foreach_set("loop_start", loop_starts)  # Face sizes follow from the starts (Blender 4.x)
+    merged.polygons.foreach_set("material_index", material_indices)
+    merged.polygons.foreach_set("use_smooth", smooth)
+    if len(uvs):
+        merged.uv_layers.new(name="UVMap").data.foreach_set("uv", uvs)
+    for material in materials:
+        merged.materials.append(material)
+    merged.update(calc_edges=True)
+
+    if not len(world_coords):
+        return MergeResult(merged, np.zeros(3), np.zeros(3), len(parts))
+    return MergeResult(merged, world_coords.min(axis=0), world_coords.max(axis=0), len(parts))
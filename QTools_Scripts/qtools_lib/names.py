@@ -0,0 +1,100 @@
+""" Asset name parsing shared by the renaming scripts.
+
+Names follow Base[_Variant]_Index[_SRT|_CST|_001...], where Index is a single
+isolated letter (capitals preferred). Base is the first word before the index,
+Variant the rest of it; stem is both together (what FixName compares).
+Anything between the index and the suffix is dropped. Patterns are compiled once and every
+parse is memoized, so the same collection, parent and asset names met again
+and again during a rename are only parsed once.
+"""
+import re
+from collections import namedtuple
+from functools import lru_cache
+
+EMPTY_SUFFIXES = ("_SRT", "_CST")  # Replaced by the conventions of naming_rules.json with set_empty_suffixes()
+
+
+def _suffix_re(suffixes):
+    """ Known suffixes (_SRT, _CST, numbers, etc.) at the end of a name """
+    return re.compile("(" + "".join(f"{re.escape(suffix)}|" for suffix in suffixes) + r"_[\d._]*)$")
+
+
+SUFFIX_RE = _suffix_re(EMPTY_SUFFIXES)
+# Isolated single letters (not next to another letter)
+ISOLATED_LETTER_RE = re.compile(r"(?<![A-Za-z])([A-Za-z])(?![A-Za-z])")
+
+CACHE_SIZE = 65536
+
+ParsedName = namedtuple("ParsedName", ["base", "index", "variant", "suffix", "stem"])
+
+VERBOSE = False  # Print a line per parse, like the old scripts did
+
+
+def set_verbose(verbose):
+    global VERBOSE
+    VERBOSE = verbose
+
+
+def debug(message):
+    """ Prints only when verbose mode is on """
+    if VERBOSE:
+        print(message)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def parse_name(name):
+    """ Splits a name into (base, index, variant, suffix, stem). index is None when no isolated letter is found """
+    suffix_match = SUFFIX_RE.search(name)
+    suffix = suffix_match.group(0) if suffix_match else ""
+    cleaned_name = name[:len(name) - len(suffix)] if suffix else name
+
+    isolated_letters = ISOLATED_LETTER_RE.findall(cleaned_name)
+    if not isolated_letters:
+        return ParsedName(name, None, "", suffix, name)
+
+    # Prioritize capitalized letters if present
+    index = next((letter for letter in isolated_letters if letter.isupper()), isolated_letters[-1])
+    stem = cleaned_name.rsplit(f"_{index}", 1)[0]
+    # Base[_Variant]: the variant is whatever follows the first word, before the index
+    base, _, variant = stem.strip("_").partition("_")
+    return ParsedName(base or stem, index, variant.strip("_"), suffix, stem)
+
+
+def extract_base_index(name, default_index=None):
+    """ Returns (stem, index), or (name, default_index) if the name has no index """
+    parsed = parse_name(name)
+    if parsed.index is None:
+        debug(f"❌ No valid index found in '{name}'. Using default: {default_index}")
+        return name, default_index
+    debug(f"✅ {name}: Base: {parsed.stem}, Index: {parsed.index}")
+    return parsed.stem, parsed.index
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def name_with_variant(obj_name, asset_name):
+    """ Rebuilds obj_name as Base_Variant_Index using the base and index of asset_name """
+    base, index = extract_base_index(asset_name)
+
+    # Remove base & index from the object name to isolate the variant
+    variant = obj_name.replace(base, "").replace(f"_{index}", "").strip("_")
+
+    # Ensure the variant is **only before the index** and does not interfere with suffixes
+    if variant and f"_{index}" in obj_name:
+        variant = obj_name.split(f"_{index}")[0].replace(base, "").strip("_")
+
+    return f"{base}_{variant}_{index}" if variant else f"{base}_{index}"
+
+
+def set_empty_suffixes(suffixes):
+    """ Sets the empty suffixes stripped before parsing; cached parses are dropped when they change """
+    global EMPTY_SUFFIXES, SUFFIX_RE
+    suffixes = tuple(suffixes)
+    if suffixes != EMPTY_SUFFIXES:
+        EMPTY_SUFFIXES = suffixes
+        SUFFIX_RE = _suffix_re(suffixes)
+        clear_caches()
+
+
+def clear_caches():
+    parse_name.cache_clear()
+    name_with_variant.cache_clear()
@@ -0,0 +1,270 @@
+""" Declarative naming rules for objects, object data and collections.
+
+Rules are loaded from a JSON or TOML file and evaluated in one pass over the
+IDs they target. The first matching rule of an ID gives its new name. The
+resulting plan can be printed as a dry-run diff and then applied as a
+single transaction (all renames are rolled back if one fails).
+
+A rule looks like:
+
+    {
+        "name": "Mesh data",
+        "id_type": "meshes",            # bpy.data collection
+        "object_type": ["MESH"],        # objects only: obj.type filter
+        "match": "",                    # regex the current name must contain
+        "exclude": "_LOD\\\\d$",          # regex that skips the ID
+        "shared": null,                 # true/false: only IDs with several/one user
+        "strip_prefix": ["KB3D_SHG_"],  # removed from {name}, first match only
+        "strip_suffix": ["_MSH"],
+        "replace": [["\\\\s+", "_"]],     # regex substitutions on {name}
+        "template": "{owner}_MSH",      # new name
+        "shared_template": "{name}_MSH" # used instead when the ID has several users
+    }
+
+Template fields: {name} (after strip/replace), {original}, {owner} (first
+object using the data, or the object itself), {type} (object type), {data}
+(object data name), {base}, {index}, {variant}, {suffix}, {stem} from
+qtools_lib.names.parse_name (Base[_Variant]_Index, stem = Base[_Variant]),
+and the conventions {srt_suffix}, {cst_suffix} and {data_suffix} (the data
+suffix of the rule's id_type).
+
+The optional "conventions" table of the same file holds the suffixes and
+prefixes the renaming scripts (FixName, Bulk_Rename_Mesh_Data,
+FixShogunKitbash...) use, so they all follow one file:
+
+    "conventions": {
+        "srt_suffix": "_SRT",
+        "cst_suffix": "_CST",
+        "data_suffixes": {"meshes": "_MSH"},
+        "group_prefixes": ["KB3D_SHG_"],
+        "group_suffixes": ["_grp"]
+    }
+"""
+import json
+import os
+import re
+from collections import namedtuple
+
+import bpy
+
+from .names import parse_name
+from .rename_planner import plan_renames as order_renames, rename_all
+
+# ID types whose users are objects (obj.data)
+OBJECT_DATA_TYPES = {
+    "meshes", "curves", "armatures", "cameras", "lights", "lattices", "metaballs",
+    "grease_pencils", "volumes", "pointclouds", "hair_curves", "speakers", "lightprobes",
+}
+
+# naming_rules.json next to the scripts
+DEFAULT_RULES_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "naming_rules.json")
+
+# Used for the conventions a rules file leaves out
+DEFAULT_CONVENTIONS = {
+    "srt_suffix": "_SRT",
+    "cst_suffix": "_CST",
+    "data_suffixes": {"meshes": "_MSH"},
+    "group_prefixes": ["KB3D_SHG_"],
+    "group_suffixes": ["_grp"],
+}
+
+RenameEntry = namedtuple("RenameEntry", ["id_type", "id_data", "old_name", "new_name", "rule"])
+Conventions = namedtuple("Conventions", list(DEFAULT_CONVENTIONS))
+
+
+class RuleError(ValueError):
+    """ Raised for malformed rules files """
+
+
+class _TemplateFields(dict):
+    def __missing__(self, key):
+        raise RuleError(f"Unknown template field '{{{key}}}'")
+
+
+class NamingRule:
+    """ One compiled rule """
+
+    def __init__(self, data, conventions=None):
+        self.conventions = conventions or Conventions(**DEFAULT_CONVENTIONS)
+        try:
+            self.name = data.get("name", data["template"])
+            self.id_type = data["id_type"]
+            self.template = data["template"]
+        except KeyError as e:
+            raise RuleError(f"Rule is missing '{e.args[0]}': {data}")
+        self.shared_template = data.get("shared_template")
+        self.object_types = set(data.get("object_type", []))
+        self.match = re.compile(data["match"]) if data.get("match") else None
+        self.exclude = re.compile(data["exclude"]) if data.get("exclude") else None
+        self.shared = data.get("shared")
+        self.strip_prefix = list(data.get("strip_prefix", []))
+        self.strip_suffix = list(data.get("strip_suffix", []))
+        self.replace = [(re.compile(pattern), repl) for pattern, repl in data.get("replace", [])]
+
+    def matches(self, id_data, name, users):
+        if self.object_types and getattr(id_data, "type", None) not in self.object_types:
+            return False
+        if self.match and not self.match.search(name):
+            return False
+        if self.exclude and self.exclude.search(name):
+            return False
+        if self.shared is not None and (users > 1) != self.shared:
+            return False
+        return True
+
+    def clean(self, name):
+        for prefix in self.strip_prefix:
+            if name.startswith(prefix):
+                name = name[len(prefix):]
+                break
+        for suffix in self.strip_suffix:
+            if suffix and name.endswith(suffix):
+                name = name[:-len(suffix)]
+                break
+        for pattern, repl in self.replace:
+            name = pattern.sub(repl, name)
+        return name
+
+    def target_name(self, id_data, name, owner, users):
+        cleaned = self.clean(name)
+        parsed = parse_name(cleaned)
+        fields = _TemplateFields(
+            name=cleaned,
+            original=name,
+            owner=owner or cleaned,
+            type=getattr(id_data, "type", ""),
+            data=getattr(getattr(id_data, "data", None), "name", ""),
+            base=parsed.base,
+            index=parsed.index or "",
+            variant=parsed.variant,
+            suffix=parsed.suffix,
+            stem=parsed.stem,
+            srt_suffix=self.conventions.srt_suffix,
+            cst_suffix=self.conventions.cst_suffix,
+            data_suffix=self.conventions.data_suffixes.get(self.id_type, ""),
+        )
+        template = self.shared_template if self.shared_template and users > 1 else self.template
+        return template.format_map(fields)
+
+
+def _read_rules_file(filepath):
+    if filepath.lower().endswith(".toml"):
+        import tomllib  # Python 3.11+, bundled with Blender 4.x
+        with open(filepath, "rb") as file:
+            return tomllib.load(file)
+    with open(filepath, encoding="utf-8") as file:
+        return json.load(file)
+
+
+def _conventions_of(data, filepath):
+    conventions = dict(DEFAULT_CONVENTIONS)
+    if isinstance(data, dict):
+        overrides = data.get("conventions", {})
+        unknown = set(overrides) - set(DEFAULT_CONVENTIONS)
+        if unknown:
+            raise RuleError(f"{os.path.basename(filepath)}: unknown conventions {sorted(unknown)}")
+        conventions.update(overrides)
+    return Conventions(**conventions)
+
+
+def load_conventions(filepath=None):
+    """ Suffixes and prefixes shared by the renaming scripts, from a rules file (naming_rules.json by default) """
+    filepath = bpy.path.abspath(filepath) if filepath else DEFAULT_RULES_FILE
+    return _conventions_of(_read_rules_file(filepath), filepath)
+
+
+def load_rules(filepath):
+    """ Loads a list of NamingRule from a .json or .toml file ({"rules": [...]}) """
+    data = _read_rules_file(filepath)
+    rules = data.get("rules") if isinstance(data, dict) else data
+    if not isinstance(rules, list):
+        raise RuleError(f"{os.path.basename(filepath)}: expected a 'rules' list")
+    conventions = _conventions_of(data, filepath)
+    return [NamingRule(rule, conventions) for rule in rules]
+
+
+def _owner_names(id_types):
+    """ Maps object data to the name of its first user object, in one pass over the objects """
+    owners = {}
+    if id_types & OBJECT_DATA_TYPES:
+        for obj in bpy.data.objects:  # Sorted by name, so the owner is deterministic
+            if obj.data is not None and obj.data not in owners:
+                owners[obj.data] = obj.name
+    if "materials" in id_types:
+        for obj in bpy.data.objects:
+            for slot in obj.material_slots:
+                if slot.material is not None and slot.material not in owners:
+                    owners[slot.material] = obj.name
+    return owners
+
+
+def plan_renames(rules, selection=None):
+    """ Computes every target name in one pass. Returns a list of RenameEntry for names that change.
+
+    selection optionally limits the plan to a set of IDs.
+    """
+    rules_by_type = {}
+    for rule in rules:
+        rules_by_type.setdefault(rule.id_type, []).append(rule)
+    owners = _owner_names(set(rules_by_type))
+
+    plan = []
+    for id_type, type_rules in rules_by_type.items():
+        collection = getattr(bpy.data, id_type, None)
+        if collection is None:
+            raise RuleError(f"Unknown id_type '{id_type}'")
+        for id_data in collection:
+            if id_data.library is not None or (selection is not None and id_data not in selection):
+                continue  # Linked IDs cannot be renamed
+            name = id_data.name
+            users = id_data.users - (1 if id_data.use_fake_user else 0)
+            owner = owners.get(id_data, name)
+            for rule in type_rules:
+                if rule.matches(id_data, name, users):
+                    new_name = rule.target_name(id_data, name, owner, users)
+                    if new_name != name:
+                        plan.append(RenameEntry(id_type, id_data, name, new_name, rule.name))
+                    break
+    return plan
+
+
+def format_diff(plan):
+    """ Human-readable dry-run diff, grouped by ID type """
+    lines = []
+    id_type = None
+    for entry in sorted(plan, key=lambda e: (e.id_type, e.old_name)):
+        if entry.id_type != id_type:
+            id_type = entry.id_type
+            lines.append(f"[{id_type}]")
+        lines.append(f"  - {entry.old_name}")
+        lines.append(f"  + {entry.new_name}    ({entry.rule})")
+    return lines
+
+
+def apply_plan(plan):
+    """ Applies all renames in a collision-free order, or none of them if one fails.
+
+    Returns (unassigned, changed) as reported by qtools_lib.rename_planner.
+    """
+    by_type = {}
+    for entry in plan:
+        by_type.setdefault(entry.id_type, {})[entry.id_data] = entry.new_name
+    originals = {entry.id_data: entry.old_name for entry in plan}
+
+    unassigned, changed = [], []
+    touched = {}  # id_type -> IDs renamed so far
+    try:
+        for id_type, mapping in by_type.items():
+            ordered = order_renames(getattr(bpy.data, id_type), mapping)
+            unassigned += ordered.unassigned
+            for id_data, name in ordered.steps:
+                touched.setdefault(id_type, []).append(id_data)
+                id_data.name = name
+                if id_data.name != name:
+                    changed.append((id_data, name, id_data.name))
+    except Exception:
+        # Roll back with the planner too, so the old names cannot collide either
+        for id_type, id_list in touched.items():
+            rename_all(getattr(bpy.data, id_type), {id_data: originals[id_data] for id_data in id_list})
+        raise
+    return unassigned, changed
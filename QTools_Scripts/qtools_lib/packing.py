@@ -0,0 +1,231 @@
+""" 2D rectangle packing for laying objects out on a plane.
+
+Rectangles are packed into a strip of fixed width that grows upwards. The
+strip width comes from max_width, or from the target aspect ratio
+(width / height) of the whole layout. Three packers are available:
+
+    shelf     rows of rectangles, a new row when the current one is full.
+              O(n log n), keeps the input order when sort is "none".
+    skyline   bottom-left placement on the skyline of what is placed so far.
+              O(n * k) with k skyline segments, denser than shelf.
+    maxrects  bottom-left placement in the maximal free rectangles.
+              Densest, roughly quadratic: meant for up to about a thousand.
+
+This module does not use bpy; qtools_lib.layout applies packings to objects.
+Run it directly (python -m qtools_lib.packing) for a density/runtime benchmark.
+"""
+import math
+import random
+import time
+from collections import namedtuple
+
+EPSILON = 1e-9
+
+Packing = namedtuple("Packing", ["positions", "width", "height"])  # positions: (x, y) of each input, same order
+
+SORT_KEYS = {
+    "none": None,
+    "height": lambda size: (size[1], size[0]),
+    "width": lambda size: (size[0], size[1]),
+    "area": lambda size: size[0] * size[1],
+    "max_side": lambda size: max(size),
+}
+
+
+def _pack_shelf(sizes, order, width):
+    positions = [None] * len(sizes)
+    x = y = shelf_height = 0.0
+    for i in order:
+        w, h = sizes[i]
+        if x > 0 and x + w > width + EPSILON:
+            y += shelf_height  # Row is full: start a new one above it
+            x = shelf_height = 0.0
+        positions[i] = (x, y)
+        x += w
+        shelf_height = max(shelf_height, h)
+    return positions
+
+
+def _skyline_fit(skyline, index, w, width):
+    """ Height at which a rectangle of width w rests when its left edge is at segment index, or None """
+    x = skyline[index][0]
+    if x + w > width + EPSILON:
+        return None
+    y = 0.0
+    remaining = w
+    while remaining > EPSILON and index < len(skyline):
+        y = max(y, skyline[index][1])
+        remaining -= skyline[index][2]
+        index += 1
+    return y
+
+
+def _skyline_add(skyline, index, x, top, w):
+    skyline.insert(index, [x, top, w])
+    end = x + w
+    following = index + 1
+    while following < len(skyline):
+        sx, sy, sw = skyline[following]
+        if sx >= end - EPSILON:
+            break
+        overlap = end - sx
+        if overlap >= sw - EPSILON:
+            del skyline[following]  # Fully covered by the new segment
+        else:
+            skyline[following] = [end, sy, sw - overlap]
+            break
+
+    # Merge neighbours at the same height
+    i = max(index - 1, 0)
+    while i < len(skyline) - 1 and i <= index + 1:
+        if abs(skyline[i][1] - skyline[i + 1][1]) <= EPSILON:
+            skyline[i][2] += skyline.pop(i + 1)[2]
+        else:
+            i += 1
+
+
+def _pack_skyline(sizes, order, width):
+    positions = [None] * len(sizes)
+    skyline = [[0.0, 0.0, width]]  # [x, top, width] segments from left to right
+    for i in order:
+        w, h = sizes[i]
+        best = None
+        for index in range(len(skyline)):
+            if best is not None and skyline[index][1] + h > best[0][0]:
+                continue  # Resting at least this high, can't beat the best position
+            y = _skyline_fit(skyline, index, w, width)
+            if y is not None and (best is None or (y + h, skyline[index][0]) < best[0]):
+                best = ((y + h, skyline[index][0]), index, y)
+        _, index, y = best  # The strip is at least as wide as any rectangle, so index 0 always fits
+        x = skyline[index][0]
+        positions[i] = (x, y)
+        _skyline_add(skyline, index, x, y + h, w)
+    return positions
+
+
+def _split_free(free, used):
+    """ Parts of the free rectangle not covered by used, or None if they don't intersect """
+    fx, fy, fw, fh = free
+    ux, uy, uw, uh = used
+    if ux >= fx + fw - EPSILON or ux + uw <= fx + EPSILON or uy >= fy + fh - EPSILON or uy + uh <= fy + EPSILON:
+        return None
+    parts = []
+    if ux > fx + EPSILON:
+        parts.append((fx, fy, ux - fx, fh))
+    if ux + uw < fx + fw - EPSILON:
+        parts.append((ux + uw, fy, fx + fw - ux - uw, fh))
+    if uy > fy + EPSILON:
+        parts.append((fx, fy, fw, uy - fy))
+    if uy + uh < fy + fh - EPSILON:
+        parts.append((fx, uy + uh, fw, fy + fh - uy - uh))
+    return parts
+
+
+def _contains(outer, inner):
+    return (inner[0] >= outer[0] - EPSILON and inner[1] >= outer[1] - EPSILON
+            and inner[0] + inner[2] <= outer[0] + outer[2] + EPSILON
+            and inner[1] + inner[3] <= outer[1] + outer[3] + EPSILON)
+
+
+def _pack_maxrects(sizes, order, width):
+    positions = [None] * len(sizes)
+    free_rects = [(0.0, 0.0, width, math.inf)]  # The strip is open at the top
+    for i in order:
+        w, h = sizes[i]
+        best = None
+        for fx, fy, fw, fh in free_rects:
+            if w <= fw + EPSILON and h <= fh + EPSILON and (best is None or (fy + h, fx) < best):
+                best = (fy + h, fx)
+        x, y = best[1], best[0] - h
+        positions[i] = (x, y)
+
+        used = (x, y, w, h)
+        untouched, new_parts = [], []
+        for free in free_rects:
+            parts = _split_free(free, used)
+            if parts is None:
+                untouched.append(free)
+            else:
+                new_parts.extend(parts)
+
+        # Drop free rectangles contained in another one. Untouched ones never contain each other,
+        # so only the new parts need checking against everything.
+        new_parts.sort(key=lambda r: r[2] * r[3], reverse=True)
+        kept_parts = []
+        for rect in new_parts:
+            if not any(_contains(other, rect) for other in kept_parts) and \
+                    not any(_contains(other, rect) for other in untouched):
+                kept_parts.append(rect)
+        untouched = [rect for rect in untouched if not any(_contains(part, rect) for part in kept_parts)]
+        free_rects = untouched + kept_parts
+    return positions
+
+
+PACKERS = {
+    "shelf": _pack_shelf,
+    "skyline": _pack_skyline,
+    "maxrects": _pack_maxrects,
+}
+
+
+def strip_width(sizes, aspect=1.0, max_width=None):
+    """ Strip width for a layout of roughly the given aspect ratio (never narrower than the widest rectangle) """
+    widest = max((w for w, _ in sizes), default=0.0)
+    if max_width is not None:
+        return max(max_width, widest)
+    total_area = sum(w * h for w, h in sizes)
+    return max(math.sqrt(total_area * aspect), widest)
+
+
+def pack(sizes, method="skyline", padding=0.0, aspect=1.0, sort="height", max_width=None):
+    """ Packs (width, height) rectangles. Returns Packing(positions, width, height).
+
+    positions are the lower-left corners, in the order of sizes. padding is
+    the gap between rectangles, sort one of SORT_KEYS (largest first).
+    """
+    if method not in PACKERS:
+        raise ValueError(f"Unknown packing method '{method}' (expected one of {', '.join(PACKERS)})")
+    if sort not in SORT_KEYS:
+        raise ValueError(f"Unknown sort '{sort}' (expected one of {', '.join(SORT_KEYS)})")
+    if not sizes:
+        return Packing([], 0.0, 0.0)
+
+    padded = [(w + padding, h + padding) for w, h in sizes]
+    width = strip_width(padded, aspect, None if max_width is None else max_width + padding)
+
+    key = SORT_KEYS[sort]
+    order = list(range(len(sizes)))
+    if key is not None:
+        order.sort(key=lambda i: key(padded[i]), reverse=True)
+
+    positions = PACKERS[method](padded, order, width)
+    used_width = max(x + w for (x, _), (w, _) in zip(positions, sizes))
+    used_height = max(y + h for (_, y), (_, h) in zip(positions, sizes))
+    return Packing(positions, used_width, used_height)
+
+
+def density(sizes, packing):
+    """ Fraction of the layout's bounding rectangle covered by the rectangles """
+    area = packing.width * packing.height
+    return sum(w * h for w, h in sizes) / area if area else 0.0
+
+
+def benchmark(counts=(100, 1000, 10000), seed=0, maxrects_limit=1000):
+    """ Prints density and runtime of every packer on random kitbash-like sizes """
+    rng = random.Random(seed)
+    print(f"{'method':<10} {'sort':<7} {'count':>6} {'density':>8} {'time (s)':>9}")
+    for count in counts:
+        # Log-uniform sizes: many small pieces, a few large ones
+        sizes = [(math.exp(rng.uniform(-3, 1)), math.exp(rng.uniform(-3, 1))) for _ in range(count)]
+        runs = [("shelf", "none")] + [(method, "height") for method in PACKERS]  # shelf/none is the old row layout
+        for method, sort in runs:
+            if method == "maxrects" and count > maxrects_limit:
+                continue
+            start = time.perf_counter()
+            packing = pack(sizes, method=method, sort=sort)
+            elapsed = time.perf_counter() - start
+            print(f"{method:<10} {sort:<7} {count:>6} {density(sizes, packing):>8.1%} {elapsed:>9.3f}")
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,146 @@
+""" Collision-free ordering of bulk renames.
+
+Renaming IDs one at a time makes intermediate names collide: Blender then
+appends .001 and runs its unique-name search, and later renames collide
+again. The planner takes the whole old -> new mapping of one ID namespace
+(e.g. bpy.data.meshes), orders the renames so that every name is free when
+it is assigned, breaks rename cycles (A -> B, B -> A) with a temporary name,
+and reports targets that cannot be assigned. Each ID is renamed at most twice.
+"""
+from collections import namedtuple
+
+MAX_NAME_BYTES = 63  # Longer ID names are truncated by Blender
+TEMP_SUFFIX = "__qt_tmp"
+
+RenamePlan = namedtuple("RenamePlan", ["steps", "unassigned"])
+
+
+def _fits(name):
+    return len(name.encode("utf-8")) <= MAX_NAME_BYTES
+
+
+def _temp_name(name, used):
+    """ A short, unused temporary name """
+    counter = 0
+    while True:
+        suffix = f"{TEMP_SUFFIX}{counter}"
+        stem = name
+        while not _fits(stem + suffix):
+            stem = stem[:-1]
+        candidate = stem + suffix
+        if candidate not in used:
+            return candidate
+        counter += 1
+
+
+def plan_renames(id_collection, mapping):
+    """ Orders the renames of mapping {id: new_name} within one bpy.data collection.
+
+    Returns RenamePlan(steps, unassigned): steps is an ordered list of
+    (id, name) assignments, unassigned a list of (id, new_name, reason).
+    """
+    mapping = {id_data: new_name for id_data, new_name in mapping.items() if id_data.name != new_name}
+    unassigned = []
+
+    # Names held by local IDs that are not being renamed can never be taken
+    fixed = {id_data.name for id_data in id_collection if id_data.library is None and id_data not in mapping}
+
+    targets = {}  # new name -> id
+    for id_data in sorted(mapping, key=lambda i: i.name):
+        new_name = mapping[id_data]
+        if id_data.library is not None:
+            unassigned.append((id_data, new_name, "linked ID"))
+        elif not new_name or not _fits(new_name):
+            unassigned.append((id_data, new_name, "empty or longer than 63 bytes"))
+        elif new_name in targets:
+            unassigned.append((id_data, new_name, f"also requested for '{targets[new_name].name}'"))
+        else:
+            targets[new_name] = id_data
+
+    # IDs that keep their name block that name too, which can block more renames in turn
+    blocked = fixed | {id_data.name for id_data, _, _ in unassigned}
+    while True:
+        clashes = [new_name for new_name in targets if new_name in blocked]
+        if not clashes:
+            break
+        for new_name in clashes:
+            id_data = targets.pop(new_name)
+            unassigned.append((id_data, new_name, "name used by an ID that is not renamed"))
+            blocked.add(id_data.name)
+    fixed = blocked
+
+    pending = {id_data: new_name for new_name, id_data in targets.items()}
+    current = {id_data: id_data.name for id_data in pending}
+    holder = {name: id_data for id_data, name in current.items()}  # Name -> mapped ID holding it now
+    used = fixed | set(holder) | set(targets)
+    steps = []
+
+    def move(id_data, name):
+        """ Records an assignment and returns the pending ID waiting for the freed name, if any """
+        freed = current[id_data]
+        del holder[freed]
+        current[id_data] = name
+        holder[name] = id_data
+        steps.append((id_data, name))
+        waiting = targets.get(freed)
+        return waiting if waiting in pending else None
+
+    # Walk every chain from its free end: an ID can move once nobody holds its target
+    ready = [id_data for id_data, new_name in pending.items() if new_name not in holder]
+    while pending:
+        while ready:
+            id_data = ready.pop()
+            waiting = move(id_data, pending.pop(id_data))
+            if waiting is not None:
+                ready.append(waiting)
+
+        if pending:
+            # Only cycles are left: park one member on a temporary name to free its slot
+            id_data = next(iter(pending))
+            temp_name = _temp_name(current[id_data], used)
+            used.add(temp_name)
+            ready.append(move(id_data, temp_name))
+
+    return RenamePlan(steps, unassigned)
+
+
+APPLY_BATCH = 200  # Assignments per batch in iter_apply_steps
+
+
+def iter_apply_steps(steps, batch_size=APPLY_BATCH, changed=None):
+    """ Runs the planned assignments in batches, yielding the number applied so far after each.
+
+    A batch only ends where no ID is parked on a temporary name, so closing the
+    generator between batches leaves every ID on an old or a new name. The
+    (id, wanted, got) triples Blender still had to change are appended to changed.
+    """
+    parked = set()  # IDs currently on a temporary name
+    in_batch = 0
+    for applied, (id_data, name) in enumerate(steps, 1):
+        id_data.name = name
+        if id_data.name != name and changed is not None:
+            changed.append((id_data, name, id_data.name))
+        if TEMP_SUFFIX in name:
+            parked.add(id_data)
+        else:
+            parked.discard(id_data)
+        in_batch += 1
+        if in_batch >= batch_size and not parked:
+            in_batch = 0
+            yield applied
+    if in_batch:
+        yield len(steps)
+
+
+def apply_steps(steps):
+    """ Runs the planned assignments. Returns the (id, wanted, got) triples Blender still had to change """
+    changed = []
+    for _ in iter_apply_steps(steps, len(steps) or 1, changed):
+        pass
+    return changed
+
+
+def rename_all(id_collection, mapping):
+    """ Plans and applies mapping in one go. Returns (RenamePlan, changed) """
+    plan = plan_renames(id_collection, mapping)
+    return plan, apply_steps(plan.steps)
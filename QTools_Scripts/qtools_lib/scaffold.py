@@ -0,0 +1,267 @@
+""" Declarative scene scaffolds: collections, _SRT/_CST empties, exclusion and asset marks.
+
+A scaffold spec (JSON, TOML, or YAML when PyYAML is installed) describes the
+collections to have under the scene collection:
+
+    {
+        "collections": [
+            {
+                "name": "ORIGINALS",
+                "children": ["Rider_A", "Rider_B", {"name": "Group_O", "exclude": true}]
+            },
+            {"names": ["Basket_A", "Sword_A"], "srt": true, "asset": true}
+        ]
+    }
+
+Collection entries are a name, or a dict with:
+
+    name / names   one collection, or several sharing the other settings
+    children       nested entries
+    srt, cst       create "<name>_SRT" (and "<name>_CST" as its parent) empties
+    empties        extra empties: {"name", "parent", "display", "size"}
+    exclude        view layer exclusion (left as is when missing)
+    asset          mark (true) or clear (false) the collection as an asset
+    exclusive      unlink it from the scene collection when it has another parent (default true)
+
+plan_scaffold() diffs the spec against the file using name indexes built once.
+It returns only the missing changes, so applying a spec twice changes nothing
+the second time.
+"""
+import json
+from collections import namedtuple
+
+import bpy
+
+CST_SIZE_FACTOR = 0.9  # _CST empties are drawn slightly smaller than their _SRT, like Create_CST_Empty
+
+ScaffoldCollection = namedtuple("ScaffoldCollection", ["name", "parent", "exclude", "asset", "exclusive"])
+ScaffoldEmpty = namedtuple("ScaffoldEmpty", ["name", "collection", "parent", "display", "size"])
+Change = namedtuple("Change", ["action", "name", "detail"])
+
+SCENE = ""  # Parent name standing for the scene collection
+
+
+class ScaffoldError(ValueError):
+    """ Raised for malformed scaffold specs """
+
+
+def load_spec(filepath):
+    """ Reads a scaffold spec from a .json, .toml or .yaml file """
+    lower = filepath.lower()
+    if lower.endswith(".toml"):
+        import tomllib  # Python 3.11+, bundled with Blender 4.x
+        with open(filepath, "rb") as file:
+            return tomllib.load(file)
+    with open(filepath, encoding="utf-8") as file:
+        if lower.endswith((".yaml", ".yml")):
+            try:
+                import yaml
+            except ImportError:
+                raise ScaffoldError("YAML specs need PyYAML (pip install pyyaml), or use JSON/TOML")
+            return yaml.safe_load(file)
+        return json.load(file)
+
+
+def _empties_of(name, entry):
+    size = float(entry.get("size", 1.0))
+    empties = []
+    if entry.get("srt"):
+        parent = f"{name}_CST" if entry.get("cst") else None
+        empties.append(ScaffoldEmpty(f"{name}_SRT", name, parent, "PLAIN_AXES", size))
+    if entry.get("cst"):
+        empties.append(ScaffoldEmpty(f"{name}_CST", name, None, "PLAIN_AXES", size * CST_SIZE_FACTOR))
+    for empty in entry.get("empties", []):
+        if "name" not in empty:
+            raise ScaffoldError(f"Empty without a name in '{name}': {empty}")
+        empties.append(ScaffoldEmpty(empty["name"], name, empty.get("parent"),
+                                     empty.get("display", "PLAIN_AXES"), float(empty.get("size", 1.0))))
+    return empties
+
+
+def flatten_spec(spec):
+    """ Returns ([ScaffoldCollection], [ScaffoldEmpty]), parents before children """
+    collections, empties = [], []
+    seen = {}
+
+    def visit(entries, parent):
+        for entry in entries:
+            if isinstance(entry, str):
+                entry = {"name": entry}
+            if not isinstance(entry, dict):
+                raise ScaffoldError(f"Expected a name or an object, got {entry!r}")
+            names = entry.get("names") or ([entry["name"]] if entry.get("name") else None)
+            if not names:
+                raise ScaffoldError(f"Collection entry without 'name' or 'names': {entry}")
+            for name in names:
+                if name in seen:
+                    if seen[name] != parent:
+                        raise ScaffoldError(f"'{name}' appears under both '{seen[name]}' and '{parent}'")
+                    continue  # Listed twice under the same parent: the first entry wins
+                seen[name] = parent
+                collections.append(ScaffoldCollection(name, parent, entry.get("exclude"), entry.get("asset"),
+                                                      entry.get("exclusive", True)))
+                empties.extend(_empties_of(name, entry))
+                visit(entry.get("children", []), name)
+
+    if not isinstance(spec, dict) or not isinstance(spec.get("collections"), list):
+        raise ScaffoldError("Expected a 'collections' list")
+    visit(spec["collections"], SCENE)
+    return collections, empties
+
+
+def _layer_collections(view_layer):
+    """ Collection -> its LayerCollection, in one walk of the view layer tree """
+    layers = {}
+    stack = [view_layer.layer_collection]
+    while stack:
+        layer = stack.pop()
+        layers[layer.collection] = layer
+        stack.extend(layer.children)
+    return layers
+
+
+class _FileIndex:
+    """ Name indexes of the current file, updated as changes are planned """
+
+    def __init__(self, scene, view_layer):
+        self.scene = scene
+        self.collections = {collection.name: collection for collection in bpy.data.collections}
+        self.objects = {obj.name: obj for obj in bpy.data.objects}
+        self.layers = _layer_collections(view_layer)
+        self._children = {}  # Collection name -> names of its child collections
+        self._members = {}  # Collection name -> names of its objects
+
+    def collection(self, name):
+        return self.scene.collection if name == SCENE else self.collections.get(name)
+
+    def children(self, name):
+        if name not in self._children:
+            collection = self.collection(name)
+            self._children[name] = {child.name for child in collection.children} if collection else set()
+        return self._children[name]
+
+    def add_collection(self, name):
+        """ Records a planned new collection: no children and no objects yet """
+        self._children[name] = set()
+        self._members[name] = set()
+
+    def members(self, name):
+        if name not in self._members:
+            collection = self.collection(name)
+            self._members[name] = {obj.name for obj in collection.objects} if collection else set()
+        return self._members[name]
+
+
+def plan_scaffold(spec, scene=None, view_layer=None):
+    """ Diffs spec against the file. Returns the list of Change still needed """
+    scene = scene or bpy.context.scene
+    view_layer = view_layer or bpy.context.view_layer
+    collections, empties = flatten_spec(spec)
+    index = _FileIndex(scene, view_layer)
+    changes = []
+    parents = []  # Applied after every empty exists
+    settings = []  # Applied after every collection is linked (new collections have no layer before)
+
+    for entry in collections:
+        existing = index.collections.get(entry.name)
+        if existing is None:
+            changes.append(Change("new_collection", entry.name, None))
+            index.add_collection(entry.name)
+        elif existing.library is not None:
+            raise ScaffoldError(f"'{entry.name}' is a linked collection and can't be changed")
+
+        if entry.name not in index.children(entry.parent):
+            changes.append(Change("link_collection", entry.name, entry.parent))
+            index.children(entry.parent).add(entry.name)
+        if entry.exclusive and entry.parent != SCENE and entry.name in index.children(SCENE):
+            changes.append(Change("unlink_collection", entry.name, SCENE))
+            index.children(SCENE).discard(entry.name)
+
+        layer = index.layers.get(existing) if existing else None
+        if entry.exclude is not None and (layer.exclude if layer else False) != entry.exclude:
+            settings.append(Change("exclude", entry.name, entry.exclude))
+        if entry.asset is not None and (existing is not None and existing.asset_data is not None) != entry.asset:
+            settings.append(Change("asset_mark" if entry.asset else "asset_clear", entry.name, None))
+
+    for empty in empties:
+        if empty.name not in index.objects:
+            changes.append(Change("new_empty", empty.name, (empty.display, empty.size)))
+            index.objects[empty.name] = None  # Planned, created by apply_scaffold
+        obj = index.objects[empty.name]
+        if empty.name not in index.members(empty.collection):
+            changes.append(Change("link_object", empty.name, empty.collection))
+            index.members(empty.collection).add(empty.name)
+        current_parent = obj.parent.name if obj is not None and obj.parent else None
+        if empty.parent and current_parent != empty.parent:
+            parents.append(Change("parent", empty.name, empty.parent))
+
+    return changes + parents + settings
+
+
+def apply_scaffold(changes, scene=None, view_layer=None):
+    """ Applies planned changes in order. Returns {action: count} """
+    scene = scene or bpy.context.scene
+    view_layer = view_layer or bpy.context.view_layer
+    collections = {collection.name: collection for collection in bpy.data.collections}
+    objects = {}
+    counts = {}
+
+    def collection(name):
+        return scene.collection if name == SCENE else collections[name]
+
+    def obj(name):
+        if name not in objects:
+            objects[name] = bpy.data.objects[name]
+        return objects[name]
+
+    layers = None
+    for change in changes:
+        action, name, detail = change
+        if action == "new_collection":
+            new_collection = bpy.data.collections.new(name)
+            collections[name] = new_collection
+            if new_collection.name != name:
+                raise ScaffoldError(f"Could not create collection '{name}' (got '{new_collection.name}')")
+        elif action == "link_collection":
+            collection(detail).children.link(collection(name))
+        elif action == "unlink_collection":
+            collection(detail).children.unlink(collection(name))
+        elif action == "new_empty":
+            display, size = detail
+            empty = bpy.data.objects.new(name, None)
+            empty.empty_display_type = display
+            empty.empty_display_size = size
+            objects[name] = empty
+        elif action == "link_object":
+            collection(detail).objects.link(obj(name))
+        elif action == "parent":
+            child = obj(name)
+            matrix = child.matrix_world.copy()
+            child.parent = obj(detail)
+            child.matrix_world = matrix  # Keep it where it is
+        elif action == "exclude":
+            if layers is None:
+                layers = _layer_collections(view_layer)  # Planned after all links: every collection has its layer
+            layers[collections[name]].exclude = detail
+        elif action == "asset_mark":
+            collections[name].asset_mark()
+        elif action == "asset_clear":
+            collections[name].asset_clear()
+        counts[action] = counts.get(action, 0) + 1
+    return counts
+
+
+def format_changes(changes):
+    """ Human-readable dry-run listing """
+    descriptions = {
+        "new_collection": lambda name, detail: f"+ collection {name}",
+        "link_collection": lambda name, detail: f"  link {name} under {detail or 'Scene Collection'}",
+        "unlink_collection": lambda name, detail: f"  unlink {name} from {detail or 'Scene Collection'}",
+        "new_empty": lambda name, detail: f"+ empty {name} ({detail[0]}, size {detail[1]:g})",
+        "link_object": lambda name, detail: f"  link {name} to {detail}",
+        "parent": lambda name, detail: f"  parent {name} to {detail}",
+        "exclude": lambda name, detail: f"  {'exclude' if detail else 'include'} {name} in the view layer",
+        "asset_mark": lambda name, detail: f"  mark {name} as asset",
+        "asset_clear": lambda name, detail: f"  clear asset mark of {name}",
+    }
+    return [descriptions[change.action](change.name, change.detail) for change in changes]
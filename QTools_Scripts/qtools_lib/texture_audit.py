@@ -0,0 +1,115 @@
+""" Texture audit: existence, size and format of every image file, plus who uses it.
+
+Paths are grouped by directory and each directory is listed once with
+os.scandir in a thread pool, instead of calling os.path.exists per image.
+Only names the listing misses are checked separately, which keeps
+case-insensitive filesystems working.
+"""
+import csv
+import json
+import os
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+import bpy
+
+from .image_users import get_image_usage_index
+
+LIST_WORKERS = 16
+
+TextureEntry = namedtuple("TextureEntry", [
+    "image", "filepath", "abs_path", "exists", "size", "format", "packed", "users",
+])
+
+CSV_FIELDS = ["image", "filepath", "abs_path", "exists", "size", "format", "packed", "users"]
+
+
+def _list_dir(directory, wanted):
+    """ Lists a directory once and returns {name: size} for the wanted names found in it """
+    found = {}
+    try:
+        with os.scandir(directory) as it:
+            for entry in it:
+                if entry.name in wanted:
+                    try:
+                        found[entry.name] = entry.stat().st_size
+                    except OSError:
+                        found[entry.name] = None
+    except OSError:
+        return directory, found  # Missing or unreadable directory: everything in it is missing
+
+    # On case-insensitive filesystems (macOS, Windows) a name can exist with another case than listed:
+    # only the names the listing missed are checked one by one, like os.path.exists did
+    for name in wanted.difference(found):
+        try:
+            found[name] = os.stat(os.path.join(directory, name)).st_size
+        except OSError:
+            pass
+    return directory, found
+
+
+def list_directories(paths, workers=LIST_WORKERS):
+    """ Resolves many absolute paths with one listing per directory. Returns {path: size or None if missing} """
+    by_dir = {}
+    for path in paths:
+        directory, name = os.path.split(path)
+        by_dir.setdefault(directory, set()).add(name)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        listings = dict(pool.map(lambda item: _list_dir(*item), by_dir.items()))
+
+    result = {}
+    for path in paths:
+        directory, name = os.path.split(path)
+        found = listings.get(directory, {})
+        result[path] = found[name] if name in found else None
+    return result
+
+
+def image_users(images):
+    """ Maps each image to the sorted names of the IDs using it (materials, worlds, node groups...) """
+    user_map = get_image_usage_index().user_map(images)
+    return {image: sorted(f"{type(user).__name__}:{user.name}" for user in users) for image, users in user_map.items()}
+
+
+def audit_textures(images=None, workers=LIST_WORKERS):
+    """ Returns a TextureEntry per image with a file path, missing files first """
+    images = [image for image in (bpy.data.images if images is None else images) if image.filepath]
+    abs_paths = {image: os.path.normpath(bpy.path.abspath(image.filepath, library=image.library)) for image in images}
+    sizes = list_directories(set(abs_paths.values()), workers)
+    users = image_users(images)
+
+    entries = []
+    for image in images:
+        abs_path = abs_paths[image]
+        size = sizes[abs_path]
+        packed = image.packed_file is not None
+        extension = os.path.splitext(abs_path)[1].lstrip(".").upper()
+        entries.append(TextureEntry(
+            image=image.name,
+            filepath=image.filepath,
+            abs_path=abs_path,
+            exists=size is not None,
+            size=size or 0,
+            format=image.file_format if packed or size is not None else extension,
+            packed=packed,
+            users=users.get(image, []),
+        ))
+
+    entries.sort(key=lambda entry: (entry.exists or entry.packed, entry.abs_path.lower()))
+    return entries
+
+
+def write_json(entries, filepath):
+    with open(filepath, "w", encoding="utf-8") as file:
+        json.dump([entry._asdict() for entry in entries], file, indent=2)
+
+
+def write_csv(entries, filepath):
+    with open(filepath, "w", newline="", encoding="utf-8") as file:
+        writer = csv.DictWriter(file, fieldnames=CSV_FIELDS)
+        writer.writeheader()
+        for entry in entries:
+            row = entry._asdict()
+            row["users"] = ";".join(entry.users)
+            writer.writerow(row)
@@ -0,0 +1,152 @@
+""" Persistent index of the image files under one or more search roots.
+
+Every directory is cached on disk with its mtime, its image files and its
+sub-directories. Updating the index only stats the known directories and
+lists again the ones whose mtime changed, so repeated relinks against the
+same roots do not walk the whole texture server again.
+"""
+import hashlib
+import json
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+CACHE_DIR = os.path.join(tempfile.gettempdir(), "qtools_texture_index")
+CACHE_VERSION = 1
+SCAN_WORKERS = 16
+
+IMAGE_EXTENSIONS = {
+    ".png", ".jpg", ".jpeg", ".tif", ".tiff", ".exr", ".hdr", ".tga", ".bmp",
+    ".dds", ".webp", ".psd", ".tx", ".j2c", ".jp2", ".cin", ".dpx", ".rgb", ".sgi",
+}
+
+# Index objects kept between runs, keyed by their roots
+_indexes = {}
+
+
+def _dir_mtime(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _scan_dir(path, cached):
+    """ Returns (path, [mtime, files, subdirs]), reusing the cached listing if the mtime did not change """
+    mtime = _dir_mtime(path)
+    if mtime is None:
+        return path, None
+    if cached is not None and cached[0] == mtime:
+        return path, cached
+
+    files, subdirs = [], []
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                if entry.is_dir():
+                    if not entry.name.startswith("."):
+                        subdirs.append(entry.path)
+                elif os.path.splitext(entry.name)[1].lower() in IMAGE_EXTENSIONS:
+                    files.append(entry.name)
+    except OSError:
+        return path, None
+    return path, [mtime, files, subdirs]
+
+
+class TextureIndex:
+    """ Case-insensitive filename lookup over several search roots """
+
+    def __init__(self, roots, cache_dir=CACHE_DIR):
+        self.roots = [os.path.normpath(root) for root in roots]
+        self.cache_dir = cache_dir
+        self._dirs = {}  # Directory -> [mtime_ns, [image file names], [sub-directory paths]]
+        self.by_name = {}  # Lower-case file name -> [paths]
+        self.rescanned = 0
+
+    def _cache_path(self):
+        key = hashlib.sha1("\n".join(self.roots).encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def load(self):
+        try:
+            with open(self._cache_path(), encoding="utf-8") as file:
+                data = json.load(file)
+            if data.get("version") == CACHE_VERSION and data.get("roots") == self.roots:
+                self._dirs = data["dirs"]
+        except (OSError, ValueError, KeyError):
+            self._dirs = {}
+
+    def save(self):
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = f"{self._cache_path()}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as file:
+                json.dump({"version": CACHE_VERSION, "roots": self.roots, "dirs": self._dirs}, file)
+            os.replace(tmp_path, self._cache_path())
+        except OSError as e:
+            print(f"⚠️ Could not save texture index: {e}")
+
+    def update(self, workers=SCAN_WORKERS):
+        """ Brings the index up to date, one directory level at a time. Returns the number of rescanned folders """
+        old_dirs = self._dirs
+        new_dirs = {}
+        self.rescanned = 0
+        level = list(dict.fromkeys(self.roots))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            while level:
+                next_level = []
+                for path, listing in pool.map(lambda p: _scan_dir(p, old_dirs.get(p)), level):
+                    if listing is None or path in new_dirs:
+                        continue
+                    if listing is not old_dirs.get(path):
+                        self.rescanned += 1
+                    new_dirs[path] = listing
+                    next_level.extend(subdir for subdir in listing[2] if subdir not in new_dirs)
+                level = next_level
+
+        changed = self.rescanned or len(new_dirs) != len(old_dirs)
+        self._dirs = new_dirs
+        if changed or not self.by_name:
+            self._build_lookup()
+        if changed:
+            self.save()
+        return self.rescanned
+
+    def _build_lookup(self):
+        by_name = {}
+        for directory, (_, files, _) in self._dirs.items():
+            for name in files:
+                by_name.setdefault(name.lower(), []).append(os.path.join(directory, name))
+        self.by_name = by_name
+
+    def resolve(self, filename, substitutions=None):
+        """ Returns every indexed path matching a file name, trying substitute extensions if none match.
+
+        substitutions maps an extension to the ones to try instead, e.g. {".png": [".exr"]}.
+        """
+        lower = os.path.basename(filename).lower()
+        matches = self.by_name.get(lower)
+        if matches:
+            return matches
+
+        stem, extension = os.path.splitext(lower)
+        for substitute in (substitutions or {}).get(extension, []):
+            matches = self.by_name.get(stem + substitute.lower())
+            if matches:
+                return matches
+        return []
+
+    def __len__(self):
+        return sum(len(files) for _, files, _ in self._dirs.values())
+
+
+def load_texture_index(roots, cache_dir=CACHE_DIR):
+    """ Returns an up-to-date index for the roots, reusing the in-memory or on-disk copy when possible """
+    key = tuple(os.path.normpath(root) for root in roots)
+    index = _indexes.get(key)
+    if index is None:
+        index = TextureIndex(roots, cache_dir)
+        index.load()
+        _indexes[key] = index
+    index.update()
+    return index
@@ -0,0 +1,239 @@
+""" Batched, cached name translation with pluggable backends.
+
+Names are split into tokens ("의자_01.002" -> "의자", "_", "01", ".", "002")
+and only the unique tokens that contain non-ASCII text are translated. Known
+translations come from a persistent SQLite cache. The rest is sent in
+concurrent batches to a backend:
+
+    GlossaryBackend      offline, a JSON/TSV file of source -> translation (never cached)
+    HttpBackend          a LibreTranslate-style server ({"q": [...]} -> {"translatedText": [...]})
+    GoogletransBackend   the googletrans package (pip install googletrans==4.0.0-rc1)
+
+A failed batch is reported and its tokens stay untranslated; it does not
+stop the others. This module does not use bpy. Running it starts a local
+stand-in translation server answering from a glossary, so HttpBackend can
+be tested without network:
+
+    python -m qtools_lib.translation serve translation_glossary.json --port 5000
+"""
+import argparse
+import json
+import os
+import re
+import sqlite3
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+BATCH_SIZE = 50  # Tokens per backend request
+WORKERS = 4  # Concurrent backend requests
+SQL_CHUNK = 500  # Placeholders per SELECT (SQLite limits them)
+
+TOKEN_RE = re.compile(r"([_.\-\s]+|\d+)")  # Separators and numbers are kept as they are
+NEEDS_TRANSLATION_RE = re.compile(r"[^\x00-\x7f]")
+
+
+def tokenize(name):
+    """ Splits a name into tokens; joining them gives the name back """
+    return [token for token in TOKEN_RE.split(name) if token]
+
+
+def needs_translation(token):
+    return bool(NEEDS_TRANSLATION_RE.search(token))
+
+
+class TranslationCache:
+    """ Persistent source -> translation store, per language pair and backend """
+
+    def __init__(self, filepath):
+        os.makedirs(os.path.dirname(filepath) or ".", exist_ok=True)
+        self.connection = sqlite3.connect(filepath)
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS translations ("
+            "backend TEXT, src TEXT, dest TEXT, text TEXT, translation TEXT, "
+            "PRIMARY KEY (backend, src, dest, text))"
+        )
+
+    def get_many(self, backend, src, dest, texts):
+        """ {text: translation} for the cached texts """
+        texts = list(texts)
+        found = {}
+        for start in range(0, len(texts), SQL_CHUNK):
+            chunk = texts[start:start + SQL_CHUNK]
+            placeholders = ",".join("?" * len(chunk))
+            rows = self.connection.execute(
+                f"SELECT text, translation FROM translations "
+                f"WHERE backend = ? AND src = ? AND dest = ? AND text IN ({placeholders})",
+                [backend, src, dest, *chunk],
+            )
+            found.update(rows)
+        return found
+
+    def put_many(self, backend, src, dest, translations):
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO translations VALUES (?, ?, ?, ?, ?)",
+                [(backend, src, dest, text, translation) for text, translation in translations.items()],
+            )
+
+    def clear(self):
+        with self.connection:
+            self.connection.execute("DELETE FROM translations")
+
+    def close(self):
+        self.connection.close()
+
+
+def load_glossary(filepath):
+    """ {source: translation} from a JSON object or a tab-separated file """
+    with open(filepath, encoding="utf-8") as file:
+        if filepath.lower().endswith(".json"):
+            return dict(json.load(file))
+        return dict(line.rstrip("\n").split("\t", 1) for line in file if "\t" in line)
+
+
+class GlossaryBackend:
+    """ Offline translations from a glossary file. Unknown texts come back as None """
+
+    name = "glossary"
+    cacheable = False  # Already a local lookup; caching would hide later edits of the file
+
+    def __init__(self, filepath):
+        self.glossary = load_glossary(filepath)
+
+    def translate_batch(self, texts, src, dest):
+        return [self.glossary.get(text) for text in texts]
+
+
+class HttpBackend:
+    """ Any LibreTranslate-compatible server, including serve() below """
+
+    name = "http"
+
+    def __init__(self, url, api_key=None, timeout=30):
+        self.url = url
+        self.api_key = api_key
+        self.timeout = timeout
+
+    def translate_batch(self, texts, src, dest):
+        payload = {"q": list(texts), "source": src, "target": dest, "format": "text"}
+        if self.api_key:
+            payload["api_key"] = self.api_key
+        request = urllib.request.Request(self.url, data=json.dumps(payload).encode("utf-8"),
+                                         headers={"Content-Type": "application/json"})
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            translated = json.load(response)["translatedText"]
+        if isinstance(translated, str):
+            translated = [translated]
+        if len(translated) != len(texts):
+            raise ValueError(f"Server returned {len(translated)} translations for {len(texts)} texts")
+        return translated
+
+
+class GoogletransBackend:
+    """ The googletrans package, one request per batch """
+
+    name = "googletrans"
+
+    def __init__(self):
+        import googletrans  # Optional dependency: pip install googletrans==4.0.0-rc1
+        self.translator = googletrans.Translator()
+
+    def translate_batch(self, texts, src, dest):
+        return [result.text for result in self.translator.translate(list(texts), src=src, dest=dest)]
+
+
+def translate_texts(texts, backend, cache=None, src="ko", dest="en", batch_size=BATCH_SIZE, workers=WORKERS):
+    """ Translates unique texts. Returns ({text: translation}, [error messages]) """
+    if not getattr(backend, "cacheable", True):
+        cache = None
+    texts = list(dict.fromkeys(texts))
+    translations = cache.get_many(backend.name, src, dest, texts) if cache else {}
+    missing = [text for text in texts if text not in translations]
+    batches = [missing[start:start + batch_size] for start in range(0, len(missing), batch_size)]
+
+    def run(batch):
+        try:
+            return batch, backend.translate_batch(batch, src, dest), None
+        except Exception as e:  # A failed batch leaves its texts untranslated
+            return batch, None, f"{len(batch)} texts ({batch[0]}...): {e}"
+
+    new_translations = {}
+    errors = []
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for batch, results, error in pool.map(run, batches):
+            if error:
+                errors.append(error)
+                continue
+            # Echoed or empty results are not translations: don't cache them, a later glossary may know them
+            new_translations.update((text, result) for text, result in zip(batch, results) if result and result != text)
+
+    if cache and new_translations:
+        cache.put_many(backend.name, src, dest, new_translations)
+    translations.update(new_translations)
+    return translations, errors
+
+
+def clean_translation(text, space_replacement="_"):
+    return re.sub(r"\s+", space_replacement, text.strip())
+
+
+def translate_names(names, backend, cache=None, src="ko", dest="en", space_replacement="_", **options):
+    """ Translates names token by token. Returns ({name: new name} for names that change, errors) """
+    tokenized = {name: tokenize(name) for name in dict.fromkeys(names)}
+    tokens = {token for parts in tokenized.values() for token in parts if needs_translation(token)}
+    translations, errors = translate_texts(sorted(tokens), backend, cache, src, dest, **options)
+
+    renamed = {}
+    for name, parts in tokenized.items():
+        new_name = "".join(clean_translation(translations[token], space_replacement)
+                           if token in translations else token for token in parts)
+        if new_name != name:
+            renamed[name] = new_name
+    return renamed, errors
+
+
+def serve(glossary_path, host="127.0.0.1", port=5000):
+    """ Local stand-in for a LibreTranslate server: answers from a glossary, unknown texts are echoed """
+    glossary = load_glossary(glossary_path)
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+            texts = request.get("q", [])
+            translated = [glossary.get(text, text) for text in texts] if isinstance(texts, list) \
+                else glossary.get(texts, texts)
+            body = json.dumps({"translatedText": translated}, ensure_ascii=False).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass  # Keep the console quiet
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local stand-in translation server")
+    parser.add_argument("command", choices=["serve"])
+    parser.add_argument("glossary", help="JSON or tab-separated glossary file")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5000)
+    args = parser.parse_args(argv)
+
+    server = serve(args.glossary, args.host, args.port)
+    print(f"🌐 Serving {args.glossary} on http://{args.host}:{args.port}/translate")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,21 @@
 import bpy
-import time  # Optional delay to prevent lag
+from qtools_lib.asset_drop import drop_assets
 
 # Define the collection name
 collection_name = "Group_"
+# (quantity, asset collection name): assets are looked up in the asset libraries of the Preferences
 asset_drops = [
     (20, "Character_I"),
     (6, "Character_J"),
     (2, "Character_G"),
 ]
 
-uids = {
-    "Character_I": 42,
-    "Character_J": 236,
-    "Character_G": 391
-}
+# User-defined settings
+DROP_MODE = "OVERRIDE"  # "OVERRIDE": editable library overrides, "INSTANCE": lightweight collection instances
+LINK = True  # Link the asset files (needed for overrides); False appends them once
+ASSET_FOLDERS = None  # None = asset libraries from the Preferences, or a list of folders
+MARK_AS_ASSET = True
+
 # Function to get or create a collection
 def get_or_create_collection(name):
     if name in bpy.data.collections:
@@ -26,58 +28,21 @@ def get_or_create_collection(name):
 # Get or create the target collection
 target_collection = get_or_create_collection(collection_name)
 
-# Define the asset drop list: (quantity, session_uid)
-
-# Fixed parameters for asset dropping
-align = 'WORLD'
-location = (0, 0, 0)
-scale = (1, 1, 1)
-drop_x = 1034
-drop_y = 1794
-
-# Loop through each (quantity, session_uid) pair
-for quantity, session_uid in asset_drops:
-    session_uid = uids[session_uid]
-    for i in range(quantity):
-        # Get a set of objects before dropping
-        existing_objects = set(bpy.data.objects)
-
-        # Drop the asset
-        bpy.ops.object.collection_external_asset_drop(
-            session_uid=session_uid,
-            align=align,
-            location=location,
-            scale=scale,
-            drop_x=drop_x,
-            drop_y=drop_y
-        )
-
-        # Allow Blender to process the dropped asset
-        bpy.context.view_layer.update()
-        time.sleep(0.1)  # Short delay to prevent reference loss
+# Every asset file is loaded once, then all copies are created directly in the target collection
+results = drop_assets(asset_drops, target_collection, mode=DROP_MODE, link=LINK, folders=ASSET_FOLDERS)
 
-        # Find the new objects that were added
-        new_objects = set(bpy.data.objects) - existing_objects
-
-        for obj in new_objects:
-            if obj:
-                # Store asset name before overriding
-                asset_name = obj.name
-
-                # Move the asset to the target collection
-                if obj.name not in target_collection.objects:
-                    target_collection.objects.link(obj)
-                # Remove from the default scene collection
-                bpy.context.scene.collection.objects.unlink(obj)
-
-                # Apply Library Override
-                if obj.override_library is None:  # Check if it's already overridden
-                    bpy.context.view_layer.objects.active = obj
-                    bpy.ops.object.make_override_library()
+qtools_report = []
+for drop in results:
+    if drop.collection is None:
+        print(f"❌ Asset '{drop.asset}' not found in the asset libraries")
+        qtools_report.append(f"Missing asset: {drop.asset}")
+    else:
+        print(f"✅ {drop.asset}: {len(drop.objects)} objects placed")
+        qtools_report.append(f"{drop.asset}: {len(drop.objects)} placed")
 
 # ✅ **Mark the collection as an asset**
-if target_collection:
+if MARK_AS_ASSET and target_collection.asset_data is None:
     target_collection.asset_mark()
     print(f"Collection '{collection_name}' is now marked as an asset.")
 
-print(f"All assets moved to collection '{collection_name}', overridden, and marked as an asset.")
+print(f"All assets placed in collection '{collection_name}' ({DROP_MODE.lower()}).")
@@ -1,13 +1,51 @@
 import bpy
-import googletrans  # Install this library if needed: pip install googletrans==4.0.0-rc1
+import os
+from qtools_lib.rename_planner import rename_all
+from qtools_lib.translation import (GlossaryBackend, GoogletransBackend, HttpBackend, TranslationCache,
+                                    translate_names)
 
-translator = googletrans.Translator()
+# User-defined settings
+BACKEND = "googletrans"  # "googletrans" (online), "http" (LibreTranslate-style SERVER_URL) or "glossary" (offline)
+SOURCE_LANGUAGE = "ko"
+TARGET_LANGUAGE = "en"
+GLOSSARY_FILE = os.path.join(os.path.dirname(__file__), "translation_glossary.json")
+SERVER_URL = "http://127.0.0.1:5000/translate"  # python -m qtools_lib.translation serve <glossary> for a local one
+ID_TYPES = ["objects", "meshes", "materials", "collections"]  # bpy.data collections to translate
+USE_CACHE = True  # Keep translations between runs (and Blender sessions)
 
-for obj in bpy.data.objects:
-    try:
-        translated_name = translator.translate(obj.name, src='ko', dest='en').text
-        obj.name = translated_name  # Rename object
-    except Exception as e:
-        print(f"Error translating {obj.name}: {e}")
 
-print("Translation complete!")
+def make_backend():
+    if BACKEND == "glossary":
+        return GlossaryBackend(GLOSSARY_FILE)
+    if BACKEND == "http":
+        return HttpBackend(SERVER_URL)
+    return GoogletransBackend()
+
+
+cache = None
+if USE_CACHE:
+    cache_dir = bpy.utils.user_resource('DATAFILES', path="qtools", create=True)
+    cache = TranslationCache(os.path.join(cache_dir, "translations.sqlite"))
+
+# Every name of every ID type is translated in one go: repeated names and tokens are translated once
+id_collections = {id_type: getattr(bpy.data, id_type) for id_type in ID_TYPES}
+names = [id_data.name for collection in id_collections.values() for id_data in collection if id_data.library is None]
+try:
+    new_names, errors = translate_names(names, make_backend(), cache, SOURCE_LANGUAGE, TARGET_LANGUAGE)
+finally:
+    if cache:
+        cache.close()
+
+for error in errors:
+    print(f"Error translating {error}")
+
+qtools_report = []
+for id_type, collection in id_collections.items():
+    mapping = {id_data: new_names[id_data.name] for id_data in collection
+               if id_data.library is None and id_data.name in new_names}
+    plan, changed = rename_all(collection, mapping)  # Collision-free order, no .001 churn
+    for id_data, new_name, reason in plan.unassigned:
+        print(f"⚠️ Could not rename '{id_data.name}' → '{new_name}': {reason}")
+    qtools_report.append(f"{id_type}: {len(mapping) - len(plan.unassigned)} translated")
+
+print(f"Translation complete! {', '.join(qtools_report)}, {len(errors)} failed batches")
@@ -1,5 +1,12 @@
 import bpy
 import os
+import sys
+
+from .catalog import catalog
+from .code_cache import code_cache
+from .profiler import run_history, RunRecord
+from .chunked import ChunkedRun, ENTRY_POINT, DRIVER_FLAG
+from bpy_extras.io_utils import ExportHelper
 
 bl_info = {
     "name": "QTools",
@@ -19,17 +26,73 @@ class QToolsPreferences(bpy.types.AddonPreferences):
     script_folder: bpy.props.StringProperty(
         name="Script Folder",
         default="/Users/quentinvien/Documents/QTools_Scripts",
-        subtype="DIR_PATH"
+        subtype="DIR_PATH",
+        update=lambda self, context: sync_catalog(self.script_folder),
     )
 
+    # Relative script paths marked as favorites, separated by ";"
+    favorite_scripts: bpy.props.StringProperty(name="Favorite Scripts", default="", options={'HIDDEN'})
+
     def draw(self, context):
         layout = self.layout
         layout.label(text="Set the directory where your scripts are stored:")
         layout.prop(self, "script_folder")
+        row = layout.row()
+        row.label(text=code_cache.stats_text())
+        row.operator("qtools.clear_code_cache", text="", icon='TRASH')
+
+    def get_favorites(self):
+        return [path for path in self.favorite_scripts.split(";") if path]
 
 # Blender property to store user input for texture path
 class QToolsProperties(bpy.types.PropertyGroup):
     texture_path: bpy.props.StringProperty(name="Texture Folder", default="", subtype="DIR_PATH")
+    script_filter: bpy.props.StringProperty(name="Search", default="", options={'TEXTEDIT_UPDATE'})
+    profile_runs: bpy.props.BoolProperty(name="Profile Runs", default=False,
+                                         description="Run scripts under cProfile and keep their hottest functions")
+
+WATCH_INTERVAL = 2.0  # Seconds between script folder checks
+
+REPORT_GLOBAL = "qtools_report"  # List of lines a script can leave behind for the Report panel
+last_report = {"script": "", "lines": []}
+
+active_runs = []  # Chunked script runs in progress, drawn as progress bars in the panel
+
+def tag_redraw_view3d(context):
+    for window in context.window_manager.windows:
+        for area in window.screen.areas:
+            if area.type == 'VIEW_3D':
+                area.tag_redraw()
+
+def ensure_script_path(script_folder):
+    """ Lets scripts import the shared helpers stored next to them (qtools_lib) """
+    script_folder = os.path.normpath(bpy.path.abspath(script_folder))
+    if script_folder not in sys.path:
+        sys.path.insert(0, script_folder)
+
+def store_script_report(script_name, script_globals):
+    """ Keeps the qtools_report lines of the last script that set one """
+    lines = script_globals.get(REPORT_GLOBAL)
+    if lines is not None:
+        last_report["script"] = script_name
+        last_report["lines"] = [str(line) for line in lines]
+
+def sync_catalog(script_folder):
+    """ Rescans the script catalog if the configured folder changed """
+    root = bpy.path.abspath(script_folder)
+    if catalog.root != root:
+        catalog.set_root(root)
+
+def watch_script_folder():
+    """ Timer callback: cheap mtime check of the script folder, redraws the sidebar only on change """
+    addon = bpy.context.preferences.addons.get(__name__)
+    if addon is None:
+        return None  # Add-on was disabled, stop the timer
+
+    sync_catalog(addon.preferences.script_folder)
+    if catalog.refresh():
+        tag_redraw_view3d(bpy.context)
+    return WATCH_INTERVAL
 
 class QTOOLS_PT_main_panel(bpy.types.Panel):
     """Creates a Panel in the 3D view sidebar"""
@@ -50,27 +113,70 @@ class QTOOLS_PT_main_panel(bpy.types.Panel):
         # layout.label(text="Scripts Folder:")
         # layout.prop(preferences, "script_folder")  # Editable field in panel
 
-        # Ensure script folder exists
-        if not os.path.exists(script_folder):
+        for run in active_runs:
+            layout.progress(factor=run.fraction, type='BAR', text=run.status_text())
+
+        # Scripts are listed from the in-memory catalog, the folder is only touched by the watcher
+        sync_catalog(script_folder)
+        if not catalog.exists:
             layout.label(text="Folder not found!")
             return
 
-        layout.label(text="Scripts:")
-        scripts = [f for f in os.listdir(script_folder) if f.endswith(".py")]
-        if not scripts:
+        layout.prop(props, "script_filter", text="", icon='VIEWZOOM')
+        entries = catalog.filtered(props.script_filter)
+        if not entries:
             layout.label(text="No scripts found!")
             return
 
-        for script in scripts:
-            if script == "change_texture_path.py":  # Add UI for texture path
-                layout.prop(props, "texture_path")  # Input field for path
-                op = layout.operator("qtools.run_texture_script", text="Run Texture Script")
-                op.script_name = script
-            else:
-                op = layout.operator("qtools.run_script", text=script)
-                op.script_name = script
+        favorites = set(preferences.get_favorites())
+        favorite_entries = [entry for entry in entries if entry.rel_path in favorites]
+        if favorite_entries:
+            box = layout.box()
+            box.label(text="Favorites", icon='SOLO_ON')
+            for entry in favorite_entries:
+                self.draw_script(box, props, entry, True)
+
+        box = None
+        category = None
+        for entry in entries:
+            if entry.category != category:
+                category = entry.category
+                box = layout.box()
+                box.label(text=f"{category}:", icon='FILE_FOLDER')
+            self.draw_script(box, props, entry, entry.rel_path in favorites)
+
+    def draw_script(self, layout, props, entry, is_favorite):
+        if entry.name == "change_texture_path.py":  # Add UI for texture path
+            layout.prop(props, "texture_path")  # Input field for path
+        row = layout.row(align=True)
+        if entry.name == "change_texture_path.py":
+            op = row.operator("qtools.run_texture_script", text="Run Texture Script")
+        else:
+            op = row.operator("qtools.run_script", text=entry.name)
+        op.script_name = entry.rel_path
+        fav = row.operator("qtools.toggle_favorite", text="", icon='SOLO_ON' if is_favorite else 'SOLO_OFF', emboss=False)
+        fav.script_name = entry.rel_path
 
 
+class QTOOLS_OT_ToggleFavorite(bpy.types.Operator):
+    """Add or remove a script from the favorites list"""
+    bl_idname = "qtools.toggle_favorite"
+    bl_label = "Toggle Favorite"
+    bl_options = {'INTERNAL'}
+
+    script_name: bpy.props.StringProperty()
+
+    def execute(self, context):
+        preferences = bpy.context.preferences.addons[__name__].preferences
+        favorites = preferences.get_favorites()
+        if self.script_name in favorites:
+            favorites.remove(self.script_name)
+        else:
+            favorites.append(self.script_name)
+        preferences.favorite_scripts = ";".join(favorites)
+        context.preferences.is_dirty = True  # Make sure favorites get saved with the preferences
+        return {'FINISHED'}
+
 class QTOOLS_OT_RunScript(bpy.types.Operator):
     """Operator to execute a script"""
     bl_idname = "qtools.run_script"
@@ -83,13 +189,22 @@ class QTOOLS_OT_RunScript(bpy.types.Operator):
         preferences = bpy.context.preferences.addons[__name__].preferences
         script_folder = preferences.script_folder
         script_path = os.path.join(script_folder, self.script_name)
+        ensure_script_path(script_folder)
 
         print(f"🟢 Executing script: {script_path}")  # Debug message
 
         try:
-            script_globals = {"__name__": "__main__"}  # Define an isolated execution scope
-            with open(script_path) as file:
-                exec(compile(file.read(), script_path, 'exec'), script_globals)
+            script_globals = {"__name__": "__main__", "__file__": script_path, DRIVER_FLAG: True}  # Define an isolated execution scope
+            with run_history.record(self.script_name, len(context.scene.objects), context.scene.qtools_props.profile_runs) as run:
+                exec(code_cache.load(script_path), script_globals)
+
+                # Scripts that define a qtools_chunked generator are driven from a modal timer
+                if ENTRY_POINT in script_globals:
+                    run["skip"] = True
+                    self._globals = script_globals
+                    return self.start_chunked(context, script_globals[ENTRY_POINT](context))
+
+            store_script_report(self.script_name, script_globals)
 
             print(f"✅ Successfully executed: {self.script_name}")
             self.report({'INFO'}, f"Executed: {self.script_name}")
@@ -100,6 +215,66 @@ class QTOOLS_OT_RunScript(bpy.types.Operator):
 
         return {'FINISHED'}
 
+    def start_chunked(self, context, generator):
+        print(f"⏳ Running {self.script_name} in chunks (Esc to cancel)")
+        self._run = ChunkedRun(self.script_name, generator)
+        self._object_count = len(context.scene.objects)
+        active_runs.append(self._run)
+
+        wm = context.window_manager
+        self._timer = wm.event_timer_add(0.01, window=context.window)
+        wm.modal_handler_add(self)
+        wm.progress_begin(0, 100)
+        return {'RUNNING_MODAL'}
+
+    def modal(self, context, event):
+        if event.type == 'ESC' and event.value == 'PRESS':
+            self._run.cancel()
+            return self.finish_chunked(context)
+
+        if event.type != 'TIMER':
+            return {'PASS_THROUGH'}  # Keep the UI responsive between chunks
+
+        try:
+            finished = self._run.step()
+        except Exception as e:
+            self._run.finished = True
+            return self.finish_chunked(context, error=e)
+
+        context.window_manager.progress_update(int(self._run.fraction * 100))
+        context.workspace.status_text_set(self._run.status_text())
+        tag_redraw_view3d(context)
+
+        if finished:
+            return self.finish_chunked(context)
+        return {'RUNNING_MODAL'}
+
+    def finish_chunked(self, context, error=None):
+        wm = context.window_manager
+        wm.event_timer_remove(self._timer)
+        wm.progress_end()
+        context.workspace.status_text_set(None)
+        active_runs.remove(self._run)
+        tag_redraw_view3d(context)
+
+        run = self._run
+        store_script_report(self.script_name, self._globals)
+        run_history.add(RunRecord(self.script_name, run.started, run.elapsed, run.cpu, error is None,
+                                  str(error) if error else "", self._object_count, []))
+
+        if error is not None:
+            print(f"❌ Error executing: {self.script_name} - {error}")
+            self.report({'ERROR'}, f"Failed: {self.script_name} - {error}")
+            return {'CANCELLED'}
+        if run.cancelled:
+            print(f"🛑 Cancelled: {self.script_name} after {run.done} steps")
+            self.report({'WARNING'}, f"Cancelled: {self.script_name} after {run.done} steps")
+            return {'CANCELLED'}
+
+        print(f"✅ Successfully executed: {self.script_name} ({run.done} steps, {run.elapsed:.1f}s)")
+        self.report({'INFO'}, f"Executed: {self.script_name}")
+        return {'FINISHED'}
+
 class QTOOLS_OT_RunTextureScript(bpy.types.Operator):
     """Operator to run change_texture_path.py with user input"""
     bl_idname = "qtools.run_texture_script"
@@ -112,6 +287,7 @@ class QTOOLS_OT_RunTextureScript(bpy.types.Operator):
         preferences = bpy.context.preferences.addons[__name__].preferences
         script_folder = preferences.script_folder
         script_path = os.path.join(script_folder, self.script_name)
+        ensure_script_path(script_folder)
         texture_path = context.scene.qtools_props.texture_path
 
         if not texture_path:
@@ -119,29 +295,143 @@ class QTOOLS_OT_RunTextureScript(bpy.types.Operator):
             return {'CANCELLED'}
 
         try:
-            script_globals = {"__name__": "__main__", "new_texture_folder": texture_path}  # Pass texture path
-            with open(script_path) as file:
-                exec(compile(file.read(), script_path, 'exec'), script_globals)
+            script_globals = {"__name__": "__main__", "__file__": script_path, "new_texture_folder": texture_path}  # Pass texture path
+            with run_history.record(self.script_name, len(context.scene.objects), context.scene.qtools_props.profile_runs):
+                exec(code_cache.load(script_path), script_globals)
+            store_script_report(self.script_name, script_globals)
             self.report({'INFO'}, f"Executed: {self.script_name} with path: {texture_path}")
         except Exception as e:
             self.report({'ERROR'}, f"Failed: {self.script_name} - {e}")
 
         return {'FINISHED'}
 
+class QTOOLS_OT_ClearCodeCache(bpy.types.Operator):
+    """Forget all compiled scripts so they are recompiled on their next run"""
+    bl_idname = "qtools.clear_code_cache"
+    bl_label = "Clear Bytecode Cache"
+
+    def execute(self, context):
+        cleared = code_cache.invalidate()
+        self.report({'INFO'}, f"Cleared {len(cleared)} cached scripts")
+        return {'FINISHED'}
+
+class QTOOLS_PT_report_panel(bpy.types.Panel):
+    """Summary left by the last script that set qtools_report"""
+    bl_label = "Script Report"
+    bl_idname = "QTOOLS_PT_report_panel"
+    bl_space_type = 'VIEW_3D'
+    bl_region_type = 'UI'
+    bl_category = "QTools"
+    bl_parent_id = "QTOOLS_PT_main_panel"
+
+    @classmethod
+    def poll(cls, context):
+        return bool(last_report["lines"])
+
+    def draw(self, context):
+        layout = self.layout
+        layout.label(text=last_report["script"], icon='TEXT')
+        col = layout.column(align=True)
+        for line in last_report["lines"][:50]:
+            col.label(text=line)
+        if len(last_report["lines"]) > 50:
+            col.label(text=f"... {len(last_report['lines']) - 50} more lines in the console")
+
+
+class QTOOLS_PT_history_panel(bpy.types.Panel):
+    """Timing history of the scripts run from QTools"""
+    bl_label = "Run History"
+    bl_idname = "QTOOLS_PT_history_panel"
+    bl_space_type = 'VIEW_3D'
+    bl_region_type = 'UI'
+    bl_category = "QTools"
+    bl_parent_id = "QTOOLS_PT_main_panel"
+    bl_options = {'DEFAULT_CLOSED'}
+
+    def draw(self, context):
+        layout = self.layout
+        props = context.scene.qtools_props
+
+        row = layout.row(align=True)
+        row.prop(props, "profile_runs")
+        row.operator("qtools.export_history", text="", icon='EXPORT')
+        row.operator("qtools.clear_history", text="", icon='TRASH')
+
+        summary = run_history.summary()
+        if not summary:
+            layout.label(text="No runs yet.")
+            return
+
+        for row_data in summary:
+            box = layout.box()
+            box.label(text=row_data["script"], icon='ERROR' if row_data["failures"] else 'TIME')
+            col = box.column(align=True)
+            col.label(text=f"p50 {row_data['p50']:.3f}s  p95 {row_data['p95']:.3f}s  ({row_data['runs']} runs)")
+            col.label(text=f"CPU p50 {row_data['cpu_p50']:.3f}s  Objects {row_data['last_objects']}")
+            for name, calls, _, cumtime in row_data["hot_functions"][:3]:
+                col.label(text=f"{cumtime:.3f}s  {name} x{calls}")
+
+
+class QTOOLS_OT_ExportHistory(bpy.types.Operator, ExportHelper):
+    """Export the script run history to CSV or JSON"""
+    bl_idname = "qtools.export_history"
+    bl_label = "Export Run History"
+
+    filename_ext = ".csv"
+    filter_glob: bpy.props.StringProperty(default="*.csv;*.json", options={'HIDDEN'})
+
+    def check(self, context):
+        return False  # Keep a .json extension if the user typed one
+
+    def execute(self, context):
+        count = run_history.export(self.filepath)
+        self.report({'INFO'}, f"Exported {count} runs to {self.filepath}")
+        return {'FINISHED'}
+
+
+class QTOOLS_OT_ClearHistory(bpy.types.Operator):
+    """Clear the script run history"""
+    bl_idname = "qtools.clear_history"
+    bl_label = "Clear Run History"
+
+    def execute(self, context):
+        run_history.clear()
+        return {'FINISHED'}
+
 def register():
+    code_cache.cache_dir = bpy.utils.user_resource('DATAFILES', path="qtools_bytecode")
     bpy.utils.register_class(QToolsPreferences)  # Register add-on preferences
     bpy.utils.register_class(QTOOLS_PT_main_panel)
     bpy.utils.register_class(QTOOLS_OT_RunScript)
     bpy.utils.register_class(QTOOLS_OT_RunTextureScript)
+    bpy.utils.register_class(QTOOLS_OT_ToggleFavorite)
+    bpy.utils.register_class(QTOOLS_OT_ClearCodeCache)
+    bpy.utils.register_class(QTOOLS_PT_report_panel)
+    bpy.utils.register_class(QTOOLS_PT_history_panel)
+    bpy.utils.register_class(QTOOLS_OT_ExportHistory)
+    bpy.utils.register_class(QTOOLS_OT_ClearHistory)
     bpy.utils.register_class(QToolsProperties)
     bpy.types.Scene.qtools_props = bpy.props.PointerProperty(type=QToolsProperties)
+    bpy.app.timers.register(watch_script_folder, first_interval=WATCH_INTERVAL, persistent=True)
 
 def unregister():
     bpy.utils.unregister_class(QToolsPreferences)
     bpy.utils.unregister_class(QTOOLS_PT_main_panel)
     bpy.utils.unregister_class(QTOOLS_OT_RunScript)
     bpy.utils.unregister_class(QTOOLS_OT_RunTextureScript)
+    bpy.utils.unregister_class(QTOOLS_OT_ToggleFavorite)
+    bpy.utils.unregister_class(QTOOLS_OT_ClearCodeCache)
+    bpy.utils.unregister_class(QTOOLS_PT_report_panel)
+    bpy.utils.unregister_class(QTOOLS_PT_history_panel)
+    bpy.utils.unregister_class(QTOOLS_OT_ExportHistory)
+    bpy.utils.unregister_class(QTOOLS_OT_ClearHistory)
     bpy.utils.unregister_class(QToolsProperties)
+    if bpy.app.timers.is_registered(watch_script_folder):
+        bpy.app.timers.unregister(watch_script_folder)
+    # Cache handlers added by the shared script helpers, if a script used them
+    script_handlers = sys.modules.get("qtools_lib.handlers")
+    if script_handlers is not None:
+        script_handlers.uninstall()
     del bpy.types.Scene.qtools_props
 
 if __name__ == "__main__":
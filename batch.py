@@ -0,0 +1,257 @@
+""" Headless batch runner for QTools scripts.
+
+Runs one script from the QTools folder over many .blend files, fanning them
+out over N background Blender processes, and writes a single report.
+
+    python3 batch.py --script ListTextures.py --jobs 4 "/projects/**/*.blend"
+    python3 batch.py --script Bulk_Rename_Mesh_Data.py --save --list files.txt
+
+The same file is also the worker: Blender is started as
+    blender -b --factory-startup <file.blend> --python batch.py -- --qtools-worker ...
+No GPU or display is needed.
+"""
+import argparse
+import glob
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+WORKER_FLAG = "--qtools-worker"
+DEFAULT_SCRIPT_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "QTools_Scripts")
+
+
+# ---------------------------------------------------------------------------
+# Worker side (runs inside Blender)
+# ---------------------------------------------------------------------------
+
+def run_worker(argv):
+    """ Executes one script on the currently loaded .blend and writes a JSON result """
+    import bpy
+
+    parser = argparse.ArgumentParser(prog="qtools-worker")
+    parser.add_argument(WORKER_FLAG, action="store_true")
+    parser.add_argument("--script", required=True)
+    parser.add_argument("--result", required=True)
+    parser.add_argument("--save", action="store_true")
+    parser.add_argument("--output", default="")
+    args = parser.parse_args(argv)
+
+    result = {
+        "blend": bpy.data.filepath,
+        "script": args.script,
+        "ok": False,
+        "error": "",
+        "objects": len(bpy.data.objects),
+        "script_time": 0.0,
+        "save_time": 0.0,
+        "saved_to": "",
+    }
+
+    script_folder = os.path.dirname(args.script)
+    if script_folder not in sys.path:
+        sys.path.insert(0, script_folder)  # Let scripts import their shared helpers
+
+    try:
+        start = time.perf_counter()
+        with open(args.script, "rb") as file:
+            code = compile(file.read(), args.script, 'exec')
+        exec(code, {"__name__": "__main__", "__file__": args.script})
+        result["script_time"] = time.perf_counter() - start
+
+        if args.save or args.output:
+            start = time.perf_counter()
+            if args.output:
+                bpy.ops.wm.save_as_mainfile(filepath=args.output, copy=True)
+                result["saved_to"] = args.output
+            else:
+                bpy.ops.wm.save_mainfile()
+                result["saved_to"] = bpy.data.filepath
+            result["save_time"] = time.perf_counter() - start
+
+        result["ok"] = True
+    except Exception:
+        result["error"] = traceback.format_exc()
+        print(f"❌ {result['error']}")
+
+    with open(args.result, "w", encoding="utf-8") as file:
+        json.dump(result, file, indent=2)
+    sys.stdout.flush()
+
+
+# ---------------------------------------------------------------------------
+# Driver side (plain Python)
+# ---------------------------------------------------------------------------
+
+def collect_blend_files(patterns, list_file=None):
+    """ Expands globs and an optional text file (one path per line) into a sorted, unique list """
+    if list_file:
+        with open(list_file, encoding="utf-8") as file:
+            patterns = list(patterns) + [line.strip() for line in file if line.strip() and not line.startswith("#")]
+
+    files = set()
+    for pattern in patterns:
+        pattern = os.path.expanduser(pattern)
+        matches = glob.glob(pattern, recursive=True) if glob.has_magic(pattern) else [pattern]
+        for path in matches:
+            if path.endswith(".blend") and os.path.isfile(path):
+                files.add(os.path.abspath(path))
+    return sorted(files)
+
+
+def resolve_script(script, script_folder):
+    """ Finds a script by path, or by name relative to the QTools script folder """
+    if os.path.isfile(script):
+        return os.path.abspath(script)
+    candidate = os.path.join(script_folder, script)
+    if not candidate.endswith(".py"):
+        candidate += ".py"
+    if os.path.isfile(candidate):
+        return os.path.abspath(candidate)
+    raise FileNotFoundError(f"Script not found: {script} (looked in {script_folder})")
+
+
+def _job_name(index, blend):
+    return f"{index:04d}_{os.path.splitext(os.path.basename(blend))[0]}"
+
+
+def output_paths(blend_files, output_dir):
+    """ Copy path of every file, keeping its folders below the common root so same-named files don't collide """
+    try:
+        root = os.path.commonpath([os.path.dirname(blend) for blend in blend_files])
+    except ValueError:  # Different drives: no common root, fall back to unique job names
+        return {blend: os.path.join(output_dir, f"{_job_name(index, blend)}.blend")
+                for index, blend in enumerate(blend_files)}
+    return {blend: os.path.join(output_dir, os.path.relpath(blend, root)) for blend in blend_files}
+
+
+def run_job(blender, script, blend, report_dir, index, save=False, output_path="", timeout=None):
+    """ Runs one background Blender on one file, returns the worker result merged with process info """
+    name = _job_name(index, blend)
+    result_path = os.path.join(report_dir, f"{name}.json")
+    log_path = os.path.join(report_dir, f"{name}.log")
+
+    command = [
+        blender, "-b", "--factory-startup", "-noaudio", blend,
+        "--python-exit-code", "1",
+        "--python", os.path.abspath(__file__),
+        "--", WORKER_FLAG, "--script", script, "--result", result_path,
+    ]
+    if save:
+        command.append("--save")
+    if output_path:
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        command += ["--output", output_path]
+
+    # A result left by an earlier run in the same report folder must not pass for this one
+    try:
+        os.remove(result_path)
+    except FileNotFoundError:
+        pass
+
+    start = time.perf_counter()
+    returncode = None
+    error = ""
+    with open(log_path, "w", encoding="utf-8", errors="replace") as log:
+        try:
+            process = subprocess.run(command, stdout=log, stderr=subprocess.STDOUT, timeout=timeout)
+            returncode = process.returncode
+        except subprocess.TimeoutExpired:
+            error = f"Timed out after {timeout}s"
+        except OSError as e:
+            error = f"Could not start Blender: {e}"
+    wall = time.perf_counter() - start
+
+    result = {"blend": blend, "ok": False, "error": error}
+    if returncode is not None and os.path.isfile(result_path):  # Only trust a worker that finished
+        with open(result_path, encoding="utf-8") as file:
+            result.update(json.load(file))
+    elif not error:
+        error = f"Worker exited with code {returncode} without a result (see log)"
+        result["error"] = error
+
+    result.update({"returncode": returncode, "wall_time": wall, "log": log_path})
+    if returncode not in (0, None) and result["ok"]:
+        result["ok"] = False
+        result["error"] = f"Blender exited with code {returncode}"
+    return result
+
+
+def run_batch(script, blend_files, blender="blender", jobs=1, report_dir="qtools_batch_report",
+              save=False, output_dir="", timeout=None):
+    """ Fans the files out over `jobs` background Blenders and writes report.json """
+    os.makedirs(report_dir, exist_ok=True)
+    outputs = output_paths(blend_files, output_dir) if output_dir and blend_files else {}
+
+    results = []
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        futures = {
+            pool.submit(run_job, blender, script, blend, report_dir, index, save, outputs.get(blend, ""),
+                        timeout): blend
+            for index, blend in enumerate(blend_files)
+        }
+        for done, future in enumerate(as_completed(futures), 1):
+            result = future.result()
+            results.append(result)
+            status = "✅" if result["ok"] else "❌"
+            print(f"{status} [{done}/{len(blend_files)}] {os.path.basename(result['blend'])} ({result['wall_time']:.1f}s)")
+            sys.stdout.flush()
+
+    results.sort(key=lambda r: r["blend"])
+    failures = [r for r in results if not r["ok"]]
+    report = {
+        "script": script,
+        "blender": blender,
+        "jobs": jobs,
+        "files": len(results),
+        "succeeded": len(results) - len(failures),
+        "failed": len(failures),
+        "total_time": time.perf_counter() - start,
+        "results": results,
+    }
+    report_path = os.path.join(report_dir, "report.json")
+    with open(report_path, "w", encoding="utf-8") as file:
+        json.dump(report, file, indent=2)
+
+    print(f"\n📊 {report['succeeded']}/{report['files']} files succeeded in {report['total_time']:.1f}s")
+    for failure in failures:
+        print(f"❌ {failure['blend']}: {failure['error'].strip().splitlines()[-1] if failure['error'] else 'unknown error'}")
+    print(f"📄 Report: {report_path}")
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run a QTools script over many .blend files in background Blenders.")
+    parser.add_argument("blend_files", nargs="*", help=".blend paths or glob patterns (use ** for recursion)")
+    parser.add_argument("--script", required=True, help="Script name in the QTools folder, or a path")
+    parser.add_argument("--script-folder", default=os.environ.get("QTOOLS_SCRIPTS", DEFAULT_SCRIPT_FOLDER))
+    parser.add_argument("--list", dest="list_file", help="Text file with one .blend path or glob per line")
+    parser.add_argument("--blender", default=os.environ.get("BLENDER", "blender"), help="Blender executable")
+    parser.add_argument("-j", "--jobs", type=int, default=max(1, (os.cpu_count() or 2) // 2))
+    parser.add_argument("--save", action="store_true", help="Save each file in place after the script ran")
+    parser.add_argument("--output-dir", default="", help="Save copies here instead of overwriting the originals (subfolders are kept)")
+    parser.add_argument("--report-dir", default="qtools_batch_report")
+    parser.add_argument("--timeout", type=float, default=None, help="Seconds before a worker is killed")
+    args = parser.parse_args(argv)
+
+    blender = shutil.which(args.blender) or args.blender
+    script = resolve_script(args.script, args.script_folder)
+    blend_files = collect_blend_files(args.blend_files, args.list_file)
+    if not blend_files:
+        parser.error("No .blend files matched.")
+
+    report = run_batch(script, blend_files, blender, args.jobs, args.report_dir,
+                       args.save, args.output_dir, args.timeout)
+    return 1 if report["failed"] else 0
+
+
+if __name__ == "__main__":
+    if WORKER_FLAG in sys.argv:
+        run_worker(sys.argv[sys.argv.index("--") + 1:])
+    else:
+        sys.exit(main())
@@ -0,0 +1,116 @@
+import os
+from collections import namedtuple
+
+SCRIPT_EXTENSION = ".py"
+ROOT_CATEGORY = "Scripts"  # Category used for scripts sitting directly in the script folder
+
+ScriptEntry = namedtuple("ScriptEntry", ["name", "rel_path", "category", "search_key"])
+
+
+def _dir_mtime(path):
+    """ Returns the modification time of a directory, or None if it is gone """
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _is_library_dir(entry):
+    """ Helper packages (folders with an __init__.py) and hidden folders are not script categories """
+    if entry.name.startswith((".", "__")):
+        return True
+    return os.path.isfile(os.path.join(entry.path, "__init__.py"))
+
+
+class ScriptCatalog:
+    """ In-memory index of the script folder.
+
+    Each directory is listed once and cached with its mtime. refresh() only
+    stats the known directories and rescans the ones whose mtime changed, so
+    the panel can draw from memory on every redraw.
+    """
+
+    def __init__(self):
+        self.root = None
+        self.exists = False
+        self.entries = []
+        self.categories = []
+        self._dirs = {}  # Directory path -> (mtime, [ScriptEntry], [subdirectory paths])
+
+    def set_root(self, root):
+        """ Points the catalog at a new folder and scans it """
+        self.root = root
+        self._dirs = {}
+        self.refresh(force=True)
+
+    def _category_for(self, path):
+        rel_dir = os.path.relpath(path, self.root)
+        if rel_dir == os.curdir:
+            return ROOT_CATEGORY
+        return rel_dir.replace(os.sep, "/")
+
+    def _scan_dir(self, path, mtime):
+        category = self._category_for(path)
+        scripts = []
+        subdirs = []
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    if entry.is_dir():
+                        if not _is_library_dir(entry):
+                            subdirs.append(entry.path)
+                    elif entry.name.endswith(SCRIPT_EXTENSION):
+                        rel_path = os.path.relpath(entry.path, self.root).replace(os.sep, "/")
+                        scripts.append(ScriptEntry(entry.name, rel_path, category, entry.name.lower()))
+        except OSError as e:
+            print(f"⚠️ Could not list script folder {path}: {e}")
+        return mtime, scripts, subdirs
+
+    def refresh(self, force=False):
+        """ Re-stats the known directories and rescans changed ones. Returns True if the catalog changed """
+        if not self.root:
+            return False
+
+        changed = force
+        seen = {}
+        pending = [self.root]
+        while pending:
+            path = pending.pop()
+            mtime = _dir_mtime(path)
+            if mtime is None:
+                changed = changed or path in self._dirs
+                continue
+
+            cached = self._dirs.get(path)
+            if cached is None or cached[0] != mtime:
+                cached = self._scan_dir(path, mtime)
+                changed = True
+            seen[path] = cached
+            pending.extend(cached[2])
+
+        if len(seen) != len(self._dirs):
+            changed = True
+        self._dirs = seen
+        self.exists = self.root in seen
+
+        if changed:
+            self._rebuild()
+        return changed
+
+    def _rebuild(self):
+        entries = [entry for _, scripts, _ in self._dirs.values() for entry in scripts]
+        # Root scripts first, then sub-folders alphabetically
+        entries.sort(key=lambda e: (e.category != ROOT_CATEGORY, e.category.lower(), e.search_key))
+        self.entries = entries
+        self.categories = list(dict.fromkeys(e.category for e in entries))
+
+    def filtered(self, search=""):
+        """ Returns entries whose name contains the search text (case-insensitive) """
+        search = search.lower()
+        if not search:
+            return self.entries
+        return [e for e in self.entries if search in e.search_key]
+
+
+# Shared catalog used by the panel and the folder watcher
+catalog = ScriptCatalog()
@@ -0,0 +1,95 @@
+""" Opt-in chunked execution for long scripts.
+
+A script opts in by defining a generator function and skipping its
+synchronous run when QTools drives it:
+
+    def qtools_chunked(context):
+        objects = list(context.selected_objects)
+        for i, obj in enumerate(objects, 1):
+            ...  # One unit of work
+            yield i, len(objects)
+
+    if not globals().get("QTOOLS_CHUNKED"):  # Run everything at once outside QTools
+        for _ in qtools_chunked(bpy.context):
+            pass
+
+QTools then runs a time-budgeted chunk per timer tick, shows a progress bar
+with an ETA and cancels on Escape. Scripts without qtools_chunked run as before.
+"""
+import time
+
+# Name of the generator function a script defines to opt in to chunked execution
+ENTRY_POINT = "qtools_chunked"
+# Global injected into the script so it can tell it is being driven by QTools
+DRIVER_FLAG = "QTOOLS_CHUNKED"
+
+TIME_BUDGET = 0.05  # Seconds of script work per UI tick
+
+
+class ChunkedRun:
+    """ Drives a script generator in time-budgeted chunks.
+
+    The generator yields once per work unit. It may yield (done, total) to
+    report progress, or None if it only wants to give the UI a chance to run.
+    """
+
+    def __init__(self, script, generator):
+        self.script = script
+        self.generator = generator
+        self.done = 0
+        self.total = 0
+        self.finished = False
+        self.cancelled = False
+        self.started = time.time()
+        self._wall_start = time.perf_counter()
+        self._cpu_start = time.process_time()
+
+    def step(self, budget=TIME_BUDGET):
+        """ Advances the generator until the time budget is used. Returns True once finished """
+        if self.finished:
+            return True
+        deadline = time.perf_counter() + budget
+        try:
+            while time.perf_counter() < deadline:
+                progress = next(self.generator)
+                if progress is None:
+                    self.done += 1
+                else:
+                    self.done, self.total = progress
+        except StopIteration:
+            self.finished = True
+        return self.finished
+
+    def cancel(self):
+        """ Stops the generator, letting its finally-blocks clean up """
+        self.generator.close()
+        self.cancelled = True
+        self.finished = True
+
+    @property
+    def elapsed(self):
+        return time.perf_counter() - self._wall_start
+
+    @property
+    def cpu(self):
+        return time.process_time() - self._cpu_start
+
+    @property
+    def fraction(self):
+        if not self.total:
+            return 0.0
+        return min(1.0, self.done / self.total)
+
+    @property
+    def eta(self):
+        """ Seconds left, estimated from the average speed so far (None if unknown) """
+        if not self.total or not self.done:
+            return None
+        return self.elapsed / self.done * (self.total - self.done)
+
+    def status_text(self):
+        if not self.total:
+            return f"{self.script}: {self.done} steps, {self.elapsed:.1f}s (Esc to cancel)"
+        eta = self.eta
+        eta_text = f", ETA {eta:.0f}s" if eta is not None else ""
+        return f"{self.script}: {self.done}/{self.total} ({self.fraction:.0%}){eta_text} (Esc to cancel)"
@@ -0,0 +1,109 @@
+import hashlib
+import importlib.util
+import marshal
+import os
+import struct
+
+# Header of an on-disk entry: Python magic, source size, source mtime (ns)
+_HEADER = struct.Struct("<4sQq")
+
+
+class CodeCache:
+    """ Compiled code objects for the QTools scripts, keyed by path, size and mtime.
+
+    Code objects are kept in memory and marshalled to cache_dir so that they
+    survive a Blender restart. An entry is only reused while the script file
+    keeps the same size and mtime.
+    """
+
+    def __init__(self, cache_dir=None):
+        self.cache_dir = cache_dir
+        self._memory = {}  # Script path -> (size, mtime_ns, code)
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def _disk_path(self, script_path):
+        digest = hashlib.sha1(script_path.encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, f"{digest}.qtc")
+
+    def _read_disk(self, script_path, size, mtime):
+        if not self.cache_dir:
+            return None
+        try:
+            with open(self._disk_path(script_path), "rb") as file:
+                data = file.read()
+            magic, cached_size, cached_mtime = _HEADER.unpack_from(data)
+            if (magic, cached_size, cached_mtime) != (importlib.util.MAGIC_NUMBER, size, mtime):
+                return None
+            return marshal.loads(data[_HEADER.size:])
+        except (OSError, ValueError, EOFError, TypeError, struct.error):
+            return None  # Missing, stale or corrupt entry: recompile
+
+    def _write_disk(self, script_path, size, mtime, code):
+        if not self.cache_dir:
+            return
+        disk_path = self._disk_path(script_path)
+        tmp_path = f"{disk_path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(tmp_path, "wb") as file:
+                file.write(_HEADER.pack(importlib.util.MAGIC_NUMBER, size, mtime))
+                file.write(marshal.dumps(code))
+            os.replace(tmp_path, disk_path)  # Atomic so a concurrent Blender never reads half a file
+        except OSError as e:
+            print(f"⚠️ Could not write bytecode cache for {script_path}: {e}")
+
+    def load(self, script_path):
+        """ Returns the code object for a script, compiling it only if the file changed """
+        script_path = os.path.abspath(script_path)
+        stat = os.stat(script_path)
+        size, mtime = stat.st_size, stat.st_mtime_ns
+
+        cached = self._memory.get(script_path)
+        if cached is not None and cached[0] == size and cached[1] == mtime:
+            self.hits += 1
+            return cached[2]
+
+        code = self._read_disk(script_path, size, mtime)
+        if code is not None:
+            self.disk_hits += 1
+        else:
+            self.misses += 1
+            with open(script_path, "rb") as file:
+                code = compile(file.read(), script_path, 'exec')
+            self._write_disk(script_path, size, mtime, code)
+
+        self._memory[script_path] = (size, mtime, code)
+        return code
+
+    def invalidate(self, script_path=None):
+        """ Drops one script (or everything) from the memory and disk caches """
+        if script_path is None:
+            paths = list(self._memory)
+            self._memory.clear()
+            if self.cache_dir and os.path.isdir(self.cache_dir):
+                for name in os.listdir(self.cache_dir):
+                    if name.endswith(".qtc"):
+                        try:
+                            os.remove(os.path.join(self.cache_dir, name))
+                        except OSError:
+                            pass
+            return paths
+
+        script_path = os.path.abspath(script_path)
+        self._memory.pop(script_path, None)
+        if self.cache_dir:
+            try:
+                os.remove(self._disk_path(script_path))
+            except OSError:
+                pass
+        return [script_path]
+
+    def stats_text(self):
+        total = self.hits + self.disk_hits + self.misses
+        return f"Bytecode cache: {self.hits} memory hits, {self.disk_hits} disk hits, {self.misses} compiles ({total} runs)"
+
+
+# Shared cache used by the run operators
+code_cache = CodeCache()
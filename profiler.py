@@ -0,0 +1,127 @@
+import cProfile
+import csv
+import json
+import math
+import os
+import pstats
+import time
+from collections import namedtuple
+from contextlib import contextmanager
+
+MAX_RECORDS = 1000  # Oldest runs are dropped past this
+TOP_FUNCTIONS = 10  # Hot functions kept per profiled run
+
+RunRecord = namedtuple("RunRecord", [
+    "script", "started", "wall", "cpu", "ok", "error", "object_count", "hot_functions",
+])
+
+CSV_FIELDS = ["script", "started", "wall", "cpu", "ok", "error", "object_count", "hot_functions"]
+
+
+def percentile(values, fraction):
+    """ Nearest-rank percentile of a list of numbers """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    # Smallest value with at least `fraction` of the values at or below it (the epsilon absorbs 0.7 * 10 = 7.0000001)
+    rank = max(0, min(len(ordered) - 1, math.ceil(fraction * len(ordered) - 1e-9) - 1))
+    return ordered[rank]
+
+
+def _hot_functions(profile, top):
+    """ Returns the top cumulative-time functions of a profile as (function, calls, total s, cumulative s) """
+    stats = pstats.Stats(profile)
+    rows = []
+    for (filename, line, name), (_, ncalls, tottime, cumtime, _) in stats.stats.items():
+        rows.append((f"{os.path.basename(filename)}:{line}({name})", ncalls, tottime, cumtime))
+    rows.sort(key=lambda row: row[3], reverse=True)
+    return rows[:top]
+
+
+class RunHistory:
+    """ Timing history of every script run, with optional cProfile hot spots """
+
+    def __init__(self):
+        self.records = []
+
+    @contextmanager
+    def record(self, script, object_count=0, profile=False):
+        """ Times the body of the with-block (wall and CPU) and stores a RunRecord, even if it raises.
+
+        The block receives a dict; setting run["skip"] = True drops the record,
+        e.g. when the real work is handed over to a chunked run.
+        """
+        run = {"skip": False}
+        profiler = cProfile.Profile() if profile else None
+        started = time.time()
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        ok, error = True, ""
+        if profiler:
+            profiler.enable()
+        try:
+            yield run
+        except Exception as e:
+            ok, error = False, str(e)
+            raise
+        finally:
+            if profiler:
+                profiler.disable()
+            wall = time.perf_counter() - wall_start
+            cpu = time.process_time() - cpu_start
+            hot = _hot_functions(profiler, TOP_FUNCTIONS) if profiler else []
+            if not run["skip"]:
+                self.add(RunRecord(script, started, wall, cpu, ok, error, object_count, hot))
+
+    def add(self, record):
+        self.records.append(record)
+        if len(self.records) > MAX_RECORDS:
+            del self.records[:len(self.records) - MAX_RECORDS]
+
+    def clear(self):
+        self.records.clear()
+
+    def summary(self):
+        """ Per-script statistics, slowest p95 first """
+        by_script = {}
+        for record in self.records:
+            by_script.setdefault(record.script, []).append(record)
+
+        rows = []
+        for script, records in by_script.items():
+            walls = [r.wall for r in records]
+            rows.append({
+                "script": script,
+                "runs": len(records),
+                "failures": sum(1 for r in records if not r.ok),
+                "p50": percentile(walls, 0.50),
+                "p95": percentile(walls, 0.95),
+                "cpu_p50": percentile([r.cpu for r in records], 0.50),
+                "last_objects": records[-1].object_count,
+                "hot_functions": next((r.hot_functions for r in reversed(records) if r.hot_functions), []),
+            })
+        rows.sort(key=lambda row: row["p95"], reverse=True)
+        return rows
+
+    def export(self, filepath):
+        """ Writes every run to a .json or .csv file, picked by extension """
+        if filepath.lower().endswith(".json"):
+            data = {
+                "runs": [record._asdict() for record in self.records],
+                "summary": self.summary(),
+            }
+            with open(filepath, "w", encoding="utf-8") as file:
+                json.dump(data, file, indent=2)
+        else:
+            with open(filepath, "w", newline="", encoding="utf-8") as file:
+                writer = csv.DictWriter(file, fieldnames=CSV_FIELDS)
+                writer.writeheader()
+                for record in self.records:
+                    row = record._asdict()
+                    row["hot_functions"] = "; ".join(f"{name} {cum:.4f}s" for name, _, _, cum in record.hot_functions)
+                    writer.writerow(row)
+        return len(self.records)
+
+
+# Shared history filled by the run operators
+run_history = RunHistory()